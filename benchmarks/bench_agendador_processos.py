@@ -0,0 +1,132 @@
+# =============================================
+# Script: bench_agendador_processos.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Vários processos do servidor, cada um com o agendador real, na mesma pasta
+#            de dados vs uma pasta por processo: coletas na API, gerações e memória do host
+# Autor: Nathan Thomaz
+# Data de Criação: 17/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+
+from bench_memoria_compartilhada import memoria  # noqa: E402
+from mock_coingecko import iniciar_servidor  # noqa: E402
+
+# Intervalo entre os "reruns" simulados de cada processo (segundos)
+INTERVALO_RERUN = 0.1
+
+# =============================================
+# Funções
+# =============================================
+
+def arrows_mapeados():
+    """
+    Arquivos Arrow de geração mapeados pelo processo (/proc/self/maps).
+    """
+    with open("/proc/self/maps") as arquivo:
+        return {linha.split()[-1] for linha in arquivo if linha.rstrip().endswith(".arrow")}
+
+
+def processo_servidor(url, moedas, intervalo, duracao, pasta, barreira, resultados):
+    """
+    Um processo do servidor como o dashboard o monta: o agendador real em
+    segundo plano e, a cada "rerun", a geração mais recente do host
+    (AgendadorAtualizacao.acompanhar), com todas as colunas percorridas.
+    """
+    os.chdir(pasta)
+    os.environ["COINGECKO_API_URL"] = url
+    os.environ["CRYPTO_TOP_N"] = str(moedas)
+
+    from http_client import LimitadorTaxa, obter_cliente
+    import scheduler
+
+    # Sem o limite de taxa da API real: o que se mede é quantas coletas o host faz
+    obter_cliente(url).limitador = LimitadorTaxa(taxa=10_000, capacidade=10_000)
+    agendador = scheduler.AgendadorAtualizacao(intervalo=intervalo)
+    agendador.iniciar()
+
+    geracoes = set()
+    fim = time.monotonic() + duracao
+    while time.monotonic() < fim:
+        snapshot = agendador.acompanhar()
+        if snapshot is not None:
+            geracoes.add(snapshot.geracao)
+            for campo in snapshot.df.columns:
+                snapshot.df[campo].isna().sum()  # Toca todas as páginas da coluna
+        time.sleep(INTERVALO_RERUN)
+    agendador.parar()
+
+    barreira.wait()  # Todos os processos medidos ao mesmo tempo
+    rss, pss, privada = memoria()
+    resultados.put((rss, pss, privada, geracoes, arrows_mapeados()))
+    barreira.wait()
+
+
+def medir(modo, args, url, servidor, raiz):
+    """
+    modo "isolado": uma pasta de dados por processo (cada processo coleta e
+    publica as suas gerações, como antes da trava do manifesto);
+    "compartilhado": todos na mesma pasta, como um servidor com N processos.
+    """
+    pastas = [os.path.join(raiz, modo if modo == "compartilhado" else f"{modo}-{i}") for i in range(args.processos)]
+    for pasta in pastas:
+        os.makedirs(pasta, exist_ok=True)
+
+    contexto = multiprocessing.get_context("spawn")
+    barreira = contexto.Barrier(args.processos)
+    resultados = contexto.Queue()
+    processos = [
+        contexto.Process(
+            target=processo_servidor,
+            args=(url, args.moedas, args.intervalo, args.duracao, pasta, barreira, resultados)
+        )
+        for pasta in pastas
+    ]
+
+    requisicoes_antes = servidor.requisicoes
+    for processo in processos:
+        processo.start()
+    medidas = [resultados.get() for _ in processos]
+    for processo in processos:
+        processo.join()
+
+    geracoes = set().union(*(m[3] for m in medidas))
+    arrows = set().union(*(m[4] for m in medidas))
+    print(f"{modo:<13} requisições à API {servidor.requisicoes - requisicoes_antes:5d} | "
+          f"gerações {len(geracoes):3d} | Arrow mapeados no fim {len(arrows):2d} | "
+          f"RSS por processo {np.mean([m[0] for m in medidas]) / 1e6:7.1f} MB | "
+          f"privada por processo {np.mean([m[2] for m in medidas]) / 1e6:7.1f} MB | "
+          f"PSS somado (host) {sum(m[1] for m in medidas) / 1e6:7.1f} MB")
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agendador real em vários processos do servidor")
+    parser.add_argument("--moedas", type=int, default=20_000)
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--intervalo", type=float, default=5.0, help="segundos entre atualizações")
+    parser.add_argument("--duracao", type=float, default=20.0, help="segundos de execução por modo")
+    args = parser.parse_args()
+
+    servidor, url = iniciar_servidor(quantidade_moedas=args.moedas)
+    print(f"{args.processos} processos, {args.moedas:,} moedas, atualização a cada {args.intervalo:g} s "
+          f"por {args.duracao:g} s\n")
+
+    with tempfile.TemporaryDirectory() as raiz:
+        for modo in ("isolado", "compartilhado"):
+            medir(modo, args, url, servidor, raiz)
+
+    servidor.shutdown()
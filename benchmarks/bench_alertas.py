@@ -0,0 +1,137 @@
+# =============================================
+# Script: bench_alertas.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Avaliação das regras de alerta uma a uma vs em lote no MotorAlertas
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import alerts  # noqa: E402
+import schema  # noqa: E402
+from mock_coingecko import gerar_moedas  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def gerar_regras(ids, quantidade, rng):
+    tipos = sorted(alerts.TIPOS)
+    limites = {
+        "preco_acima": lambda: rng.uniform(0, 50_000),
+        "preco_abaixo": lambda: rng.uniform(0, 50_000),
+        "variacao_24h_acima": lambda: rng.uniform(0, 10),
+        "variacao_24h_abaixo": lambda: rng.uniform(-10, 0),
+        "ranking_mudou": lambda: rng.integers(1, 5),
+        "distancia_ath": lambda: rng.uniform(10, 90),
+    }
+    moedas = rng.choice(ids, quantidade)
+    escolhidos = rng.choice(tipos, quantidade)
+    return pd.DataFrame({
+        "id": np.arange(1, quantidade + 1),
+        "moeda": moedas,
+        "tipo": escolhidos,
+        "limite": [float(limites[t]()) for t in escolhidos],
+    })
+
+
+def avaliar_uma_a_uma(regras, df, anterior, ativas):
+    """
+    Uma regra por vez, procurando a moeda no snapshot, como seria com
+    if/else por regra. Mesma semântica de borda do motor.
+    """
+    snapshot = df.drop_duplicates("id", keep="last").set_index("id")
+    disparos = []
+    for regra in regras.itertuples(index=False):
+        if regra.moeda not in snapshot.index:
+            continue
+        linha = snapshot.loc[regra.moeda]
+        if regra.tipo == "preco_acima":
+            valor, condicao = linha["current_price"], linha["current_price"] >= regra.limite
+        elif regra.tipo == "preco_abaixo":
+            valor, condicao = linha["current_price"], linha["current_price"] <= regra.limite
+        elif regra.tipo == "variacao_24h_acima":
+            valor = linha["price_change_percentage_24h"]
+            condicao = valor >= regra.limite
+        elif regra.tipo == "variacao_24h_abaixo":
+            valor = linha["price_change_percentage_24h"]
+            condicao = valor <= regra.limite
+        elif regra.tipo == "ranking_mudou":
+            valor = abs(linha["market_cap_rank"] - anterior.get(regra.moeda, np.nan))
+            condicao = valor >= regra.limite
+        else:
+            valor = (1 - linha["current_price"] / linha["ath"]) * 100
+            condicao = valor >= regra.limite
+        if pd.isna(valor):
+            continue
+        if condicao and not ativas.get(regra.id, False):
+            disparos.append(regra.id)
+        ativas[regra.id] = bool(condicao)
+    return disparos
+
+
+def variar(df, rng):
+    novo = df.copy()
+    novo["current_price"] = novo["current_price"] * rng.uniform(0.95, 1.05, len(novo))
+    novo["price_change_percentage_24h"] = rng.normal(0, 5, len(novo))
+    novo["market_cap_rank"] = pd.array(rng.permutation(len(novo)) + 1, dtype="Int64")
+    return novo
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regras de alerta: uma a uma vs em lote")
+    parser.add_argument("--moedas", type=int, default=10_000)
+    parser.add_argument("--regras", type=int, default=10_000)
+    parser.add_argument("--snapshots", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = schema.aplicar_tipos(pd.DataFrame(gerar_moedas(args.moedas)))
+    regras = gerar_regras(df["id"].to_numpy(), args.regras, rng)
+    snapshots = [df] + [df := variar(df, rng) for _ in range(args.snapshots - 1)]
+
+    print(f"{args.moedas:,} moedas, {args.regras:,} regras, {args.snapshots} snapshots\n")
+
+    anterior, ativas, contagem = {}, {}, 0
+    inicio = time.perf_counter()
+    for snapshot in snapshots:
+        contagem += len(avaliar_uma_a_uma(regras, snapshot, anterior, ativas))
+        anterior = snapshot.set_index("id")["market_cap_rank"].to_dict()
+    antes = (time.perf_counter() - inicio) / len(snapshots) * 1000
+
+    motor = alerts.MotorAlertas(regras)
+    contagem_motor = 0
+    inicio = time.perf_counter()
+    for snapshot in snapshots:
+        contagem_motor += len(motor.avaliar(snapshot).disparos)
+    depois = (time.perf_counter() - inicio) / len(snapshots) * 1000
+
+    print(f"avaliação por snapshot: antes {antes:9.2f} ms (uma a uma) | depois {depois:7.2f} ms (em lote)")
+    print(f"disparos: uma a uma {contagem} | em lote {contagem_motor}")
+
+    # Sink: disparos e estado gravados em uma transação por snapshot
+    with tempfile.TemporaryDirectory() as pasta:
+        repositorio = alerts.RepositorioAlertas(os.path.join(pasta, "alerts.db"))
+        repositorio.adicionar_regras(regras[["moeda", "tipo", "limite"]].itertuples(index=False, name=None))
+        motor = alerts.MotorAlertas(repositorio.carregar_regras())
+        inicio = time.perf_counter()
+        for i, snapshot in enumerate(snapshots):
+            repositorio.gravar(motor.avaliar(snapshot, instante=f"snapshot-{i}"))
+        gravacao = (time.perf_counter() - inicio) / len(snapshots) * 1000
+        print(f"avaliação + gravação em SQLite: {gravacao:7.2f} ms por snapshot")
+        repositorio.fechar()
@@ -0,0 +1,109 @@
+# =============================================
+# Script: bench_analytics.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Custo por atualização da análise completa vs agregador incremental
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import math
+import os
+import sys
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from analytics import AgregadorIncremental  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def analise_completa(df, k=3):
+    """
+    Mesmo cálculo da análise antiga: idxmax/idxmin, média e sort completo.
+    """
+    variacao = df["price_change_percentage_24h"]
+    top = df.sort_values(by="price_change_percentage_24h", ascending=False).head(k)
+    return {
+        "best": df.loc[variacao.idxmax(), "name"],
+        "worst": df.loc[variacao.idxmin(), "name"],
+        "average": variacao.mean(),
+        "top": list(top["name"]),
+        "up": int((variacao > 0).sum()),
+        "down": int((variacao < 0).sum()),
+    }
+
+
+def gerar_snapshots(moedas, snapshots, fracao_alterada, semente=0):
+    rng = np.random.default_rng(semente)
+    df = pd.DataFrame({
+        "id": [f"coin-{i}" for i in range(moedas)],
+        "name": [f"Coin {i}" for i in range(moedas)],
+        "price_change_percentage_24h": rng.normal(0, 5, moedas),
+    })
+    alterar = max(1, int(moedas * fracao_alterada))
+    for _ in range(snapshots):
+        linhas = rng.choice(moedas, alterar, replace=False)
+        df = df.copy()
+        df.loc[linhas, "price_change_percentage_24h"] = rng.normal(0, 5, alterar)
+        yield df, linhas
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Análise completa vs incremental")
+    parser.add_argument("--moedas", type=int, default=10_000)
+    parser.add_argument("--snapshots", type=int, default=50)
+    # 100% é o caso real de uma coleta completa: a variação 24h de quase toda moeda muda
+    parser.add_argument("--fracoes", type=float, nargs="+", default=[0.001, 0.01, 0.1, 1.0, 0.01])
+    args = parser.parse_args()
+
+    # Um agregador só para todas as frações, como o do pipeline: passa pelas
+    # trocas entre o modo incremental e o recálculo vetorizado
+    por_diff = AgregadorIncremental()
+
+    for fracao in args.fracoes:
+        snapshots = list(gerar_snapshots(args.moedas, args.snapshots, fracao))
+        primeiro = snapshots[0][0]
+
+        t_completa = t_diff = t_deltas = 0.0
+        por_diff.atualizar(primeiro)
+        por_deltas = AgregadorIncremental()
+        por_deltas.atualizar(primeiro)
+
+        for df, linhas in snapshots[1:]:
+            inicio = time.perf_counter()
+            esperado = analise_completa(df)
+            t_completa += time.perf_counter() - inicio
+
+            # Diferença calculada contra o snapshot anterior
+            inicio = time.perf_counter()
+            por_diff.atualizar(df)
+            resumo = por_diff.resumo()
+            t_diff += time.perf_counter() - inicio
+
+            # Deltas já conhecidos (ex.: vindos de um stream)
+            ids = df["id"].to_numpy()[linhas]
+            valores = df["price_change_percentage_24h"].to_numpy()[linhas]
+            inicio = time.perf_counter()
+            por_deltas.aplicar_deltas(ids, valores)
+            por_deltas.resumo()
+            t_deltas += time.perf_counter() - inicio
+
+            assert resumo.best_coin == esperado["best"] and resumo.worst_coin == esperado["worst"]
+            assert [nome for nome, _ in resumo.top] == esperado["top"]
+            assert (resumo.coins_up, resumo.coins_down) == (esperado["up"], esperado["down"])
+            assert math.isclose(resumo.average_change, esperado["average"], rel_tol=1e-9, abs_tol=1e-9)
+
+        n = len(snapshots) - 1
+        print(f"{args.moedas} moedas, {fracao:6.1%} alteradas: completa {t_completa / n * 1000:7.2f} ms | "
+              f"incremental (diff) {t_diff / n * 1000:7.2f} ms | incremental (deltas) {t_deltas / n * 1000:7.2f} ms")
@@ -0,0 +1,98 @@
+# =============================================
+# Script: bench_ao_vivo.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Modo ao vivo contra o feed SSE do mock: ticks/s, latência tick → sessão
+#            e custo por atualização de sessão (só alteradas vs tabela inteira)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+
+import streaming  # noqa: E402
+from mock_coingecko import iniciar_servidor  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def sessao(transmissor, intervalo, parar, so_alteradas, custos, linhas):
+    """
+    Imita o fragmento do painel: a cada `intervalo` lê a tabela e atualiza
+    a cópia da sessão, só com as alteradas ou relendo tudo.
+    """
+    versao, tabela = 0, None
+    while not parar.wait(intervalo):
+        inicio = time.perf_counter()
+        if so_alteradas:
+            versao, alteradas = transmissor.tabela.alteracoes_desde(versao)
+            tabela = streaming.aplicar_alteracoes(tabela, alteradas)
+        else:
+            versao, alteradas = transmissor.tabela.alteracoes_desde(0)
+            tabela = alteradas
+        if tabela is not None:
+            tabela = tabela.sort_values("market_cap_rank", na_position="last")
+        custos.append(time.perf_counter() - inicio)
+        linhas.append(len(alteradas))
+        transmissor.registrar_exibicao(alteradas if so_alteradas else alteradas.iloc[:0])
+
+
+def rodar(url, sessoes, intervalo, duracao, so_alteradas):
+    transmissor = streaming.TransmissorTicks(streaming.FonteSSE(url))
+    transmissor.iniciar()
+    time.sleep(0.5)  # Primeira carga da tabela
+
+    parar = threading.Event()
+    custos, linhas = [], []
+    threads = [
+        threading.Thread(target=sessao, args=(transmissor, intervalo, parar, so_alteradas, custos, linhas))
+        for _ in range(sessoes)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads:
+        thread.join()
+
+    metricas = transmissor.metricas()
+    transmissor.parar()
+    return metricas, np.array(custos), np.array(linhas)
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ticks/s e latência do modo ao vivo")
+    parser.add_argument("--moedas", type=int, default=1000)
+    parser.add_argument("--taxa", type=float, default=2000, help="ticks/s emitidos pelo feed")
+    parser.add_argument("--sessoes", type=int, default=10)
+    parser.add_argument("--intervalo", type=float, default=1.0, help="segundos entre atualizações de cada sessão")
+    parser.add_argument("--duracao", type=float, default=10.0)
+    args = parser.parse_args()
+
+    servidor, url_base = iniciar_servidor(quantidade_moedas=args.moedas)
+    url = f"{url_base}/stream/prices?taxa={args.taxa}&lotes=20"
+    print(f"{args.moedas} moedas, feed de {args.taxa:.0f} ticks/s, {args.sessoes} sessões a cada {args.intervalo}s\n")
+
+    for rotulo, so_alteradas in (("tabela inteira", False), ("só alteradas", True)):
+        metricas, custos, linhas = rodar(url, args.sessoes, args.intervalo, args.duracao, so_alteradas)
+        ingestao = metricas["latencia"].get("ingestao", {})
+        tela = metricas["latencia"].get("tela", {})
+        print(f"{rotulo:<15} {metricas['ticks_por_segundo']:8.0f} ticks/s | "
+              f"por atualização de sessão: {custos.mean() * 1000:6.2f} ms, {linhas.mean():7.0f} linhas | "
+              f"tick → tabela p50 {ingestao.get('p50_ms', 0):5.1f} ms p95 {ingestao.get('p95_ms', 0):5.1f} ms"
+              + (f" | tick → sessão p50 {tela['p50_ms']:6.1f} ms p95 {tela['p95_ms']:6.1f} ms" if tela else ""))
+
+    servidor.shutdown()
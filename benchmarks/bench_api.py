@@ -0,0 +1,137 @@
+# =============================================
+# Script: bench_api.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Teste de carga da API HTTP (requisições/s e latência por recurso)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+from mock_coingecko import iniciar_servidor  # noqa: E402
+
+PORTA = 8650
+
+# nome -> (caminho, cabeçalhos)
+CENARIOS = {
+    "snapshot json+gzip": ("/api/v1/snapshot", {"Accept-Encoding": "gzip"}),
+    "snapshot arrow": ("/api/v1/snapshot", {"Accept": "application/vnd.apache.arrow.stream"}),
+    "snapshot 304": ("/api/v1/snapshot", {"Accept-Encoding": "gzip"}),  # If-None-Match preenchido depois
+    "snapshot filtrado": ("/api/v1/snapshot?moedas=coin-1,coin-2,coin-3", {}),
+    "analise": ("/api/v1/analise", {}),
+    "historico": ("/api/v1/historico?moedas=coin-1", {"Accept-Encoding": "gzip"}),
+}
+
+# =============================================
+# Funções
+# =============================================
+
+def carga(caminho, cabecalhos, conexoes, duracao):
+    """
+    `conexoes` clientes com keep-alive repetindo a mesma requisição por
+    `duracao` segundos. Retorna (requisições/s, latências em ms, bytes/resposta).
+    """
+    latencias, tamanhos = [], []
+    lock = threading.Lock()
+    fim = time.perf_counter() + duracao
+
+    def cliente():
+        conexao = http.client.HTTPConnection("127.0.0.1", PORTA)
+        minhas, tamanho = [], 0
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            conexao.request("GET", caminho, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            tamanho = len(resposta.read())
+            assert resposta.status in (200, 304), resposta.status
+            minhas.append((time.perf_counter() - inicio) * 1000)
+        conexao.close()
+        with lock:
+            latencias.extend(minhas)
+            tamanhos.append(tamanho)
+
+    threads = [threading.Thread(target=cliente) for _ in range(conexoes)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    decorrido = time.perf_counter() - inicio
+    return len(latencias) / decorrido, latencias, max(tamanhos)
+
+
+def esperar_api(processo, tentativas=100):
+    for _ in range(tentativas):
+        if processo.poll() is not None:
+            raise RuntimeError("A API encerrou antes de ficar pronta")
+        try:
+            conexao = http.client.HTTPConnection("127.0.0.1", PORTA, timeout=1)
+            conexao.request("GET", "/api/v1/saude")
+            if conexao.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("A API não respondeu")
+
+
+def obter_etag(caminho, cabecalhos):
+    conexao = http.client.HTTPConnection("127.0.0.1", PORTA)
+    conexao.request("GET", caminho, headers=cabecalhos)
+    resposta = conexao.getresponse()
+    resposta.read()
+    return resposta.getheader("ETag")
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga na API HTTP")
+    parser.add_argument("--moedas", type=int, default=1000)
+    parser.add_argument("--conexoes", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=5.0)
+    args = parser.parse_args()
+
+    servidor, url = iniciar_servidor(quantidade_moedas=args.moedas)
+    ambiente = dict(os.environ, COINGECKO_API_URL=url, CRYPTO_TOP_N=str(args.moedas))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Uma geração publicada pelo pipeline, como em produção
+        subprocess.run([sys.executable, os.path.join(RAIZ, "src", "pipeline.py")], cwd=pasta, env=ambiente,
+                       check=True)
+
+        # A API roda em outro processo: o gerador de carga não divide o GIL com ela
+        api = subprocess.Popen(
+            [sys.executable, os.path.join(RAIZ, "src", "api.py"), "--porta", str(PORTA)],
+            cwd=pasta, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            esperar_api(api)
+            caminho, cabecalhos = CENARIOS["snapshot 304"]
+            CENARIOS["snapshot 304"] = (caminho, dict(cabecalhos, **{"If-None-Match": obter_etag(caminho, cabecalhos)}))
+
+            print(f"{args.moedas:,} moedas, {args.conexoes} conexões keep-alive, {args.duracao:.0f} s por cenário\n")
+            for nome, (caminho, cabecalhos) in CENARIOS.items():
+                carga(caminho, cabecalhos, 1, 0.2)  # Aquecimento: monta a resposta da geração
+                taxa, latencias, tamanho = carga(caminho, cabecalhos, args.conexoes, args.duracao)
+                p99 = statistics.quantiles(latencias, n=100)[98] if len(latencias) >= 100 else max(latencias)
+                print(f"{nome:<20} {taxa:8.0f} req/s | p50 {statistics.median(latencias):6.2f} ms | "
+                      f"p99 {p99:6.2f} ms | {tamanho / 1024:8.1f} KiB/resposta")
+        finally:
+            api.terminate()
+            api.wait()
+
+    servidor.shutdown()
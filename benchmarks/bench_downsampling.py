@@ -0,0 +1,111 @@
+# =============================================
+# Script: bench_downsampling.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Tamanho do payload e tempo de montagem do gráfico de histórico, com e sem redução
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import altair as alt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pyarrow as pa  # noqa: E402
+
+import downsampling  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def gerar_historico(moedas, pontos, passo="1min", semente=0):
+    rng = np.random.default_rng(semente)
+    instantes = pd.date_range("2026-01-01", periods=pontos, freq=passo, tz="UTC")
+    precos = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, (pontos, moedas)), axis=0))
+    return pd.DataFrame({
+        "snapshot_ts": np.tile(instantes, moedas),
+        "id": np.repeat([f"coin-{j}" for j in range(moedas)], pontos),
+        "name": np.repeat([f"Coin {j}" for j in range(moedas)], pontos),
+        "current_price": precos.T.ravel(),
+    })
+
+
+def montar_grafico(dados):
+    """
+    Mesmo gráfico de linha do dashboard (mostrar_historico).
+    """
+    return alt.Chart(dados[["snapshot_ts", "name", "current_price"]]).mark_line().encode(
+        x="snapshot_ts:T",
+        y=alt.Y("current_price:Q", scale=alt.Scale(zero=False)),
+        color="name:N",
+    )
+
+
+def medir(rotulo, preparar):
+    inicio = time.perf_counter()
+    dados = preparar()
+    t_preparo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    especificacao = montar_grafico(dados).to_json()
+    t_json = time.perf_counter() - inicio
+
+    # O Streamlit envia os dados do gráfico em Arrow IPC junto da especificação
+    tabela = pa.Table.from_pandas(dados[["snapshot_ts", "name", "current_price"]], preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    tamanho_arrow = sink.getvalue().size
+
+    print(f"{rotulo:<26} {len(dados):>10,} pontos | preparo {t_preparo * 1000:8.1f} ms | "
+          f"Vega-Lite JSON {len(especificacao) / 1e6:8.2f} MB em {t_json * 1000:8.1f} ms | "
+          f"Arrow {tamanho_arrow / 1e6:7.2f} MB")
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Payload do gráfico de histórico com e sem redução")
+    parser.add_argument("--moedas", type=int, default=10)
+    parser.add_argument("--pontos", type=int, default=100_000, help="Pontos de 1 minuto por moeda")
+    parser.add_argument("--largura", type=int, default=downsampling.LARGURA_PADRAO_PX)
+    args = parser.parse_args()
+
+    alt.data_transformers.disable_max_rows()
+
+    historico = gerar_historico(args.moedas, args.pontos)
+    inicio, fim = historico["snapshot_ts"].min(), historico["snapshot_ts"].max()
+
+    t = time.perf_counter()
+    niveis = downsampling.agregar_niveis(historico)
+    print(f"pré-agregação 1m/1h/1d de {len(historico):,} linhas: {(time.perf_counter() - t) * 1000:.0f} ms "
+          f"(feita uma vez por mudança no histórico)")
+
+    # Orçamento do gráfico: com muitas moedas, menos pontos por série e, abaixo
+    # do mínimo por série, só as primeiras moedas
+    pontos, exibidas = downsampling.orcamento_series(args.moedas, args.largura)
+    moedas = [f"coin-{j}" for j in range(exibidas)]
+    nivel = downsampling.escolher_nivel(inicio, fim, pontos)
+    print(f"orçamento de {downsampling.MAX_PONTOS_GRAFICO:,} pontos: {exibidas} de {args.moedas} séries x {pontos} pontos")
+    print(f"período de {fim - inicio} em {pontos} pontos por série -> nível {nivel}\n")
+
+    agregado = niveis[nivel][niveis[nivel]["id"].isin(moedas)]
+    bruto = historico[historico["id"].isin(moedas)]
+
+    medir("sem redução", lambda: historico)
+    medir(f"nível {nivel}", lambda: agregado)
+    medir(f"nível {nivel} + LTTB", lambda: downsampling.reduzir_series(
+        agregado, "snapshot_ts", "current_price", pontos))
+    medir(f"nível {nivel} + mín/máx", lambda: downsampling.reduzir_series(
+        agregado, "snapshot_ts", "current_price", pontos, metodo="minmax"))
+    medir("bruto + LTTB", lambda: downsampling.reduzir_series(
+        bruto, "snapshot_ts", "current_price", pontos))
@@ -0,0 +1,95 @@
+# =============================================
+# Script: bench_exportacao.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Tempo e pico de memória da exportação da tabela por formato
+#            (ExcelWriter do pandas vs xlsxwriter em constant_memory)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import pandas as pd  # noqa: E402
+
+import data_processor  # noqa: E402
+import exports  # noqa: E402
+import schema  # noqa: E402
+import view_models  # noqa: E402
+from mock_coingecko import gerar_moedas  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def excel_pandas(df):
+    """
+    Exportação anterior de mostrar_tabela (datas sem fuso, que o
+    ExcelWriter não aceita).
+    """
+    df = df.copy()
+    for coluna in df.columns:
+        if isinstance(df[coluna].dtype, pd.DatetimeTZDtype):
+            df[coluna] = df[coluna].dt.tz_localize(None)
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        df.to_excel(writer, sheet_name="Criptomoedas", index=False)
+    return buffer.getvalue()
+
+
+def medir(funcao, df, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        dados = funcao(df)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcao(df)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(tempos), pico, len(dados)
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tempo e memória da exportação da tabela")
+    parser.add_argument("--linhas", type=int, default=10_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    df_raw = schema.aplicar_tipos(pd.DataFrame(gerar_moedas(args.linhas)))
+    visoes = view_models.VisoesPaginas(df_raw, data_processor.analyze_data(df_raw))
+
+    print(f"{args.linhas:,} linhas, mediana de {args.repeticoes} repetições; pico = tracemalloc\n")
+    for rotulo, formatada in (("dados brutos", False), ("formatado", True)):
+        tabela = visoes.tabela(formatada, visoes.moedas)
+        print(f"tabela {rotulo}:")
+        casos = [("Excel (ExcelWriter)", excel_pandas)]
+        casos += [(formato, exports.FORMATOS[formato][0]) for formato in exports.FORMATOS]
+        for nome, funcao in casos:
+            tempo, pico, tamanho = medir(funcao, tabela, args.repeticoes)
+            print(f"  {nome:<20} {tempo * 1000:8.1f} ms | pico {pico / 1e6:7.1f} MB | arquivo {tamanho / 1e6:6.2f} MB")
+        print()
+
+    # Reruns sem clique: antes cada rerun gerava o arquivo; agora só consulta o memo
+    inicio = time.perf_counter()
+    visoes.exportacao(False, visoes.moedas, "Excel (.xlsx)")
+    primeira = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for _ in range(100):
+        visoes.exportacao(False, visoes.moedas, "Excel (.xlsx)", gerar=False)
+    repetida = (time.perf_counter() - inicio) / 100
+    print(f"memo por snapshot (Excel, todas as moedas): primeira geração {primeira * 1000:.1f} ms, "
+          f"reruns seguintes {repetida * 1e6:.1f} µs")
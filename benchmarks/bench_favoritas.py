@@ -0,0 +1,90 @@
+# =============================================
+# Script: bench_favoritas.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Favoritas em lista na sessão (antiga) vs repositório SQLite com consulta por índice
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import pandas as pd  # noqa: E402
+
+import data_processor  # noqa: E402
+import schema  # noqa: E402
+import view_models  # noqa: E402
+from favorites_store import RepositorioFavoritas  # noqa: E402
+from mock_coingecko import gerar_moedas  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def cronometrar(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Favoritas: lista na sessão vs SQLite")
+    parser.add_argument("--moedas", type=int, default=10_000)
+    parser.add_argument("--favoritas", type=int, default=500)
+    parser.add_argument("--usuarios", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    df = schema.aplicar_tipos(pd.DataFrame(gerar_moedas(args.moedas)))
+    visoes = view_models.VisoesPaginas(df, data_processor.analyze_data(df))
+    rng = random.Random(0)
+    lista = rng.sample(visoes.moedas, args.favoritas)  # Como ficava em st.session_state.favoritas
+
+    with tempfile.TemporaryDirectory() as pasta:
+        repositorio = RepositorioFavoritas(os.path.join(pasta, "favorites.db"))
+
+        inicio = time.perf_counter()
+        for usuario in range(args.usuarios):
+            repositorio.adicionar(f"u{usuario}", rng.sample(visoes.moedas, args.favoritas))
+        carga = time.perf_counter() - inicio
+        repositorio.adicionar("eu", lista)
+
+        print(f"{args.moedas:,} moedas, {args.favoritas} favoritas por usuário, "
+              f"{args.usuarios} usuários no banco ({carga:.1f} s para gravar)\n")
+
+        # Filtro "mostrar apenas favoritas" em gráficos/tabela
+        antes = cronometrar(lambda: [m for m in visoes.moedas if m in lista], 5)
+        depois = cronometrar(lambda: visoes.somente(repositorio.listar("eu")), args.repeticoes)
+        print(f"filtro de favoritas:     antes {antes:9.3f} ms | depois {depois:9.3f} ms")
+
+        # Estado de cada moeda ao desenhar a página de favoritas
+        antes = cronometrar(lambda: [m in lista for m in visoes.moedas], 5)
+        trecho = visoes.moedas[:50]
+        depois = cronometrar(lambda: [m in repositorio.listar("eu") for m in trecho], args.repeticoes)
+        print(f"marcação na página:      antes {antes:9.3f} ms (todas as moedas) | "
+              f"depois {depois:9.3f} ms (página de 50)")
+
+        # Leitura sem cache (outro processo gravou) e gravação
+        repositorio._cache.clear()
+        sem_cache = cronometrar(lambda: (repositorio._cache.clear(), repositorio.listar("eu")), args.repeticoes)
+        moeda = visoes.moedas[-1]
+        alternar = cronometrar(
+            lambda: (repositorio.adicionar("eu", [moeda]), repositorio.remover("eu", [moeda])), args.repeticoes
+        ) / 2
+        print(f"listar do SQLite:        {sem_cache:9.3f} ms sem cache | gravar uma marcação {alternar:9.3f} ms")
+
+        print(f"\nwidgets na página de favoritas: antes {3 * args.moedas:,} (colunas + texto + botão por moeda) | "
+              f"depois 1 tabela editável de {len(trecho)} linhas")
+        repositorio.fechar()
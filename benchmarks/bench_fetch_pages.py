@@ -0,0 +1,52 @@
+# =============================================
+# Script: bench_fetch_pages.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Mede páginas/s da coleta paginada contra o mock local da CoinGecko
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import math
+import os
+import sys
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+from mock_coingecko import iniciar_servidor  # noqa: E402
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput da coleta paginada")
+    parser.add_argument("--moedas", type=int, default=5000)
+    parser.add_argument("--atraso", type=float, default=0.05, help="latência simulada por página (s)")
+    parser.add_argument("--paralelos", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    servidor, url = iniciar_servidor(quantidade_moedas=args.moedas, atraso=args.atraso)
+    os.environ["COINGECKO_API_URL"] = url
+
+    import data_fetcher
+    from http_client import LimitadorTaxa, obter_cliente
+
+    # Sem limite de taxa aqui: o objetivo é medir a concorrência da coleta
+    obter_cliente(url).limitador = LimitadorTaxa(taxa=10_000, capacidade=10_000)
+
+    paginas = math.ceil(args.moedas / data_fetcher.MOEDAS_POR_PAGINA)
+    print(f"{args.moedas} moedas em {paginas} páginas, atraso de {args.atraso * 1000:.0f} ms por página")
+
+    for paralelo in args.paralelos:
+        inicio = time.perf_counter()
+        df = data_fetcher.buscar_moedas(args.moedas, max_paralelo=paralelo)
+        duracao = time.perf_counter() - inicio
+
+        assert len(df) == args.moedas and df["market_cap_rank"].is_monotonic_increasing
+        print(f"paralelo={paralelo:>2}: {duracao * 1000:8.1f} ms | {paginas / duracao:7.1f} páginas/s")
+
+    servidor.shutdown()
@@ -0,0 +1,72 @@
+# =============================================
+# Script: bench_formatacao.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Compara o formatador pt-BR vetorizado com o formatador antigo
+#            (apply + replace) e confere que a saída é idêntica byte a byte
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import sys
+import timeit
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from formatting import formatar_numero_br, formatar_percentual  # noqa: E402
+
+# =============================================
+# Formatadores antigos (referência)
+# =============================================
+
+def antigo_numero(serie, casas):
+    return serie.apply(lambda x: f"{x:,.{casas}f}".replace(",", "X").replace(".", ",").replace("X", "."))
+
+
+def antigo_percentual(serie):
+    return serie.apply(lambda x: f"{x:.2f}%")
+
+
+def gerar_valores(quantidade, semente=0):
+    """
+    Mistura de magnitudes, negativos, empates de arredondamento e não finitos.
+    """
+    rng = np.random.default_rng(semente)
+    especiais = [0.0, -0.0, -0.001, 0.005, 0.125, 1.005, 2.675, 999.995, 999999.995,
+                 1e15, 9.999e15, 1e20, np.nan, np.inf, -np.inf]
+    valores = np.concatenate([
+        10 ** rng.uniform(-8, 13, quantidade) * rng.choice([-1, 1], quantidade),
+        np.round(rng.uniform(-10, 10, quantidade // 10), 3),
+        especiais
+    ])
+    return pd.Series(valores)
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Formatador pt-BR vetorizado vs apply")
+    parser.add_argument("--linhas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    serie = gerar_valores(args.linhas)
+
+    casos = [
+        ("moeda (2 casas)", lambda: antigo_numero(serie, 2), lambda: formatar_numero_br(serie, 2)),
+        ("quantidade (0 casas)", lambda: antigo_numero(serie, 0), lambda: formatar_numero_br(serie, 0)),
+        ("percentual", lambda: antigo_percentual(serie), lambda: formatar_percentual(serie)),
+    ]
+
+    for nome, antigo, novo in casos:
+        assert antigo().tolist() == novo().tolist(), f"saída diferente em {nome}"
+        t_antigo = min(timeit.repeat(antigo, number=1, repeat=5)) * 1000
+        t_novo = min(timeit.repeat(novo, number=1, repeat=5)) * 1000
+        print(f"{nome:>22}: antigo {t_antigo:8.1f} ms | vetorizado {t_novo:8.1f} ms | "
+              f"{t_antigo / t_novo:4.1f}x | saída idêntica")
@@ -0,0 +1,112 @@
+# =============================================
+# Script: bench_indicators.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Indicadores móveis em lote (tempo x moeda) vs laço por moeda com pandas
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import indicators  # noqa: E402
+from indicators import MotorIndicadores  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def gerar_bloco(rng, linhas, moedas, ultimo):
+    """
+    Passeio aleatório de preços (continuando de `ultimo`) e volumes log-normais.
+    """
+    precos = ultimo * np.exp(np.cumsum(rng.normal(0, 0.002, (linhas, moedas)), axis=0))
+    volumes = rng.lognormal(18, 1, (linhas, moedas))
+    return precos, volumes
+
+
+def por_moeda_pandas(precos, volumes, motor):
+    """
+    Mesmos indicadores, uma moeda por vez com rolling/ewm do pandas.
+    """
+    resultado = {nome: np.empty_like(precos) for nome in indicators.INDICADORES}
+    for j in range(precos.shape[1]):
+        p = pd.Series(precos[:, j])
+        v = pd.Series(volumes[:, j])
+        resultado["retorno"][:, j] = p / p.shift(motor.janela_retorno) - 1
+        resultado["volatilidade"][:, j] = np.log(p).diff().rolling(motor.janela_volatilidade).std()
+        resultado["sma"][:, j] = p.rolling(motor.janela_sma).mean()
+        resultado["ema"][:, j] = p.ewm(alpha=motor.alfa, adjust=False).mean()
+        resultado["drawdown"][:, j] = p / p.cummax() - 1
+        janela = v.rolling(motor.janela_zscore)
+        resultado["zscore_volume"][:, j] = (v - janela.mean()) / janela.std()
+    return resultado
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Indicadores móveis em lote")
+    parser.add_argument("--moedas", type=int, default=1_000)
+    parser.add_argument("--instantes", type=int, default=100_000)
+    parser.add_argument("--bloco", type=int, default=indicators.TAMANHO_BLOCO)
+    parser.add_argument("--comparar-instantes", type=int, default=10_000,
+                        help="Instantes usados na comparação com o laço por moeda")
+    parser.add_argument("--snapshots", type=int, default=200,
+                        help="Snapshots de uma linha para medir a atualização incremental")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    # 1) Série inteira em blocos (matrizes geradas bloco a bloco para caber na memória)
+    motor = MotorIndicadores()
+    motor.garantir_moedas([f"coin-{j}" for j in range(args.moedas)])
+    ultimo = np.full(args.moedas, 100.0)
+    gasto = 0.0
+    for inicio in range(0, args.instantes, args.bloco):
+        precos, volumes = gerar_bloco(rng, min(args.bloco, args.instantes - inicio), args.moedas, ultimo)
+        ultimo = precos[-1]
+        t = time.perf_counter()
+        motor.processar(precos, volumes)
+        gasto += time.perf_counter() - t
+    celulas = args.moedas * args.instantes
+    print(f"lote: {args.moedas} moedas x {args.instantes} instantes em {gasto:.2f} s "
+          f"({celulas / gasto / 1e6:.1f} M células/s)")
+
+    # 2) Atualização incremental: um snapshot (linha) por vez
+    t = time.perf_counter()
+    for _ in range(args.snapshots):
+        precos, volumes = gerar_bloco(rng, 1, args.moedas, ultimo)
+        ultimo = precos[-1]
+        motor.processar(precos, volumes)
+    gasto = (time.perf_counter() - t) / args.snapshots
+    print(f"incremental: {gasto * 1000:.2f} ms por snapshot de {args.moedas} moedas")
+
+    # 3) Comparação com o laço por moeda (e conferência dos valores)
+    precos, volumes = gerar_bloco(rng, args.comparar_instantes, args.moedas, np.full(args.moedas, 100.0))
+    comparado = MotorIndicadores()
+    comparado.garantir_moedas(range(args.moedas))
+
+    t = time.perf_counter()
+    em_lote = comparado.processar(precos, volumes)
+    t_lote = time.perf_counter() - t
+
+    t = time.perf_counter()
+    esperado = por_moeda_pandas(precos, volumes, comparado)
+    t_pandas = time.perf_counter() - t
+
+    for nome in indicators.INDICADORES:
+        assert np.allclose(em_lote[nome], esperado[nome], rtol=1e-7, atol=1e-9, equal_nan=True), nome
+
+    print(f"{args.moedas} x {args.comparar_instantes}: lote {t_lote:.2f} s | por moeda (pandas) {t_pandas:.2f} s "
+          f"| {t_pandas / t_lote:.1f}x")
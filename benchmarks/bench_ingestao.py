@@ -0,0 +1,208 @@
+# =============================================
+# Script: bench_ingestao.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Pico de memória e moedas/s da coleta: lista de dicts (antiga) vs leitura em colunas
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import pandas as pd  # noqa: E402
+
+from mock_coingecko import iniciar_servidor  # noqa: E402
+
+CAMINHOS = ("dicts", "colunas")
+
+# =============================================
+# Funções
+# =============================================
+
+def buscar_moedas_dicts(top_n):
+    """
+    Caminho anterior de data_fetcher.buscar_moedas: response.json() da
+    página inteira, um dict novo por moeda e o DataFrame montado da lista.
+    """
+    import data_fetcher
+    import schema
+
+    por_pagina = min(top_n, data_fetcher.MOEDAS_POR_PAGINA)
+    paginas = range(1, math.ceil(top_n / por_pagina) + 1)
+    cliente = data_fetcher.obter_cliente(data_fetcher.API_URL)
+
+    def pagina(numero):
+        params = {"vs_currency": "usd", "order": "market_cap_desc", "per_page": por_pagina,
+                  "page": numero, "sparkline": False}
+        data = cliente.get_json("/coins/markets", params)
+        return [{campo: coin.get(campo) for campo in schema.CAMPOS} for coin in data]
+
+    coins = []
+    with ThreadPoolExecutor(max_workers=min(len(paginas), data_fetcher.MAX_PAGINAS_SIMULTANEAS)) as executor:
+        for lista in executor.map(pagina, paginas):
+            coins.extend(lista)
+
+    return (
+        schema.aplicar_tipos(pd.DataFrame(coins, columns=schema.CAMPOS))
+        .sort_values("market_cap_rank", na_position="last", kind="stable")
+        .head(top_n)
+        .reset_index(drop=True)
+    )
+
+
+def preparar(url):
+    os.environ["COINGECKO_API_URL"] = url
+    import data_fetcher
+    from http_client import LimitadorTaxa, obter_cliente
+
+    # Sem limite de taxa: o objetivo é medir a leitura das respostas
+    cliente = obter_cliente(url)
+    cliente.limitador = LimitadorTaxa(taxa=10_000, capacidade=10_000)
+    funcoes = {"dicts": buscar_moedas_dicts, "colunas": data_fetcher.buscar_moedas}
+    return cliente, funcoes
+
+
+def medir(caminho, url, moedas, repeticoes):
+    """
+    Roda em um processo próprio, para o pico de RSS de um caminho não
+    contaminar o outro. Imprime o resultado em JSON.
+    """
+    cliente, funcoes = preparar(url)
+    buscar = funcoes[caminho]
+
+    cliente._cache.clear()
+    buscar(moedas)  # Aquecimento (conexões, imports preguiçosos)
+    rss_base = _zerar_pico_rss()
+
+    tempos = []
+    for _ in range(repeticoes):
+        cliente._cache.clear()  # Sem 304: toda repetição lê o corpo inteiro
+        inicio = time.perf_counter()
+        df = buscar(moedas)
+        tempos.append(time.perf_counter() - inicio)
+        del df
+    rss_pico = _pico_rss()
+
+    cliente._cache.clear()
+    tracemalloc.start()
+    df = buscar(moedas)
+    _, pico_python = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(json.dumps({
+        "caminho": caminho,
+        "linhas": len(df),
+        "melhor_s": min(tempos),
+        "pico_tracemalloc_mb": pico_python / 1e6,
+        "pico_rss_extra_mb": (rss_pico - rss_base) / 1e6,
+    }))
+
+
+def medir_leitura(moedas, repeticoes):
+    """
+    Só a leitura do corpo (sem rede nem servidor), para isolar o custo de CPU.
+    """
+    import json_stream
+    import schema
+    from http_client import TAMANHO_BLOCO_STREAM
+    from mock_coingecko import gerar_moedas
+
+    corpo = json.dumps(gerar_moedas(moedas, completo=True)).encode("utf-8")
+
+    def dicts():
+        coins = [{campo: coin.get(campo) for campo in schema.CAMPOS} for coin in json.loads(corpo)]
+        return schema.aplicar_tipos(pd.DataFrame(coins, columns=schema.CAMPOS))
+
+    def colunas():
+        blocos = (corpo[i:i + TAMANHO_BLOCO_STREAM] for i in range(0, len(corpo), TAMANHO_BLOCO_STREAM))
+        return schema.aplicar_tipos(json_stream.para_dataframe([json_stream.ler_colunas(blocos)]))
+
+    print(f"só leitura, corpo de {len(corpo) / 1e6:.1f} MB em memória:")
+    for nome, funcao in (("dicts", dicts), ("colunas", colunas)):
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        print(f"  {nome:<8} {min(tempos) * 1000:8.1f} ms | {moedas / min(tempos):>10,.0f} moedas/s")
+
+
+def servir(moedas, fila):
+    servidor, url = iniciar_servidor(quantidade_moedas=moedas, completo=True)
+    fila.put(url)
+    servidor.serve_forever()
+
+def _zerar_pico_rss():
+    """
+    Zera o pico de RSS do processo (VmHWM, Linux) e retorna o RSS atual em bytes.
+    """
+    with open("/proc/self/clear_refs", "w") as arquivo:
+        arquivo.write("5")
+    return _ler_status("VmRSS")
+
+
+def _pico_rss():
+    return _ler_status("VmHWM")
+
+
+def _ler_status(campo):
+    with open("/proc/self/status") as arquivo:
+        for linha in arquivo:
+            if linha.startswith(campo + ":"):
+                return int(linha.split()[1]) * 1024
+    return 0
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memória e throughput da coleta de /coins/markets")
+    parser.add_argument("--moedas", type=int, default=20_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--medir", choices=CAMINHOS, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        medir(args.medir, args.url, args.moedas, args.repeticoes)
+        sys.exit(0)
+
+    # O mock roda em outro processo para não entrar na memória medida
+    fila = multiprocessing.Queue()
+    servidor = multiprocessing.Process(target=servir, args=(args.moedas, fila), daemon=True)
+    servidor.start()
+    url = fila.get()
+
+    # Os dois caminhos precisam produzir o mesmo snapshot
+    _, funcoes = preparar(url)
+    pd.testing.assert_frame_equal(funcoes["dicts"](args.moedas), funcoes["colunas"](args.moedas))
+    print(f"{args.moedas:,} moedas (payload completo da API), {args.repeticoes} repetições; DataFrames idênticos\n")
+
+    print("coleta completa (HTTP local, páginas em paralelo):")
+    for caminho in CAMINHOS:
+        saida = subprocess.run(
+            [sys.executable, __file__, "--medir", caminho, "--url", url,
+             "--moedas", str(args.moedas), "--repeticoes", str(args.repeticoes)],
+            capture_output=True, text=True, check=True,
+        )
+        r = json.loads(saida.stdout.strip().splitlines()[-1])
+        print(f"  {r['caminho']:<8} {r['melhor_s'] * 1000:8.1f} ms | {r['linhas'] / r['melhor_s']:>10,.0f} moedas/s | "
+              f"pico Python {r['pico_tracemalloc_mb']:7.1f} MB | RSS extra {r['pico_rss_extra_mb']:7.1f} MB")
+
+    servidor.terminate()
+
+    print()
+    medir_leitura(args.moedas, args.repeticoes)
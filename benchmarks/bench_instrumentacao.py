@@ -0,0 +1,69 @@
+# =============================================
+# Script: bench_instrumentacao.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Custo por chamada dos spans e contadores, com a instrumentação ligada e desligada
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import instrumentation  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def vazia():
+    return None
+
+
+@instrumentation.cronometrar("bench.decorador")
+def decorada():
+    return None
+
+
+def com_medir():
+    with instrumentation.medir("bench.contexto"):
+        return None
+
+
+def com_contador():
+    instrumentation.contar("bench.contador")
+
+
+def custo_por_chamada(funcao, chamadas):
+    inicio = time.perf_counter()
+    for _ in range(chamadas):
+        funcao()
+    return (time.perf_counter() - inicio) / chamadas * 1e9
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Custo da instrumentação por chamada")
+    parser.add_argument("--chamadas", type=int, default=500_000)
+    args = parser.parse_args()
+
+    base = custo_por_chamada(vazia, args.chamadas)
+    print(f"função vazia, sem instrumentação: {base:6.0f} ns/chamada\n")
+
+    for habilitado in (False, True):
+        instrumentation.HABILITADO = habilitado
+        instrumentation.limpar()
+        print(f"instrumentação {'ligada' if habilitado else 'desligada'}:")
+        for nome, funcao in (("@cronometrar", decorada), ("with medir()", com_medir), ("contar()", com_contador)):
+            custo = custo_por_chamada(funcao, args.chamadas)
+            print(f"  {nome:<14} {custo:6.0f} ns/chamada | extra {custo - base:6.0f} ns")
+        print()
+
+    print("spans gravados:", {nome: s["contagem"] for nome, s in instrumentation.resumo()["spans"].items()})
@@ -0,0 +1,130 @@
+# =============================================
+# Script: bench_memoria_compartilhada.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Memória de vários processos do dashboard com o snapshot lido do CSV vs mapeado do Arrow
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import cache  # noqa: E402
+import manifest  # noqa: E402
+import schema  # noqa: E402
+import shared_snapshot  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def gerar_snapshot(moedas, semente=0):
+    rng = np.random.default_rng(semente)
+    precos = rng.uniform(0.0001, 100_000, moedas)
+    return schema.aplicar_tipos(pd.DataFrame({
+        "id": [f"coin-{i}" for i in range(moedas)],
+        "symbol": [f"c{i}" for i in range(moedas)],
+        "name": [f"Coin {i}" for i in range(moedas)],
+        "current_price": precos,
+        "price_change_percentage_24h": rng.normal(0, 5, moedas),
+        "market_cap": precos * rng.uniform(1e6, 1e9, moedas),
+        "market_cap_rank": np.arange(1, moedas + 1),
+        "total_volume": rng.uniform(1e4, 1e10, moedas),
+        "circulating_supply": rng.uniform(1e3, 1e11, moedas),
+        "ath": precos * 2,
+        "atl": precos / 2,
+        "last_updated": pd.Timestamp("2026-10-16", tz="UTC"),
+    }))
+
+
+def memoria():
+    """
+    (RSS, PSS, privada) do processo em bytes. PSS divide as páginas
+    compartilhadas entre os processos que as usam: a soma do PSS é a
+    memória real do host.
+    """
+    valores = {}
+    with open("/proc/self/smaps_rollup") as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if len(partes) >= 2 and partes[0].endswith(":") and partes[1].isdigit():
+                valores[partes[0][:-1]] = int(partes[1]) * 1024
+    privada = valores.get("Private_Clean", 0) + valores.get("Private_Dirty", 0)
+    return valores.get("Rss", 0), valores.get("Pss", 0), privada
+
+
+def processo_dashboard(modo, sessoes, pasta, barreira, resultados):
+    """
+    Um processo do dashboard: cada sessão pede o snapshot pelo cache do
+    processo, como load_generation, e percorre todas as colunas. Todos os
+    processos leem a mesma geração já publicada; com o agendador real em
+    cada processo, ver bench_agendador_processos.py.
+    """
+    entrada = manifest.ultima_geracao(pasta=pasta)
+    if modo == "csv":
+        entrada = {k: v for k, v in entrada.items() if k != "caminho_snapshot_arrow"}
+
+    base = memoria()[0]
+    medidas = []
+    for _ in range(sessoes):
+        df = cache.carregar_com_cache("geracao", entrada["id"], lambda: shared_snapshot.ler_snapshot(entrada))
+        for campo in df.columns:
+            df[campo].isna().sum()  # Toca todas as páginas da coluna
+        medidas.append(memoria()[0])
+
+    barreira.wait()  # Todos os processos com o snapshot carregado ao mesmo tempo
+    rss, pss, privada = memoria()
+    resultados.put((modo, rss - base, pss, privada, medidas[0] - base, medidas[-1] - base))
+    barreira.wait()
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memória por processo e por sessão do snapshot compartilhado")
+    parser.add_argument("--moedas", type=int, default=1_000_000)
+    parser.add_argument("--processos", type=int, default=4)
+    parser.add_argument("--sessoes", type=int, default=20, help="sessões por processo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as raiz:
+        pasta = os.path.join(raiz, "raw")
+        snapshot = gerar_snapshot(args.moedas)
+        entrada = manifest.publicar_geracao(snapshot, pasta=pasta)
+        tamanho_arrow = os.path.getsize(entrada["caminho_snapshot_arrow"])
+        del snapshot
+
+        print(f"snapshot de {args.moedas:,} moedas: CSV {os.path.getsize(entrada['caminho']) / 1e6:.0f} MB, "
+              f"Arrow {tamanho_arrow / 1e6:.0f} MB; {args.processos} processos x {args.sessoes} sessões\n")
+
+        contexto = multiprocessing.get_context("spawn")
+        for modo in ("csv", "arrow"):
+            barreira = contexto.Barrier(args.processos)
+            resultados = contexto.Queue()
+            processos = [
+                contexto.Process(target=processo_dashboard, args=(modo, args.sessoes, pasta, barreira, resultados))
+                for _ in range(args.processos)
+            ]
+            for processo in processos:
+                processo.start()
+            medidas = [resultados.get() for _ in processos]
+            for processo in processos:
+                processo.join()
+
+            rss = np.mean([m[1] for m in medidas]) / 1e6
+            pss = sum(m[2] for m in medidas) / 1e6
+            privada = np.mean([m[3] for m in medidas]) / 1e6
+            por_sessao = np.mean([(m[5] - m[4]) / max(args.sessoes - 1, 1) for m in medidas]) / 1e3
+            print(f"{modo:<6} RSS extra por processo {rss:7.1f} MB | memória privada por processo {privada:7.1f} MB | "
+                  f"PSS somado (host) {pss:7.1f} MB | por sessão adicional {por_sessao:6.1f} KB")
@@ -0,0 +1,103 @@
+# =============================================
+# Script: bench_refresh.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Compara a latência da atualização via subprocessos e em processo e mede
+#            o clique em "Atualizar Dados" até a página atualizada
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+# Sem agendador em segundo plano: só o clique dispara a atualização
+os.environ["CRYPTO_INTERVALO_ATUALIZACAO"] = "0"
+
+from mock_coingecko import iniciar_servidor  # noqa: E402
+
+REPETICOES = 5
+
+# =============================================
+# Caminhos de atualização
+# =============================================
+
+def atualizar_via_subprocesso():
+    for script in ("data_fetcher.py", "data_processor.py"):
+        subprocess.run(
+            [sys.executable, os.path.join(RAIZ, "src", script)],
+            check=True,
+            stdout=subprocess.DEVNULL
+        )
+
+
+def atualizar_em_processo():
+    import pipeline
+    pipeline.atualizar_pipeline()
+
+
+def medir_clique():
+    """
+    Rerun completo do dashboard após clicar em "Atualizar Dados" (AppTest),
+    com os tempos de cada etapa informados pelo pipeline.
+    """
+    from streamlit.testing.v1 import AppTest
+    from http_client import LimitadorTaxa, obter_cliente
+
+    # Sem limite de taxa: as atualizações acima já gastaram os tokens, e o
+    # objetivo aqui é o tempo do clique, não a espera pela API
+    obter_cliente(os.environ["COINGECKO_API_URL"]).limitador = LimitadorTaxa(taxa=10_000, capacidade=10_000)
+
+    at = AppTest.from_file(os.path.join(RAIZ, "dashboard", "app.py"), default_timeout=120)
+    at.run()
+    botao = next(i for i, b in enumerate(at.sidebar.button) if b.label == "🔄 Atualizar Dados")
+
+    tempos, etapas = [], []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        at.sidebar.button[botao].click().run()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        assert not at.exception, at.exception
+        etapas.append(at.toast[0].value if len(at.toast) else "")
+    return tempos, etapas
+
+
+def medir(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    servidor, url = iniciar_servidor()
+    os.environ["COINGECKO_API_URL"] = url
+
+    # Os scripts gravam em data/ relativo ao diretório atual
+    with tempfile.TemporaryDirectory() as pasta:
+        os.chdir(pasta)
+
+        for nome, funcao in (("subprocesso", atualizar_via_subprocesso),
+                             ("em processo", atualizar_em_processo)):
+            tempos = medir(funcao)
+            print(f"{nome:>12}: mediana {statistics.median(tempos):8.1f} ms | "
+                  f"min {min(tempos):8.1f} ms | max {max(tempos):8.1f} ms")
+
+        tempos, etapas = medir_clique()
+        print(f"\nclique em Atualizar Dados até a página atualizada: mediana {statistics.median(tempos):8.1f} ms | "
+              f"max {max(tempos):8.1f} ms")
+        print(f"último aviso: {etapas[-1]}")
+
+    servidor.shutdown()
@@ -0,0 +1,188 @@
+# =============================================
+# Script: bench_render_paginas.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Tempo de render por página sob sequências de interação: derivação a cada
+#            rerun (antiga) vs visões pré-calculadas por snapshot
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+# Sem agendador: o dashboard lê a geração do disco
+os.environ["CRYPTO_INTERVALO_ATUALIZACAO"] = "0"
+
+import pandas as pd  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import data_processor  # noqa: E402
+import manifest  # noqa: E402
+import schema  # noqa: E402
+import view_models  # noqa: E402
+from mock_coingecko import gerar_moedas  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def interacoes(moedas, quantidade, semente=0):
+    """
+    Sequência de interações de um usuário: filtro de moedas (todas, um
+    recorte ou poucas), métrica, ordenação e tipo de tabela.
+    """
+    rng = random.Random(semente)
+    sequencia = []
+    for _ in range(quantidade):
+        filtro = rng.choice(("todas", "recorte", "poucas"))
+        if filtro == "todas":
+            escolhidas = moedas
+        elif filtro == "recorte":
+            escolhidas = rng.sample(moedas, len(moedas) // 2)
+        else:
+            escolhidas = rng.sample(moedas, min(5, len(moedas)))
+        sequencia.append({
+            "moedas": escolhidas,
+            "metrica": rng.choice(view_models.METRICAS_GRAFICO),
+            "ordenacao": rng.choice(view_models.ORDENACOES),
+            "formatada": rng.random() < 0.5,
+        })
+    return sequencia
+
+
+def grafico_antigo(df_raw, interacao, kind="quicksort"):
+    """
+    Derivação anterior de mostrar_graficos, refeita a cada rerun. Na
+    conferência usa ordenação estável, que fixa a ordem dos empates.
+    """
+    sorted(df_raw["name"].unique())
+    metrica = interacao["metrica"]
+    df_filtrado = df_raw.loc[df_raw["name"].isin(interacao["moedas"]), ["name", metrica]]
+    if interacao["ordenacao"] == "Crescente":
+        df_filtrado = df_filtrado.sort_values(by=metrica, ascending=True, kind=kind)
+    elif interacao["ordenacao"] == "Decrescente":
+        df_filtrado = df_filtrado.sort_values(by=metrica, ascending=False, kind=kind)
+    return df_filtrado
+
+
+def tabela_antiga(df_raw, tabelas, interacao):
+    """
+    Derivação anterior de mostrar_tabela (as tabelas rotulada e formatada já
+    vinham do cache por df_raw), refeita a cada rerun.
+    """
+    df_exibido = tabelas["formatada" if interacao["formatada"] else "bruta"]
+    sorted(df_raw["name"].unique())
+    df_filtrado = df_exibido[df_raw["name"].isin(interacao["moedas"])].copy()
+    df_filtrado.index = df_filtrado.index + 1
+    return df_filtrado
+
+
+def medir_derivacao(df_raw, resumo, sequencia):
+    """
+    Só a preparação dos dados de cada página por interação, sem o Streamlit.
+    Confere que os dois caminhos entregam os mesmos quadros.
+    """
+    tabelas = {"bruta": df_raw.rename(columns=schema.ROTULOS), "formatada": view_models.formatar_tabela(df_raw)}
+    inicio = time.perf_counter()
+    visoes = view_models.VisoesPaginas(df_raw, resumo)
+    visoes.tabela_formatada
+    montagem = time.perf_counter() - inicio
+
+    for interacao in sequencia:
+        pd.testing.assert_frame_equal(
+            grafico_antigo(df_raw, interacao, kind="stable").reset_index(drop=True),
+            visoes.grafico(interacao["metrica"], interacao["ordenacao"], interacao["moedas"]).reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(
+            tabela_antiga(df_raw, tabelas, interacao),
+            visoes.tabela(interacao["formatada"], interacao["moedas"]),
+            check_index_type=False
+        )
+
+    tempos = {}
+    for pagina, antigo, novo in (
+        ("gráficos", lambda i: grafico_antigo(df_raw, i),
+         lambda i: visoes.grafico(i["metrica"], i["ordenacao"], i["moedas"])),
+        ("tabela", lambda i: tabela_antiga(df_raw, tabelas, i),
+         lambda i: visoes.tabela(i["formatada"], i["moedas"])),
+        ("favoritas", lambda i: sorted(df_raw["name"].unique()), lambda i: visoes.moedas),
+    ):
+        for rotulo, funcao in (("antes", antigo), ("visões", novo)):
+            amostras = []
+            for interacao in sequencia:
+                inicio = time.perf_counter()
+                funcao(interacao)
+                amostras.append((time.perf_counter() - inicio) * 1000)
+            tempos[(pagina, rotulo)] = amostras
+    return montagem, tempos
+
+
+def medir_paginas(sequencia):
+    """
+    Rerun completo do app (AppTest) para cada interação da sequência, por página.
+    """
+    at = AppTest.from_file(os.path.join(RAIZ, "dashboard", "app.py"), default_timeout=120)
+    at.run()
+    tempos = {}
+    for pagina in ("🏠 Visão Geral", "📈 Gráficos", "📑 Tabela Detalhada", "⭐ Moedas Favoritas"):
+        at.session_state.pagina = pagina
+        at.run()
+        amostras = []
+        for interacao in sequencia:
+            if pagina == "📈 Gráficos":
+                at.multiselect[0].set_value(interacao["moedas"])
+                at.selectbox[0].set_value(interacao["metrica"])
+                at.radio[0].set_value(interacao["ordenacao"])
+            elif pagina == "📑 Tabela Detalhada":
+                at.radio[0].set_value("Formatado (padrão)" if interacao["formatada"] else "Dados Brutos")
+                at.multiselect[0].set_value(interacao["moedas"])
+            inicio = time.perf_counter()
+            at.run()
+            amostras.append((time.perf_counter() - inicio) * 1000)
+            assert not at.exception, at.exception
+        tempos[pagina] = amostras
+    return tempos
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render por página com visões pré-calculadas")
+    parser.add_argument("--moedas", type=int, default=5000)
+    parser.add_argument("--interacoes", type=int, default=30)
+    parser.add_argument("--app", type=int, default=300, help="moedas no rerun completo do app (0 pula)")
+    args = parser.parse_args()
+
+    df_raw = schema.aplicar_tipos(pd.DataFrame(gerar_moedas(args.moedas)))
+    resumo = data_processor.analyze_data(df_raw)
+    sequencia = interacoes(sorted(df_raw["name"].unique()), args.interacoes)
+
+    montagem, tempos = medir_derivacao(df_raw, resumo, sequencia)
+    print(f"{args.moedas:,} moedas, {args.interacoes} interações; quadros idênticos nos dois caminhos")
+    print(f"montagem das visões (uma vez por snapshot, na atualização): {montagem * 1000:.1f} ms\n")
+    print("preparação dos dados por interação:")
+    for pagina in ("gráficos", "tabela", "favoritas"):
+        antes, depois = statistics.median(tempos[(pagina, "antes")]), statistics.median(tempos[(pagina, "visões")])
+        ganho = f"{antes / depois:7.1f}x" if depois >= 0.001 else "  só leitura do atributo"
+        print(f"  {pagina:<10} antes {antes:8.3f} ms | visões {depois:8.3f} ms | {ganho}")
+
+    if args.app:
+        with tempfile.TemporaryDirectory() as pasta:
+            os.chdir(pasta)
+            df_app = pd.DataFrame(gerar_moedas(args.app))
+            manifest.publicar_geracao(df_app, analise=data_processor.tabela_analise(data_processor.analyze_data(df_app)))
+            sequencia_app = interacoes(sorted(df_app["name"].unique()), args.interacoes, semente=1)
+            print(f"\nrerun completo do app ({args.app} moedas), mediana por interação:")
+            for pagina, amostras in medir_paginas(sequencia_app).items():
+                print(f"  {pagina:<22} {statistics.median(amostras):8.1f} ms | p95 "
+                      f"{sorted(amostras)[int(len(amostras) * 0.95) - 1]:8.1f} ms")
@@ -0,0 +1,77 @@
+# =============================================
+# Script: bench_rerun.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Latência de rerun do dashboard com e sem o cache dos carregadores
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+# Sem agendador: o dashboard lê os arquivos do disco a cada rerun
+os.environ["CRYPTO_INTERVALO_ATUALIZACAO"] = "0"
+
+import pandas as pd  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import cache  # noqa: E402
+import data_processor  # noqa: E402
+import manifest  # noqa: E402
+from mock_coingecko import gerar_moedas  # noqa: E402
+
+# =============================================
+# Funções
+# =============================================
+
+def preparar_dados(quantidade):
+    """
+    Cria data/raw e data/processed sintéticos no diretório atual.
+    """
+    df = pd.DataFrame(gerar_moedas(quantidade))
+    manifest.publicar_geracao(df, analise=data_processor.tabela_analise(data_processor.analyze_data(df)))
+
+
+def medir_reruns(pagina, repeticoes):
+    at = AppTest.from_file(os.path.join(RAIZ, "dashboard", "app.py"), default_timeout=120)
+    at.run()
+    at.session_state.pagina = pagina
+    at.run()
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        at.run()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        assert not at.exception, at.exception
+    return tempos
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latência de rerun com e sem cache")
+    parser.add_argument("--moedas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--pagina", default="📑 Tabela Detalhada")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        os.chdir(pasta)
+        preparar_dados(args.moedas)
+
+        for habilitado in (False, True):
+            cache.HABILITADO = habilitado
+            cache.limpar()
+            tempos = medir_reruns(args.pagina, args.repeticoes)
+            print(f"cache {'ligado ' if habilitado else 'desligado'}: mediana {statistics.median(tempos):8.1f} ms "
+                  f"| min {min(tempos):8.1f} ms | {cache.estatisticas()}")
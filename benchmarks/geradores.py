@@ -0,0 +1,93 @@
+# =============================================
+# Script: geradores.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Geradores de snapshots e de histórico sintéticos para os benchmarks
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import os
+import sys
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pyarrow as pa  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+import history_store  # noqa: E402
+import schema  # noqa: E402
+from mock_coingecko import gerar_moedas  # noqa: E402
+
+# =============================================
+# Configurações
+# =============================================
+
+INTERVALO_PADRAO = "5min"  # Mesmo intervalo do agendador (300 s)
+VOLATILIDADE = 0.002       # Desvio do log-retorno entre dois snapshots
+
+# =============================================
+# Funções
+# =============================================
+
+def gerar_snapshot(moedas, semente=42):
+    """
+    Snapshot tipado (schema.aplicar_tipos), como o da coleta.
+    """
+    return schema.aplicar_tipos(pd.DataFrame(gerar_moedas(moedas, semente=semente)))
+
+
+def gerar_historico(moedas, snapshots, intervalo=INTERVALO_PADRAO, fim=None, semente=42,
+                    pasta=history_store.PASTA_HISTORICO):
+    """
+    Grava `snapshots` instantes de `moedas` moedas no histórico, terminando
+    em `fim` (padrão: agora), com preços em passeio aleatório a partir do
+    snapshot de gerar_snapshot. Cada dia vira um Parquet já compactado,
+    como os de history_store.compactar. Retorna o número de linhas gravadas.
+    """
+    if snapshots <= 0:
+        return 0
+
+    base = gerar_snapshot(moedas, semente)
+    fim = pd.Timestamp(fim or pd.Timestamp.now(tz="UTC")).floor(intervalo)
+    instantes = pd.date_range(end=fim, periods=snapshots, freq=intervalo, tz="UTC")
+    rng = np.random.default_rng(semente)
+
+    preco = base["current_price"].to_numpy(dtype="float64")
+    ath = base["ath"].to_numpy(dtype="float64")
+    oferta = base["circulating_supply"].to_numpy(dtype="float64")
+    constantes = {campo: base[campo].to_numpy() for campo in ("id", "symbol", "name", "atl")}
+    ranking = base["market_cap_rank"].to_numpy(dtype="int64")
+
+    linhas = 0
+    for dia, do_dia in pd.Series(instantes).groupby(instantes.strftime("%Y-%m-%d")):
+        n = len(do_dia)
+        precos = preco * np.exp(np.cumsum(rng.normal(0, VOLATILIDADE, (n, moedas)), axis=0))
+        maximos = np.fmax(np.fmax.accumulate(precos, axis=0), ath)
+        preco, ath = precos[-1], maximos[-1]
+
+        momentos = np.repeat(do_dia.to_numpy(), moedas)
+        df = pd.DataFrame({
+            "snapshot_ts": momentos,
+            **{campo: np.tile(valores, n) for campo, valores in constantes.items()},
+            "current_price": precos.ravel(),
+            "price_change_percentage_24h": rng.uniform(-15, 15, n * moedas),
+            "market_cap": (precos * oferta).ravel(),
+            "market_cap_rank": np.tile(ranking, n),
+            "total_volume": rng.uniform(1e4, 1e10, n * moedas),
+            "circulating_supply": np.tile(oferta, n),
+            "ath": maximos.ravel(),
+            "last_updated": momentos,
+        })
+        tabela = pa.Table.from_pandas(df[history_store.ESQUEMA.names], schema=history_store.ESQUEMA,
+                                      preserve_index=False)
+
+        particao = os.path.join(pasta, f"data={dia}")
+        os.makedirs(particao, exist_ok=True)
+        pq.write_table(tabela, os.path.join(particao, "compactado.parquet"))
+        linhas += len(df)
+
+    return linhas
@@ -0,0 +1,206 @@
+# =============================================
+# Script: mock_coingecko.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Servidor local que imita a API da CoinGecko para benchmarks
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# =============================================
+# Dados sintéticos
+# =============================================
+
+def gerar_moedas(quantidade, semente=42, completo=False):
+    """
+    Gera uma lista de moedas no mesmo formato do endpoint /coins/markets.
+    Com completo=True, inclui também os demais campos que a API real
+    devolve (imagem, máximas/mínimas de 24h, ROI...), que o coletor ignora.
+    """
+    rng = random.Random(semente)
+    agora = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    moedas = []
+    for i in range(quantidade):
+        preco = round(rng.uniform(0.0001, 100000), 6)
+        moedas.append({
+            "id": f"coin-{i + 1}",
+            "symbol": f"c{i + 1}",
+            "name": f"Coin {i + 1}",
+            "current_price": preco,
+            "price_change_percentage_24h": round(rng.uniform(-15, 15), 5),
+            "market_cap": int(preco * rng.uniform(1e6, 1e9)),
+            "market_cap_rank": i + 1,
+            "total_volume": int(rng.uniform(1e4, 1e10)),
+            "circulating_supply": round(rng.uniform(1e3, 1e11), 4),
+            "ath": round(preco * rng.uniform(1, 5), 6),
+            "atl": round(preco * rng.uniform(0.001, 1), 6),
+            "last_updated": agora
+        })
+        if completo:
+            moedas[-1].update({
+                "image": f"https://assets.coingecko.com/coins/images/{i + 1}/large/coin-{i + 1}.png",
+                "fully_diluted_valuation": int(preco * rng.uniform(1e6, 2e9)),
+                "high_24h": round(preco * 1.05, 6),
+                "low_24h": round(preco * 0.95, 6),
+                "price_change_24h": round(preco * rng.uniform(-0.15, 0.15), 6),
+                "market_cap_change_24h": round(rng.uniform(-1e8, 1e8), 2),
+                "market_cap_change_percentage_24h": round(rng.uniform(-15, 15), 5),
+                "total_supply": round(rng.uniform(1e3, 1e11), 4),
+                "max_supply": None if rng.random() < 0.5 else round(rng.uniform(1e3, 1e11), 4),
+                "ath_change_percentage": round(rng.uniform(-99, 0), 5),
+                "ath_date": "2021-11-10T14:24:11.849Z",
+                "atl_change_percentage": round(rng.uniform(0, 1e5), 5),
+                "atl_date": "2015-10-20T00:00:00.000Z",
+                "roi": None if rng.random() < 0.8 else {
+                    "times": round(rng.uniform(0, 100), 4), "currency": "usd", "percentage": round(rng.uniform(0, 1e4), 3)
+                },
+            })
+    return moedas
+
+# Valor de 1 BTC em cada divisa, no formato de /exchange_rates
+TAXAS_CAMBIO = {
+    "btc": {"name": "Bitcoin", "unit": "BTC", "value": 1.0, "type": "crypto"},
+    "usd": {"name": "US Dollar", "unit": "$", "value": 67000.0, "type": "fiat"},
+    "brl": {"name": "Brazil Real", "unit": "R$", "value": 361800.0, "type": "fiat"},
+    "eur": {"name": "Euro", "unit": "€", "value": 61640.0, "type": "fiat"},
+}
+
+# =============================================
+# Servidor
+# =============================================
+
+class _MockHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+
+        with self.server.lock:
+            self.server.requisicoes += 1
+            limitar = self.server.respostas_429 > 0
+            if limitar:
+                self.server.respostas_429 -= 1
+
+        if self.server.atraso:
+            time.sleep(self.server.atraso)
+
+        if limitar:
+            self._responder(429, {"error": "rate limited"}, {"Retry-After": "1"})
+        elif url.path.endswith("/stream/prices"):
+            self._transmitir(
+                float(params.get("taxa", ["100"])[0]),
+                float(params.get("lotes", ["10"])[0]),
+                float(params.get("duracao", ["0"])[0]),
+            )
+        elif url.path.endswith("/exchange_rates"):
+            self._responder(200, {"rates": TAXAS_CAMBIO})
+        elif url.path.endswith("/coins/markets"):
+            per_page = int(params.get("per_page", ["100"])[0])
+            page = int(params.get("page", ["1"])[0])
+            inicio = (page - 1) * per_page
+            corpo = self.server.moedas[inicio:inicio + per_page]
+            self._responder(200, corpo)
+        else:
+            self._responder(404, {"error": "not found"})
+
+    def _responder(self, status, corpo, headers=None):
+        dados = json.dumps(corpo).encode("utf-8")
+        etag = '"' + hashlib.md5(dados).hexdigest() + '"'
+
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        for nome, valor in (headers or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _transmitir(self, taxa, lotes_por_segundo, duracao):
+        """
+        Feed SSE de ticks de preço: `taxa` ticks/s divididos em
+        `lotes_por_segundo` eventos, cada tick com o instante de emissão
+        ("ts"). Com duracao > 0, encerra o stream depois de tantos segundos.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        rng = random.Random()
+        moedas = self.server.moedas
+        por_lote = max(1, round(taxa / lotes_por_segundo))
+        inicio = time.monotonic()
+        numero = 0
+        try:
+            while not duracao or time.monotonic() - inicio < duracao:
+                ticks = []
+                for moeda in rng.sample(moedas, min(por_lote, len(moedas))):
+                    ticks.append({
+                        "id": moeda["id"],
+                        "name": moeda["name"],
+                        "symbol": moeda["symbol"],
+                        "market_cap_rank": moeda["market_cap_rank"],
+                        "current_price": round(moeda["current_price"] * rng.uniform(0.99, 1.01), 6),
+                        "ts": time.time(),
+                    })
+                numero += 1
+                self.wfile.write(f"id: {numero}\ndata: {json.dumps(ticks)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(1 / lotes_por_segundo)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def iniciar_servidor(quantidade_moedas=10, porta=0, atraso=0.0, respostas_429=0, completo=False):
+    """
+    Sobe o servidor em uma thread e retorna (servidor, url_base).
+    - atraso: segundos de espera antes de cada resposta (simula latência)
+    - respostas_429: quantas requisições iniciais recebem 429 com Retry-After
+    - completo: moedas com todos os campos da API real (ver gerar_moedas)
+    O feed SSE de ticks fica em {url_base}/stream/prices?taxa=100&lotes=10.
+    Use servidor.shutdown() para encerrar.
+    """
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), _MockHandler)
+    servidor.moedas = gerar_moedas(quantidade_moedas, completo=completo)
+    servidor.atraso = atraso
+    servidor.respostas_429 = respostas_429
+    servidor.requisicoes = 0
+    servidor.lock = threading.Lock()
+
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+
+    host, porta = servidor.server_address
+    return servidor, f"http://{host}:{porta}/api/v3"
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    servidor, url = iniciar_servidor()
+    print(f"Mock da CoinGecko rodando em {url} (Ctrl+C para sair)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
@@ -0,0 +1,120 @@
+# =============================================
+# Script: stress_geracoes.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Teste de estresse das gerações: escritores e leitores em paralelo, sem travas na leitura
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+import pandas as pd  # noqa: E402
+
+import manifest  # noqa: E402
+import shared_snapshot  # noqa: E402
+
+MANTER = 5
+
+# =============================================
+# Funções
+# =============================================
+
+def escritor(numero, duracao, resultados):
+    """
+    Publica gerações com tamanhos variados. Snapshot e análise carregam a
+    mesma marca, para o leitor detectar uma mistura de gerações.
+    """
+    aleatorio = random.Random(numero)
+    publicadas = 0
+    fim = time.monotonic() + duracao
+    while time.monotonic() < fim:
+        marca = f"w{numero}-{publicadas}"
+        linhas = aleatorio.randint(1, 2000)
+        snapshot = pd.DataFrame({"marca": [marca] * linhas, "valor": range(linhas)})
+        analise = pd.DataFrame({"marca": [marca], "linhas": [linhas]})
+        manifest.publicar_geracao(snapshot, analise=analise)
+        manifest.podar(MANTER)
+        publicadas += 1
+    resultados.put(("escritor", publicadas, []))
+
+
+def leitor(numero, duracao, resultados):
+    """
+    Fixa a geração mais recente e lê os arquivos dela (CSV, análise e o
+    Arrow mapeado); confere marca e quantidade de linhas.
+    """
+    def ler(entrada):
+        snapshot = pd.read_csv(entrada["caminho"])
+        analise = pd.read_csv(entrada["caminho_analise"])
+        mapeado = shared_snapshot.mapear_dataframe(entrada["caminho_snapshot_arrow"])
+        return snapshot, analise, mapeado
+
+    leituras, erros = 0, []
+    fim = time.monotonic() + duracao
+    while time.monotonic() < fim:
+        try:
+            entrada, dados = manifest.ler_geracao(ler, exigir="analise", tentativas=5)
+        except Exception as e:
+            erros.append(f"leitor {numero}: {type(e).__name__}: {e}")
+            continue
+        if entrada is None:
+            continue
+
+        snapshot, analise, mapeado = dados
+        marca = analise["marca"].iloc[0]
+        if not len(snapshot) == len(mapeado) == entrada["linhas"] == analise["linhas"].iloc[0]:
+            erros.append(f"leitor {numero}: {entrada['id']} com {len(snapshot)} linhas, esperado {entrada['linhas']}")
+        if (snapshot["marca"] != marca).any() or (mapeado["marca"] != marca).any():
+            erros.append(f"leitor {numero}: {entrada['id']} mistura gerações")
+        leituras += 1
+    resultados.put(("leitor", leituras, erros))
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Escritores e leitores simultâneos de gerações")
+    parser.add_argument("--escritores", type=int, default=3)
+    parser.add_argument("--leitores", type=int, default=6)
+    parser.add_argument("--duracao", type=float, default=10.0, help="Segundos")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        os.chdir(pasta)
+        resultados = multiprocessing.Queue()
+        processos = (
+            [multiprocessing.Process(target=escritor, args=(i, args.duracao, resultados)) for i in range(args.escritores)]
+            + [multiprocessing.Process(target=leitor, args=(i, args.duracao, resultados)) for i in range(args.leitores)]
+        )
+        for processo in processos:
+            processo.start()
+        coletados = [resultados.get() for _ in processos]
+        for processo in processos:
+            processo.join()
+
+        publicadas = sum(n for tipo, n, _ in coletados if tipo == "escritor")
+        leituras = sum(n for tipo, n, _ in coletados if tipo == "leitor")
+        erros = [erro for _, _, lista in coletados for erro in lista]
+
+        entradas = manifest.listar_snapshots()
+        assert len(entradas) == MANTER, len(entradas)
+        assert all(manifest.verificar(entrada) for entrada in entradas)
+        sobras = [n for n in os.listdir(os.path.join("data", "raw")) if n.endswith(".csv")]
+
+        print(f"{publicadas} gerações publicadas, {leituras} leituras, {len(erros)} erros; "
+              f"{len(sobras)} CSVs brutos restantes (esperado {MANTER})")
+        for erro in erros[:10]:
+            print("  ", erro)
+        os.chdir(RAIZ)
+        sys.exit(1 if erros or len(sobras) != MANTER else 0)
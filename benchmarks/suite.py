@@ -0,0 +1,310 @@
+# =============================================
+# Script: suite.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Suíte de benchmarks coleta → processamento → renderização, com saída
+#            em JSON para comparar execuções
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(os.path.join(RAIZ, "src"))
+
+from mock_coingecko import iniciar_servidor  # noqa: E402
+
+# =============================================
+# Configurações
+# =============================================
+
+MOEDAS = (10, 1_000, 10_000)
+SNAPSHOTS = (1, 100, 10_000, 100_000)
+
+# Cenários com mais linhas de histórico que isto (moedas x snapshots) são pulados
+MAX_LINHAS = 1_000_000
+
+# Páginas renderizadas pelo AppTest (o modo ao vivo depende de uma fonte de ticks)
+PAGINAS = ("🏠 Visão Geral", "📈 Gráficos", "📑 Tabela Detalhada", "⭐ Moedas Favoritas")
+
+# Variação acima disto (fração) em relação à execução de referência é regressão
+TOLERANCIA = 0.10
+
+# Métrica comparada -> diferença absoluta mínima para contar como regressão
+# (medidas abaixo de ~1 ms variam mais que a tolerância só com ruído)
+METRICAS_COMPARADAS = {"mediana_ms": 1.0, "pico_tracemalloc_mb": 1.0}
+
+# =============================================
+# Medição
+# =============================================
+
+def medir(alvo, funcao, repeticoes):
+    """
+    Uma chamada de aquecimento (primeira_ms), `repeticoes` cronometradas
+    (tempo de parede e pico de RSS) e uma última sob tracemalloc: pico de
+    memória alocada pelo Python e blocos que ficaram alocados ao final.
+    """
+    inicio = time.perf_counter()
+    funcao()
+    primeira = time.perf_counter() - inicio
+
+    rss_base = _zerar_pico_rss()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    rss_pico = _pico_rss()
+
+    tracemalloc.start()
+    blocos = sys.getallocatedblocks()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    blocos = sys.getallocatedblocks() - blocos
+    tracemalloc.stop()
+
+    return {
+        "alvo": alvo,
+        "repeticoes": repeticoes,
+        "primeira_ms": primeira * 1000,
+        "mediana_ms": statistics.median(tempos) * 1000,
+        "min_ms": min(tempos) * 1000,
+        "max_ms": max(tempos) * 1000,
+        "pico_tracemalloc_mb": pico / 1e6,
+        "pico_rss_extra_mb": None if rss_base is None else (rss_pico - rss_base) / 1e6,
+        "blocos_alocados": blocos,
+    }
+
+
+def medir_cenario(moedas, snapshots, url, repeticoes, alvos):
+    """
+    Roda em um processo próprio, dentro de uma pasta temporária: gera o
+    histórico, publica uma geração pelo pipeline (contra o mock) e mede cada
+    alvo. Imprime a lista de resultados em JSON.
+    """
+    os.environ.update({
+        "COINGECKO_API_URL": url,
+        "CRYPTO_TOP_N": str(moedas),
+        "CRYPTO_INTERVALO_ATUALIZACAO": "0",
+        "CRYPTO_RETENCAO_DIAS": "0",
+    })
+    os.environ.pop("CRYPTO_FONTE_AO_VIVO", None)
+    with tempfile.TemporaryDirectory(prefix="suite_") as pasta:
+        os.chdir(pasta)
+        print(json.dumps(_medir_alvos(moedas, snapshots, url, repeticoes, alvos), ensure_ascii=False))
+
+
+def _medir_alvos(moedas, snapshots, url, repeticoes, alvos):
+    import geradores
+
+    # Histórico com snapshots - 1 instantes; o pipeline grava o último
+    linhas_historico = geradores.gerar_historico(moedas, snapshots - 1)
+
+    import data_fetcher
+    import data_processor
+    import pipeline
+    from http_client import LimitadorTaxa, obter_cliente
+    from streamlit.testing.v1 import AppTest
+
+    # Sem limite de taxa: o alvo é o custo da coleta, não a espera pela API
+    cliente = obter_cliente(url)
+    cliente.limitador = LimitadorTaxa(taxa=10_000, capacidade=10_000)
+    df, _, _ = pipeline.atualizar_pipeline()
+
+    def coletar():
+        cliente._cache.clear()  # Sem 304: toda repetição lê o corpo inteiro
+        return data_fetcher.fetch_crypto_data(top_n=moedas, publicar=False)
+
+    medidas = [
+        ("fetch_crypto_data", coletar),
+        ("load_latest_data", data_processor.load_latest_data),
+        ("analyze_data", lambda: data_processor.analyze_data(df)),
+    ]
+
+    for pagina in PAGINAS:
+        at = AppTest.from_file(os.path.join(RAIZ, "dashboard", "app.py"), default_timeout=600)
+        at.session_state.pagina = pagina
+
+        def renderizar(at=at):
+            at.run()
+            if at.exception:
+                raise RuntimeError(str(at.exception))
+
+        medidas.append((f"render.{pagina.split(' ', 1)[1]}", renderizar))
+
+    resultados = []
+    for alvo, funcao in medidas:
+        if alvos and not any(alvo.startswith(prefixo) for prefixo in alvos):
+            continue
+        resultado = medir(alvo, funcao, repeticoes)
+        resultado["cenario"] = {"moedas": moedas, "snapshots": snapshots, "linhas_historico": linhas_historico}
+        resultados.append(resultado)
+    return resultados
+
+# =============================================
+# Comparação entre execuções
+# =============================================
+
+def comparar(atual, referencia, tolerancia=TOLERANCIA):
+    """
+    Compara as medianas e os picos de memória por (moedas, snapshots, alvo).
+    Retorna a lista de regressões (texto).
+    """
+    def chave(r):
+        return r["cenario"]["moedas"], r["cenario"]["snapshots"], r["alvo"]
+
+    anteriores = {chave(r): r for r in referencia["resultados"]}
+    regressoes = []
+    print(f"\ncomparação com {referencia['criado_em']} ({referencia['maquina'].get('commit') or 'sem commit'}):")
+    for resultado in atual["resultados"]:
+        anterior = anteriores.get(chave(resultado))
+        if anterior is None:
+            continue
+        moedas, snapshots, alvo = chave(resultado)
+        partes = []
+        for metrica, minimo in METRICAS_COMPARADAS.items():
+            antes, depois = anterior[metrica], resultado[metrica]
+            variacao = (depois - antes) / antes if antes else 0.0
+            partes.append(f"{metrica} {antes:9.2f} → {depois:9.2f} ({variacao:+6.1%})")
+            if variacao > tolerancia and depois - antes > minimo:
+                regressoes.append(f"{moedas} moedas, {snapshots} snapshots, {alvo}: {metrica} {variacao:+.1%}")
+        print(f"  {moedas:>6} x {snapshots:>7} {alvo:<28} " + " | ".join(partes))
+    return regressoes
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def servir(moedas, fila):
+    servidor, url = iniciar_servidor(quantidade_moedas=moedas)
+    fila.put(url)
+    servidor.serve_forever()
+
+
+def descrever_maquina():
+    import pandas as pd
+    import pyarrow as pa
+    import streamlit as st
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "pyarrow": pa.__version__,
+        "streamlit": st.__version__,
+        "commit": commit,
+    }
+
+
+def _zerar_pico_rss():
+    """
+    Zera o pico de RSS do processo (VmHWM, Linux) e retorna o RSS atual em
+    bytes; None onde /proc não existe.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as arquivo:
+            arquivo.write("5")
+    except OSError:
+        return None
+    return _ler_status("VmRSS")
+
+
+def _pico_rss():
+    return _ler_status("VmHWM")
+
+
+def _ler_status(campo):
+    with open("/proc/self/status") as arquivo:
+        for linha in arquivo:
+            if linha.startswith(campo + ":"):
+                return int(linha.split()[1]) * 1024
+    return 0
+
+
+def _lista_inteiros(texto):
+    return [int(parte.replace("_", "")) for parte in texto.split(",") if parte]
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks: coleta → processamento → renderização")
+    parser.add_argument("--moedas", type=_lista_inteiros, default=list(MOEDAS))
+    parser.add_argument("--snapshots", type=_lista_inteiros, default=list(SNAPSHOTS))
+    parser.add_argument("--max-linhas", type=int, default=MAX_LINHAS)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--alvos", type=lambda t: t.split(","), default=[],
+                        help="Prefixos dos alvos medidos (ex.: fetch,render)")
+    parser.add_argument("--saida", help="Arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior; regressões encerram com código 1")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    parser.add_argument("--cenario", type=int, nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cenario:
+        medir_cenario(*args.cenario, args.url, args.repeticoes, args.alvos)
+        sys.exit(0)
+
+    # O mock roda em outro processo para não entrar na memória medida
+    fila = multiprocessing.Queue()
+    servidor = multiprocessing.Process(target=servir, args=(max(args.moedas), fila), daemon=True)
+    servidor.start()
+    url = fila.get()
+
+    execucao = {
+        "criado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "maquina": descrever_maquina(),
+        "resultados": [],
+    }
+    for moedas in args.moedas:
+        for snapshots in args.snapshots:
+            if moedas * snapshots > args.max_linhas:
+                print(f"{moedas:>6} moedas x {snapshots:>7} snapshots: pulado (mais de {args.max_linhas:,} linhas)")
+                continue
+            saida = subprocess.run(
+                [sys.executable, __file__, "--cenario", str(moedas), str(snapshots), "--url", url,
+                 "--repeticoes", str(args.repeticoes), "--alvos", ",".join(args.alvos)],
+                capture_output=True, text=True, check=True,
+            )
+            resultados = json.loads(saida.stdout.strip().splitlines()[-1])
+            execucao["resultados"] += resultados
+            print(f"{moedas:>6} moedas x {snapshots:>7} snapshots:")
+            for r in resultados:
+                print(f"  {r['alvo']:<28} mediana {r['mediana_ms']:9.1f} ms | primeira {r['primeira_ms']:9.1f} ms | "
+                      f"pico {r['pico_tracemalloc_mb']:8.1f} MB | blocos {r['blocos_alocados']:>8,}")
+
+    servidor.terminate()
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(execucao, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nresultados gravados em {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(execucao, json.load(arquivo), args.tolerancia)
+        if regressoes:
+            print("\nregressões acima de {:.0%}:".format(args.tolerancia))
+            for regressao in regressoes:
+                print(f"  {regressao}")
+            sys.exit(1)
@@ -8,180 +8,232 @@
 # =============================================
 
 from datetime import datetime
+import math
+import uuid
 import streamlit as st  # type: ignore
 import pandas as pd
 import altair as alt  # type: ignore
 import os
-import glob
-import subprocess
 import sys
-import time
-import io
+
+# Permite importar os módulos de src/ (pipeline, fetcher, processor)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import cache  # noqa: E402
+import exports  # noqa: E402
+import history_store  # noqa: E402
+import indicators  # noqa: E402
+import instrumentation  # noqa: E402
+import manifest  # noqa: E402
+import schema  # noqa: E402
+import streaming  # noqa: E402
+from alerts import RepositorioAlertas  # noqa: E402
+from favorites_store import RepositorioFavoritas  # noqa: E402
+from scheduler import AgendadorAtualizacao, INTERVALO_PADRAO, carregar_geracao  # noqa: E402
+from view_models import ORDENACOES, METRICAS_GRAFICO  # noqa: E402
+
+# Intervalo do agendador em segundos (0 desativa a atualização automática)
+INTERVALO_ATUALIZACAO = float(os.environ.get("CRYPTO_INTERVALO_ATUALIZACAO", INTERVALO_PADRAO))
+
+# Modo ao vivo: "" desliga, "replay" reproduz os CSVs das gerações, uma URL http(s) é um feed SSE
+FONTE_AO_VIVO = os.environ.get("CRYPTO_FONTE_AO_VIVO", "")
+
+# Segundos entre as reexecuções do painel ao vivo (só o fragmento, não a página)
+INTERVALO_AO_VIVO = float(os.environ.get("CRYPTO_INTERVALO_AO_VIVO", 1.0))
+
+# Painel de tempos por etapa na barra lateral (CRYPTO_PAINEL_ADMIN=1)
+PAINEL_ADMIN = os.environ.get("CRYPTO_PAINEL_ADMIN", "0") == "1"
+
+# Porta do servidor /metrics (Prometheus) e /metrics.json; 0 desliga
+PORTA_METRICAS = int(os.environ.get("CRYPTO_PORTA_METRICAS", 0))
+
+# Moedas por página na tela de favoritas
+TAMANHO_PAGINA_FAVORITAS = 50
+
+# Disparos de alerta listados na visão geral
+LIMITE_ALERTAS = 20
+
+# Nome das divisas nas legendas ("valor ... em dólares americanos")
+NOMES_DIVISA = {"usd": "dólares americanos", "brl": "reais", "eur": "euros"}
+
+# Largura do gráfico de histórico: até 1 ponto por pixel em cada série (o total
+# de todas as séries é limitado por downsampling.MAX_PONTOS_GRAFICO)
+LARGURA_GRAFICO_PX = 800
+
+PERIODOS_HISTORICO = {
+    "24h": pd.Timedelta(days=1),
+    "7d": pd.Timedelta(days=7),
+    "30d": pd.Timedelta(days=30),
+    "1 ano": pd.Timedelta(days=365),
+    "Tudo": None,
+}
 
 # =============================================
 # Funções de Atualização
 # =============================================
 
-def atualizar_dados():
-    data_fetcher_path = os.path.abspath(os.path.join("src", "data_fetcher.py"))
-    data_processor_path = os.path.abspath(os.path.join("src", "data_processor.py"))
-    root_path = os.path.abspath(".")
+@st.cache_resource
+def obter_agendador():
+    """
+    Um único agendador por processo do servidor, compartilhado entre as
+    sessões. Entre processos, a atualização é feita por um de cada vez e
+    os demais adotam a geração publicada (ver scheduler.py).
+    """
+    agendador = AgendadorAtualizacao(intervalo=INTERVALO_ATUALIZACAO)
+    agendador.iniciar()
+    return agendador
 
-    try:
-        with st.spinner("🔄 Atualizando dados..."):
-            # Executa o fetcher
-            fetcher_result = subprocess.run(
-                [sys.executable, data_fetcher_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=root_path
-            )
+@st.cache_resource
+def obter_transmissor():
+    """
+    Um único consumidor da fonte ao vivo por processo; as sessões só leem a
+    tabela de ticks. Retorna None com o modo ao vivo desligado.
+    """
+    if not FONTE_AO_VIVO:
+        return None
+    if FONTE_AO_VIVO == "replay":
+        fonte = streaming.FonteReplayCSV()
+    else:
+        fonte = streaming.FonteSSE(FONTE_AO_VIVO)
+    transmissor = streaming.TransmissorTicks(fonte)
+    transmissor.iniciar()
+    return transmissor
 
-            if fetcher_result.returncode != 0:
-                st.error(f"❌ Erro ao coletar dados:\n\n{fetcher_result.stderr}")
-                return
+@st.cache_resource
+def obter_servidor_metricas():
+    """
+    Um único servidor de métricas por processo. Retorna None se desligado.
+    """
+    if not PORTA_METRICAS:
+        return None
+    return instrumentation.iniciar_servidor(PORTA_METRICAS)
 
-            # Executa o processor
-            subprocess.run(
-                [sys.executable, data_processor_path],
-                check=True,
-                cwd=root_path
-            )
+@st.cache_resource
+def obter_favoritas():
+    """
+    Repositório de favoritas (SQLite) compartilhado pelas sessões do processo.
+    """
+    return RepositorioFavoritas()
 
-        # Mensagem de sucesso
-        mensagem_suave("✅ Dados atualizados com sucesso!")
+@st.cache_resource
+def obter_alertas():
+    """
+    Repositório de alertas (SQLite), só para leitura dos disparos; quem
+    avalia as regras é o pipeline, a cada snapshot.
+    """
+    return RepositorioAlertas()
 
-    except subprocess.CalledProcessError as e:
-        st.error(f"❌ Erro ao executar subprocesso: {e}")
-    except Exception as e:
-        st.error(f"❌ Erro inesperado: {e}")
-
-def fade_out(placeholder):
-    """
-    Faz a mensagem de sucesso desaparecer suavemente apenas apagando a opacidade,
-    sem alterar tamanho, sem remover espaço, sem encolher.
-    """
-    placeholder.markdown(
-        """
-        <style>
-        .fade-message {
-            font-size: 20px;
-            color: #22c55e;  /* verde bonito */
-            animation: fadeOut 3s ease forwards;
-            padding: 0.5rem;
-            margin: 0.5rem 0;
-            background-color: rgba(34, 197, 94, 0.1);
-            border-radius: 8px;
-            text-align: center;
-        }
-        @keyframes fadeOut {
-            0% {opacity: 1;}
-            100% {opacity: 0;}
-        }
-        </style>
-
-        <div class="fade-message">
-            ✅ Dados atualizados com sucesso!
-        </div>
-        """,
-        unsafe_allow_html=True
+def escolher_divisa(visoes):
+    """
+    Seletor de divisa na barra lateral, com as divisas que têm câmbio no
+    snapshot. A escolha fica na sessão; se deixar de existir, volta para US$.
+    """
+    if st.session_state.get("divisa") not in visoes.divisas:
+        st.session_state.divisa = schema.DIVISA_BASE
+    return st.sidebar.selectbox(
+        "💱 Divisa:",
+        visoes.divisas,
+        format_func=lambda divisa: f"{divisa.upper()} ({schema.SIMBOLOS_DIVISA[divisa]})",
+        key="divisa"
     )
 
-    time.sleep(4)  # Espera o fade-out terminar
-    placeholder.empty()  # Remove o placeholder após o fade-out
-    time.sleep(1)  # Espera um pouco antes de remover o placeholder
+def obter_usuario():
+    """
+    Dono da lista de favoritas: o e-mail do login do Streamlit, se houver;
+    senão o parâmetro ?usuario= da URL, criado na primeira visita para que a
+    lista volte ao reabrir o mesmo endereço.
+    """
+    usuario_logado = st.experimental_user
+    if usuario_logado.get("is_logged_in") and usuario_logado.get("email"):
+        return usuario_logado.get("email")
+
+    usuario = st.query_params.get("usuario")
+    if not usuario:
+        usuario = st.session_state.setdefault("usuario", uuid.uuid4().hex[:12])
+        st.query_params["usuario"] = usuario
+    return usuario
+
+def atualizar_dados(agendador):
+    """
+    Pede uma atualização ao agendador. Cliques simultâneos de vários usuários
+    aguardam a mesma atualização em andamento. O aviso de sucesso é um toast
+    que some sozinho no navegador, sem segurar o rerun no servidor.
+    """
+    try:
+        with st.spinner("🔄 Atualizando dados..."):
+            snapshot = agendador.atualizar_agora()
+
+        tempos = snapshot.tempos
+        if tempos is None:
+            # Outro processo do servidor atualizou enquanto este esperava a vez
+            st.toast(f"Dados atualizados (geração de {snapshot.gerado_em:%H:%M:%S}).", icon="✅")
+        else:
+            st.toast(
+                f"Dados atualizados em {tempos.total_ms:.0f} ms (coleta {tempos.coleta_ms:.0f} ms · "
+                f"análise {tempos.analise_ms:.0f} ms · gravação {tempos.persistencia_ms:.0f} ms)",
+                icon="✅"
+            )
+
+    except Exception as e:
+        st.error(f"❌ Erro ao atualizar dados:\n\n{e}")
 
 # =============================================
 # Funções Auxiliares
 # =============================================
 
-def mensagem_suave(mensagem):
-    """
-    Exibe uma mensagem que desaparece suavemente.
-    """
-    placeholder = st.empty()
-    placeholder.success(mensagem)
-
-    time.sleep(2)
-
-    placeholder.markdown(
-        """
-        <style>
-        .fade-message {
-            animation: fadeOut 2s forwards;
-        }
-        @keyframes fadeOut {
-            from {opacity: 1;}
-            to {opacity: 0;}
-        }
-        </style>
-        <div class="fade-message">
-            ✅ Dados atualizados com sucesso!
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-    time.sleep(2.5)
-    placeholder.empty()
-
-def load_analysis(processed_data_path="data/processed/crypto_analysis.csv"):
-    if not os.path.exists(processed_data_path):
+@instrumentation.cronometrar("carregar.geracao")
+def load_generation():
+    """
+    Carrega a análise e as visões das páginas da mesma geração (a mais
+    recente com análise), com os nomes de campo e dtypes do esquema único
+    (schema.py). A geração é fixada pelo manifesto, sem travas: arquivos de
+    uma geração publicada nunca são reescritos. O snapshot é mapeado do
+    Arrow da geração, então todas as sessões e processos do host usam as
+    mesmas páginas; resumo e visões são montados uma vez por processo
+    (scheduler.carregar_geracao).
+    """
+    entrada, dados = manifest.ler_geracao(carregar_geracao, exigir="analise")
+    if entrada is None:
         st.error("Arquivo de análise não encontrado. Execute a atualização primeiro.")
-        return None
-    return pd.read_csv(processed_data_path)
-
-def load_raw_data():
-    """
-    Carrega o arquivo de dados brutos mais recente para gráficos e tabelas detalhadas,
-    e cria uma versão formatada para exibição.
-    """
-    raw_files = glob.glob('data/raw/*.csv')
-    if raw_files:
-        latest_raw_file = max(raw_files, key=os.path.getctime)
-        df_raw = pd.read_csv(latest_raw_file)
-
-        # Renomear colunas
-        df_raw.rename(columns={
-            "id": "Nome Técnico",
-            "symbol": "Símbolo",
-            "name": "Nome da Moeda",
-            "current_price": "Preço Atual (US$)",
-            "price_change_percentage_24h": "Variação 24h (%)",
-            "market_cap": "Valor de Mercado (US$)",
-            "market_cap_rank": "Ranking de Mercado",
-            "total_volume": "Volume Total (US$)",
-            "circulating_supply": "Quantidade Circulante",
-            "ath": "Preço Máximo Histórico",
-            "atl": "Preço Mínimo Histórico",
-            "last_updated": "Última Atualização"
-        }, inplace=True)
-
-        # Corrigir data
-        df_raw['Última Atualização'] = pd.to_datetime(df_raw['Última Atualização']).dt.strftime('%Y-%m-%d %H:%M:%S')
-
-        # Criar versão formatada
-        df_formatado = df_raw.copy()
-
-        # Formatando valores monetários
-        colunas_moeda = [
-            "Preço Atual (US$)", "Valor de Mercado (US$)", "Volume Total (US$)",
-            "Preço Máximo Histórico", "Preço Mínimo Histórico"
-        ]
-        colunas_quantidade = ["Quantidade Circulante"]
-
-        for col in colunas_moeda:
-            df_formatado[col] = df_formatado[col].apply(lambda x: f"{x:,.2f}".replace(",", "X").replace(".", ",").replace("X", "."))
+        return None, None
+    resumo, _, visoes = dados
+    return resumo, visoes
 
-        for col in colunas_quantidade:
-            df_formatado[col] = df_formatado[col].apply(lambda x: f"{x:,.0f}".replace(",", "X").replace(".", ",").replace("X", "."))
+@instrumentation.cronometrar("carregar.indicadores")
+def load_indicators():
+    """
+    Indicadores móveis da geração mais recente que os tem (gerados pelo
+    pipeline a partir do histórico).
+    """
+    entrada, df = manifest.ler_geracao(
+        lambda entrada: cache.carregar_com_cache(
+            "indicadores",
+            (entrada["id"], entrada["sha256_indicadores"]),
+            lambda: pd.read_csv(entrada["caminho_indicadores"])
+        ),
+        exigir="indicadores"
+    )
+    return df
 
-        df_formatado["Variação 24h (%)"] = df_formatado["Variação 24h (%)"].apply(lambda x: f"{x:.2f}%")
+def filtrar_favoritas(visoes):
+    """
+    Moedas do snapshot restritas às favoritas do usuário, se houver alguma.
+    """
+    favoritas = obter_favoritas().listar(obter_usuario())
+    if favoritas:
+        return visoes.somente(favoritas)
+    return visoes.moedas
 
-        return df_raw, df_formatado
-    else:
-        return None, None
+def gravar_favoritas(chave, trecho, usuario):
+    """
+    on_change do editor de favoritas: grava as linhas editadas (posições no
+    trecho exibido) antes do rerun, que já redesenha a tabela a partir do
+    repositório. Nenhum clique depende do rerun seguinte para ser salvo.
+    """
+    edicoes = st.session_state[chave]["edited_rows"]
+    repositorio = obter_favoritas()
+    repositorio.adicionar(usuario, {trecho[linha] for linha, campos in edicoes.items() if campos.get("Favorita") is True})
+    repositorio.remover(usuario, {trecho[linha] for linha, campos in edicoes.items() if campos.get("Favorita") is False})
 
 # =============================================
 # Funções de Páginas
@@ -191,23 +243,22 @@ def pegar_ultima_data():
     """
     Busca a data da última atualização dos dados processados.
     """
-    caminho = "data/processed/crypto_analysis.csv"
-    if os.path.exists(caminho):
-        timestamp = os.path.getmtime(caminho)
-        ultima_data = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
-        return ultima_data
+    entrada = manifest.ultima_geracao(exigir="analise")
+    if entrada is not None:
+        return entrada["timestamp"].replace("T", " ")
     return None
 
-def mostrar_visao_geral(df):
+@instrumentation.cronometrar("pagina.visao_geral")
+def mostrar_visao_geral(resumo, visoes):
 
-    # Buscar dados do dataframe
-    moeda_subiu = df['best_coin'][0]
-    var_subiu = df['best_change'][0]
+    # Buscar dados do resumo
+    moeda_subiu = resumo.best_coin
+    var_subiu = resumo.best_change
 
-    moeda_caiu = df['worst_coin'][0]
-    var_caiu = df['worst_change'][0]
+    moeda_caiu = resumo.worst_coin
+    var_caiu = resumo.worst_change
 
-    media_geral = df['average_change'][0]
+    media_geral = resumo.average_change
 
     # Layout com três colunas de cards
     col1, col2, col3 = st.columns(3)
@@ -258,25 +309,25 @@ def mostrar_visao_geral(df):
     else:
         st.info("📈 Mercado está relativamente estável no momento.")
 
-    st.markdown("<br>", unsafe_allow_html=True)
-
     # =============================
-    # Top 3 moedas que mais subiram
+    # Alertas disparados nos últimos snapshots
     # =============================
-    st.subheader("🏆 Top 3 Criptomoedas em Alta")
-
-    top3 = df[['top1_coin', 'top1_change', 'top2_coin', 'top2_change', 'top3_coin', 'top3_change']]
-
-    col4, col5, col6 = st.columns(3)
+    disparos = obter_alertas().recentes(LIMITE_ALERTAS)
+    if not disparos.empty:
+        with st.expander(f"🔔 Alertas Recentes ({len(disparos)})"):
+            st.dataframe(disparos, hide_index=True, use_container_width=True)
 
-    with col4:
-        st.metric(label=top3['top1_coin'][0], value=f"{top3['top1_change'][0]:.2f}%", delta_color="normal")
+    st.markdown("<br>", unsafe_allow_html=True)
 
-    with col5:
-        st.metric(label=top3['top2_coin'][0], value=f"{top3['top2_change'][0]:.2f}%", delta_color="normal")
+    # =============================
+    # Top K moedas que mais subiram
+    # =============================
+    st.subheader(f"🏆 Top {len(resumo.top)} Criptomoedas em Alta")
 
-    with col6:
-        st.metric(label=top3['top3_coin'][0], value=f"{top3['top3_change'][0]:.2f}%", delta_color="normal")
+    if resumo.top:
+        for coluna, (moeda, variacao) in zip(st.columns(len(resumo.top)), resumo.top):
+            with coluna:
+                st.metric(label=moeda, value=f"{variacao:.2f}%", delta_color="normal")
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -285,13 +336,7 @@ def mostrar_visao_geral(df):
     # =============================
     st.subheader("📊 Resumo de Performance das Moedas")
 
-    # Exemplo de df para gráfico
-    grafico_df = pd.DataFrame({
-        'Status': ['Subiram', 'Caíram'],
-        'Quantidade': [df['coins_up'][0], df['coins_down'][0]]
-    })
-
-    grafico = alt.Chart(grafico_df).mark_bar(size=40).encode(
+    grafico = alt.Chart(visoes.grafico_status).mark_bar(size=40).encode(
         x=alt.X('Status:N', title='Status'),
         y=alt.Y('Quantidade:Q', title='Quantidade de Moedas'),
         color=alt.Color('Status:N', scale=alt.Scale(domain=['Subiram', 'Caíram'], range=['#22c55e', '#ef4444'])),
@@ -301,29 +346,28 @@ def mostrar_visao_geral(df):
         height=300
     )
 
-    st.altair_chart(grafico, use_container_width=True)
+    with instrumentation.medir("render.altair"):
+        st.altair_chart(grafico, use_container_width=True)
 
     # =============================
     # Última atualização humanizada
     # =============================
-    ultima_atualizacao = df['ultima_atualizacao'][0]
+    ultima_atualizacao = resumo.ultima_atualizacao
     ultima_atualizacao_dt = datetime.strptime(ultima_atualizacao, '%Y-%m-%d %H:%M:%S')
     tempo_passado = datetime.now() - ultima_atualizacao_dt
     minutos_passados = int(tempo_passado.total_seconds() // 60)
 
     st.caption(f"⏳ Atualizado há {minutos_passados} minutos.")
 
-def mostrar_graficos(df_raw):
+@instrumentation.cronometrar("pagina.graficos")
+def mostrar_graficos(visoes):
     st.header("📊 Análises Gráficas")
 
-    if df_raw is not None:
-        moedas_disponiveis = sorted(df_raw["Nome da Moeda"].unique())
-
+    if visoes is not None:
         # 🔍 Opção para mostrar apenas favoritas
         mostrar_so_favoritas = st.checkbox("🔍 Mostrar apenas favoritas", value=False)
 
-        if mostrar_so_favoritas and "favoritas" in st.session_state and st.session_state.favoritas:
-            moedas_disponiveis = [moeda for moeda in moedas_disponiveis if moeda in st.session_state.favoritas]
+        moedas_disponiveis = filtrar_favoritas(visoes) if mostrar_so_favoritas else visoes.moedas
 
         opcoes_moedas = st.multiselect(
             "Escolha as criptomoedas para visualizar:",
@@ -332,80 +376,122 @@ def mostrar_graficos(df_raw):
             placeholder="Selecione moedas..."
         )
 
-        metricas_disponiveis = ["Variação 24h (%)", "Preço Atual (US$)", "Quantidade Circulante"]
         metrica_escolhida = st.selectbox(
             "Selecione a métrica para o gráfico:",
-            metricas_disponiveis
+            METRICAS_GRAFICO,
+            format_func=visoes.rotulos.get
         )
 
         ordenacao = st.radio(
             "Ordenação dos dados:",
-            ("Misto", "Crescente", "Decrescente"),
+            ORDENACOES,
             horizontal=True,
             label_visibility="collapsed"
         )
 
-        df_filtrado = df_raw[df_raw["Nome da Moeda"].isin(opcoes_moedas)][["Nome da Moeda", metrica_escolhida]].copy()
-
-        if metrica_escolhida in ["Preço Atual (US$)", "Variação 24h (%)", "Quantidade Circulante"]:
-            df_filtrado[metrica_escolhida] = (
-                df_filtrado[metrica_escolhida]
-                .astype(str)
-                .str.replace('.', '', regex=False)
-                .str.replace(',', '.', regex=False)
-                .astype(float)
-            )
-
-        if ordenacao == "Crescente":
-            df_filtrado = df_filtrado.sort_values(by=metrica_escolhida, ascending=True)
-        elif ordenacao == "Decrescente":
-            df_filtrado = df_filtrado.sort_values(by=metrica_escolhida, ascending=False)
+        # Ordenações pré-calculadas no snapshot: só seleciona as linhas
+        df_filtrado = visoes.grafico(metrica_escolhida, ordenacao, opcoes_moedas)
 
         st.markdown("---")
 
         st.caption({
-            "Variação 24h (%)": "ℹ️ Percentual de valorização ou desvalorização nas últimas 24 horas.",
-            "Preço Atual (US$)": "ℹ️ Valor atual da criptomoeda em dólares americanos.",
-            "Quantidade Circulante": "ℹ️ Número total de unidades disponíveis no mercado."
+            "price_change_percentage_24h": "ℹ️ Percentual de valorização ou desvalorização nas últimas 24 horas.",
+            "current_price": f"ℹ️ Valor atual da criptomoeda em {NOMES_DIVISA[visoes.divisa]}.",
+            "circulating_supply": "ℹ️ Número total de unidades disponíveis no mercado."
         }[metrica_escolhida])
 
+        rotulo_metrica = visoes.rotulos[metrica_escolhida]
+
         chart = alt.Chart(df_filtrado).mark_bar(size=40).encode(
-            x=alt.X('Nome da Moeda:N', sort=None, title='Criptomoeda'),
-            y=alt.Y(f'{metrica_escolhida}:Q', title=metrica_escolhida),
+            x=alt.X('name:N', sort=None, title='Criptomoeda'),
+            y=alt.Y(f'{metrica_escolhida}:Q', title=rotulo_metrica),
             color=alt.condition(
                 alt.datum[metrica_escolhida] >= 0,
                 alt.value("#4CAF50"),
                 alt.value("#FF5252")
             ),
-            tooltip=[alt.Tooltip('Nome da Moeda:N'), alt.Tooltip(f'{metrica_escolhida}:Q', format=",.2f")]
+            tooltip=[
+                alt.Tooltip('name:N', title=schema.rotulo("name")),
+                alt.Tooltip(f'{metrica_escolhida}:Q', title=rotulo_metrica, format=",.2f")
+            ]
         ).properties(
             width=800,
             height=500
         )
 
-        st.altair_chart(chart, use_container_width=True)
+        with instrumentation.medir("render.altair"):
+            st.altair_chart(chart, use_container_width=True)
+
+        st.markdown("---")
+        mostrar_historico(opcoes_moedas, visoes)
 
     else:
         st.warning("Nenhum dado disponível para gerar o gráfico.")
 
-def mostrar_tabela(df_raw, df_raw_formatado):
+@instrumentation.cronometrar("pagina.historico")
+def mostrar_historico(opcoes_moedas, visoes):
+    """
+    Linha do preço ao longo do tempo. O nível (1m/1h/1d) é escolhido pelo
+    período visível e pelo orçamento de pontos do gráfico, dividido entre as
+    moedas, e cada série é reduzida por LTTB, então o volume enviado ao
+    navegador não cresce com o histórico nem com o número de moedas. Os
+    dados ficam guardados nas visões do snapshot (VisoesPaginas.historico).
+    O histórico é gravado em US$; em outra divisa, a série inteira é
+    convertida pelo câmbio do snapshot atual.
+    """
+    st.subheader("📉 Histórico de Preço")
+
+    periodo = st.radio("Período:", list(PERIODOS_HISTORICO), index=1, horizontal=True)
+    dados, nivel, exibidas, pedidas = visoes.historico(
+        opcoes_moedas, PERIODOS_HISTORICO[periodo], LARGURA_GRAFICO_PX
+    )
+
+    if dados.empty:
+        if history_store.primeiro_dia() is None:
+            st.info("O histórico ainda está vazio. Ele é preenchido a cada atualização.")
+        else:
+            st.info("Sem histórico para as moedas e o período escolhidos.")
+        return
+
+    rotulo_preco = visoes.rotulos["current_price"]
+
+    chart = alt.Chart(dados[["snapshot_ts", "name", "current_price"]]).mark_line().encode(
+        x=alt.X('snapshot_ts:T', title='Data'),
+        y=alt.Y('current_price:Q', title=rotulo_preco, scale=alt.Scale(zero=False)),
+        color=alt.Color('name:N', title=schema.rotulo("name")),
+        tooltip=[
+            alt.Tooltip('name:N', title=schema.rotulo("name")),
+            alt.Tooltip('snapshot_ts:T', title='Data', format='%Y-%m-%d %H:%M'),
+            alt.Tooltip('current_price:Q', title=rotulo_preco, format=",.2f")
+        ]
+    ).properties(
+        width=LARGURA_GRAFICO_PX,
+        height=400
+    )
+
+    with instrumentation.medir("render.altair"):
+        st.altair_chart(chart, use_container_width=True)
+    legenda = f"ℹ️ Resolução {nivel}, {len(dados)} pontos exibidos."
+    if exibidas < pedidas:
+        legenda += f" Mostrando as {exibidas} maiores por valor de mercado das {pedidas} escolhidas."
+    if visoes.divisa != schema.DIVISA_BASE:
+        legenda += f" Valores convertidos pelo câmbio atual (1 US$ = {visoes.fator:,.4f} {visoes.divisa.upper()})."
+    st.caption(legenda)
+
+@instrumentation.cronometrar("pagina.tabela")
+def mostrar_tabela(visoes):
     st.header("🔍 Tabela Detalhada das Criptomoedas")
 
-    if df_raw is not None and df_raw_formatado is not None:
+    if visoes is not None:
         tipo_exibicao = st.radio(
             "Tipo de Exibição:",
             ("Formatado (padrão)", "Dados Brutos"),
             horizontal=True
         )
 
-        df_exibido = df_raw_formatado if tipo_exibicao == "Formatado (padrão)" else df_raw
-
-        moedas_disponiveis = sorted(df_exibido["Nome da Moeda"].unique())
-
         mostrar_so_favoritas = st.checkbox("🔍 Mostrar apenas favoritas", value=False)
 
-        if mostrar_so_favoritas and "favoritas" in st.session_state and st.session_state.favoritas:
-            moedas_disponiveis = [moeda for moeda in moedas_disponiveis if moeda in st.session_state.favoritas]
+        moedas_disponiveis = filtrar_favoritas(visoes) if mostrar_so_favoritas else visoes.moedas
 
         opcoes_moedas = st.multiselect(
             "Filtrar criptomoedas:",
@@ -414,77 +500,188 @@ def mostrar_tabela(df_raw, df_raw_formatado):
             placeholder="Selecione as moedas..."
         )
 
-        df_filtrado = df_exibido[df_exibido["Nome da Moeda"].isin(opcoes_moedas)].copy()
-        df_filtrado.index = df_filtrado.index + 1
+        # Tabelas rotuladas (índice 1..n) montadas no snapshot: só seleciona as linhas
+        df_filtrado = visoes.tabela(tipo_exibicao == "Formatado (padrão)", opcoes_moedas)
 
         st.dataframe(df_filtrado, use_container_width=True)
 
+        df_indicadores = load_indicators()
+        if df_indicadores is not None:
+            with st.expander("📐 Indicadores Móveis"):
+                df_indicadores = df_indicadores[df_indicadores["name"].isin(opcoes_moedas)]
+                st.dataframe(
+                    df_indicadores.set_index("name")[indicators.INDICADORES]
+                    .rename_axis(schema.rotulo("name"))
+                    .rename(columns=indicators.ROTULOS),
+                    use_container_width=True
+                )
+                st.caption(
+                    f"Janelas de {indicators.JANELA_RETORNO} snapshots; "
+                    "retorno, volatilidade e distância do ATH em fração (0,01 = 1%)."
+                )
+
         formato_exportacao = st.radio(
             "Escolha o formato para exportar:",
-            ("CSV", "Excel (.xlsx)"),
+            list(exports.FORMATOS),
             horizontal=True
         )
 
         data_atual = datetime.now().strftime("%Y-%m-%d")
         nome_base = f"CryptoPrice_Tabela_{data_atual}"
-
-        if formato_exportacao == "CSV":
-            buffer = io.BytesIO()
-            df_filtrado.to_csv(buffer, index=False, encoding='utf-8-sig')
-            buffer.seek(0)
+        if visoes.divisa != schema.DIVISA_BASE:
+            nome_base += f"_{visoes.divisa.upper()}"
+        _, extensao, mime = exports.FORMATOS[formato_exportacao]
+        formatada = tipo_exibicao == "Formatado (padrão)"
+
+        # O arquivo só é gerado quando pedido; depois fica guardado no snapshot
+        # e reaparece pronto para as mesmas moedas e formato
+        dados = visoes.exportacao(formatada, opcoes_moedas, formato_exportacao, gerar=False)
+        if dados is None and st.button(f"📦 Preparar arquivo ({formato_exportacao})"):
+            with st.spinner("Gerando arquivo..."):
+                dados = visoes.exportacao(formatada, opcoes_moedas, formato_exportacao)
+
+        if dados is not None:
             st.download_button(
-                label="⬇️ Baixar Tabela (CSV)",
-                data=buffer,
-                file_name=f"{nome_base}.csv",
-                mime='text/csv'
-            )
-
-        elif formato_exportacao == "Excel (.xlsx)":
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                df_filtrado.to_excel(writer, sheet_name='Criptomoedas', index=False)
-            buffer.seek(0)
-            st.download_button(
-                label="⬇️ Baixar Tabela (Excel)",
-                data=buffer,
-                file_name=f"{nome_base}.xlsx",
-                mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                label=f"⬇️ Baixar Tabela ({formato_exportacao})",
+                data=dados,
+                file_name=f"{nome_base}.{extensao}",
+                mime=mime
             )
     else:
         st.warning("Nenhum dado para mostrar.")
 
-def mostrar_favoritas(df_raw):
+def mostrar_ao_vivo():
+    st.header("⚡ Preços Ao Vivo")
+
+    if obter_transmissor() is None:
+        st.info(
+            "Modo ao vivo desligado. Defina CRYPTO_FONTE_AO_VIVO com a URL de um feed SSE "
+            "ou com 'replay' para reproduzir os snapshots gravados."
+        )
+        return
+
+    painel_ao_vivo()
+
+@st.fragment(run_every=INTERVALO_AO_VIVO)
+@instrumentation.cronometrar("pagina.ao_vivo")
+def painel_ao_vivo():
+    """
+    Só este trecho é reexecutado a cada INTERVALO_AO_VIVO segundos, não a
+    página inteira. A sessão guarda a tabela que já exibiu e aplica nela
+    apenas as linhas alteradas desde a última versão vista.
+    """
+    transmissor = obter_transmissor()
+    estado = st.session_state.setdefault("ao_vivo", {"versao": 0, "tabela": None})
+
+    versao, alteradas = transmissor.tabela.alteracoes_desde(estado["versao"])
+    if len(alteradas):
+        tabela = streaming.aplicar_alteracoes(estado["tabela"], alteradas)
+        estado["tabela"] = tabela.sort_values("market_cap_rank", na_position="last")
+        estado["versao"] = versao
+        transmissor.registrar_exibicao(alteradas)
+
+    metricas = transmissor.metricas()
+    latencia_tela = metricas["latencia"].get("tela", {})
+    latencia_ingestao = metricas["latencia"].get("ingestao", {})
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Moedas", metricas["moedas"])
+    col2.metric("Ticks/s", f"{metricas['ticks_por_segundo']:.1f}")
+    col3.metric("Latência tick → tela (p50)", f"{latencia_tela.get('p50_ms', 0):.0f} ms")
+    col4.metric("Latência tick → tela (p95)", f"{latencia_tela.get('p95_ms', 0):.0f} ms")
+
+    if estado["tabela"] is None:
+        st.info("Aguardando os primeiros ticks...")
+        return
+
+    exibida = estado["tabela"].drop(columns=["ts_origem", "recebido_em"]).reset_index()
+    st.dataframe(exibida.rename(columns=schema.ROTULOS), use_container_width=True, hide_index=True)
+    st.caption(
+        f"ℹ️ {len(alteradas)} linhas alteradas nesta atualização. Chegada à tabela: "
+        f"p50 {latencia_ingestao.get('p50_ms', 0):.0f} ms, p95 {latencia_ingestao.get('p95_ms', 0):.0f} ms."
+    )
+    if metricas["ultimo_erro"]:
+        st.warning(f"Último erro da fonte ao vivo: {metricas['ultimo_erro']}")
+
+@instrumentation.cronometrar("pagina.favoritas")
+def mostrar_favoritas(visoes):
+    """
+    Favoritas salvas no servidor por usuário. A lista é buscada e paginada
+    e cada página é uma única tabela editável, em vez de um botão por moeda.
+    """
     st.header("⭐ Gerenciar Moedas Favoritas")
 
-    if "favoritas" not in st.session_state:
-        st.session_state.favoritas = []
-
-    if df_raw is not None:
-        moedas_disponiveis = sorted(df_raw["Nome da Moeda"].unique())
-
-        for moeda in moedas_disponiveis:
-            col1, col2 = st.columns([0.9, 0.1])
-            with col1:
-                st.write(moeda)
-            with col2:
-                if moeda in st.session_state.favoritas:
-                    if st.button("⭐", key=f"desfav_{moeda}"):
-                        st.session_state.favoritas.remove(moeda)
-                else:
-                    if st.button("☆", key=f"fav_{moeda}"):
-                        st.session_state.favoritas.append(moeda)
-
-        if st.session_state.favoritas:
-            st.success(f"Favoritas: {', '.join(st.session_state.favoritas)}")
+    if visoes is not None:
+        repositorio = obter_favoritas()
+        usuario = obter_usuario()
+        favoritas = repositorio.listar(usuario)
+
+        busca = st.text_input("🔎 Buscar moeda:", placeholder="Digite parte do nome...")
+        so_favoritas = st.checkbox("Mostrar apenas favoritas", value=False, key="favoritas_so_marcadas")
+
+        moedas = visoes.buscar(busca)
+        if so_favoritas:
+            moedas = [moeda for moeda in moedas if moeda in favoritas]
+
+        total_paginas = max(1, math.ceil(len(moedas) / TAMANHO_PAGINA_FAVORITAS))
+        pagina = 1
+        if total_paginas > 1:
+            pagina = st.number_input(f"Página (de {total_paginas}):", min_value=1, max_value=total_paginas, value=1)
+        trecho = moedas[(pagina - 1) * TAMANHO_PAGINA_FAVORITAS:pagina * TAMANHO_PAGINA_FAVORITAS]
+
+        # Chave estável por trecho; as edições são gravadas no on_change, e a
+        # tabela do rerun seguinte já vem do repositório
+        chave = f"favoritas_{busca}_{so_favoritas}_{pagina}"
+        st.data_editor(
+            pd.DataFrame({"Favorita": [moeda in favoritas for moeda in trecho], "Moeda": trecho}),
+            key=chave,
+            on_change=gravar_favoritas,
+            args=(chave, trecho, usuario),
+            disabled=["Moeda"],
+            hide_index=True,
+            use_container_width=True,
+            column_config={"Favorita": st.column_config.CheckboxColumn("⭐")}
+        )
+
+        if favoritas:
+            nomes = sorted(favoritas)
+            st.success(f"{len(nomes)} favoritas: {', '.join(nomes[:20])}" + (" ..." if len(nomes) > 20 else ""))
         else:
             st.info("Nenhuma moeda favoritada ainda.")
+        st.caption(f"ℹ️ Lista salva no servidor para o usuário '{usuario}' (parâmetro ?usuario= da URL).")
     else:
         st.warning("Nenhum dado disponível para favoritar.")
 
+def mostrar_painel_admin():
+    """
+    Percentis por etapa (spans de instrumentation.py) na barra lateral,
+    acumulados no processo desde que o servidor subiu.
+    """
+    with st.sidebar.expander("🛠️ Tempos por Etapa"):
+        dados = instrumentation.resumo()
+        if not dados["spans"]:
+            st.caption("Nenhuma medição ainda (ou CRYPTO_METRICAS=0).")
+            return
+
+        tabela = pd.DataFrame.from_dict(dados["spans"], orient="index")[["contagem", "p50_ms", "p95_ms"]]
+        st.dataframe(
+            tabela.rename(columns={"contagem": "Chamadas", "p50_ms": "p50 (ms)", "p95_ms": "p95 (ms)"}).round(1),
+            use_container_width=True
+        )
+        if dados["contadores"]:
+            st.caption(" · ".join(f"{nome}: {valor}" for nome, valor in dados["contadores"].items()))
+        st.download_button(
+            label="⬇️ Métricas (Prometheus)",
+            data=instrumentation.exportar_prometheus(),
+            file_name="metricas.prom",
+            mime="text/plain"
+        )
+
 # =============================================
 # Aplicativo Principal
 # =============================================
 
+@instrumentation.cronometrar("dashboard.rerun")
 def main():
     st.set_page_config(page_title="Crypto Dashboard", layout="wide")
 
@@ -508,13 +705,17 @@ def main():
         st.session_state.pagina = "📑 Tabela Detalhada"
     if st.sidebar.button("⭐ Moedas Favoritas"):
         st.session_state.pagina = "⭐ Moedas Favoritas"
+    if st.sidebar.button("⚡ Ao Vivo"):
+        st.session_state.pagina = "⚡ Ao Vivo"
 
     # Separador
     st.sidebar.markdown("---")
 
     # Botão de Atualizar Dados
+    agendador = obter_agendador()
+    obter_servidor_metricas()
     if st.sidebar.button("🔄 Atualizar Dados"):
-        atualizar_dados()
+        atualizar_dados(agendador)
 
     # 🕒 Mostrar última atualização no sidebar
     ultima_atualizacao = pegar_ultima_data()
@@ -529,23 +730,37 @@ def main():
             unsafe_allow_html=True
         )
 
-    # Carregar os dados
-    df = load_analysis()
-    df_raw, df_raw_formatado = load_raw_data()
+    # Carregar os dados: a geração mais recente do host, publicada por este
+    # ou por outro processo; mapeada e com as visões montadas uma vez por geração
+    snapshot = agendador.acompanhar()
+    if snapshot is not None:
+        resumo = snapshot.resultado
+        visoes = snapshot.visoes
+    else:
+        resumo, visoes = load_generation()
+
+    # Divisa de exibição: convertida do snapshot em memória, sem nova coleta
+    if visoes is not None:
+        visoes = visoes.na_divisa(escolher_divisa(visoes))
 
-    # Exibir o conteúdo da página
-    if df is not None:
+    # Exibir o conteúdo da página (o painel ao vivo não depende das gerações)
+    if st.session_state.pagina == "⚡ Ao Vivo":
+        mostrar_ao_vivo()
+    elif resumo is not None:
         if st.session_state.pagina == "🏠 Visão Geral":
-            mostrar_visao_geral(df)
+            mostrar_visao_geral(resumo, visoes)
         elif st.session_state.pagina == "📈 Gráficos":
-            mostrar_graficos(df_raw)
+            mostrar_graficos(visoes)
         elif st.session_state.pagina == "📑 Tabela Detalhada":
-            mostrar_tabela(df_raw, df_raw_formatado) 
+            mostrar_tabela(visoes)
         elif st.session_state.pagina == "⭐ Moedas Favoritas":
-            mostrar_favoritas(df_raw)
+            mostrar_favoritas(visoes)
     else:
         st.warning("Nenhum dado carregado. Clique em 'Atualizar Dados'.")
 
+    if PAINEL_ADMIN:
+        mostrar_painel_admin()
+
 # =============================================
 # Execução
 # =============================================
@@ -0,0 +1,358 @@
+# =============================================
+# Script: alerts.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Regras de alerta (preço, variação 24h, ranking, distância do ATH)
+#            avaliadas em lote a cada snapshot, com disparos gravados em SQLite
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import instrumentation
+
+# =============================================
+# Configurações
+# =============================================
+
+CAMINHO_BANCO = os.environ.get("CRYPTO_ALERTAS_DB", os.path.join("data", "alerts.db"))
+
+# Espera máxima por uma trava de escrita de outro processo (segundos)
+TIMEOUT_TRAVA = 5.0
+
+# Métricas calculadas por moeda a cada snapshot (linhas da matriz avaliada)
+METRICAS = ("preco", "variacao_24h", "mudanca_ranking", "distancia_ath")
+
+# tipo -> (métrica, sentido): +1 dispara com valor >= limite, -1 com valor <= limite
+TIPOS = {
+    "preco_acima": ("preco", 1),
+    "preco_abaixo": ("preco", -1),
+    "variacao_24h_acima": ("variacao_24h", 1),
+    "variacao_24h_abaixo": ("variacao_24h", -1),
+    "ranking_mudou": ("mudanca_ranking", 1),  # Posições ganhas ou perdidas desde o snapshot anterior
+    "distancia_ath": ("distancia_ath", 1),    # % abaixo do ATH
+}
+
+COLUNAS_REGRAS = ["id", "moeda", "tipo", "limite", "ativa"]
+COLUNAS_DISPAROS = ["regra_id", "instante", "moeda", "tipo", "limite", "valor"]
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS regras (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    usuario   TEXT NOT NULL DEFAULT '',
+    moeda     TEXT NOT NULL,
+    tipo      TEXT NOT NULL,
+    limite    REAL NOT NULL,
+    ativa     INTEGER NOT NULL DEFAULT 0,
+    criada_em TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS disparos (
+    regra_id INTEGER NOT NULL,
+    instante TEXT NOT NULL,
+    moeda    TEXT NOT NULL,
+    tipo     TEXT NOT NULL,
+    limite   REAL NOT NULL,
+    valor    REAL NOT NULL,
+    PRIMARY KEY (regra_id, instante)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS disparos_instante ON disparos (instante);
+"""
+
+# Bancos criados sem AUTOINCREMENT (ids reaproveitados depois de remoções):
+# recria a tabela com os mesmos ids e apaga os disparos de regras removidas
+_MIGRACAO_AUTOINCREMENT = [
+    _ESQUEMA.split(";")[0].replace("IF NOT EXISTS regras", "regras_nova"),
+    "INSERT INTO regras_nova SELECT id, usuario, moeda, tipo, limite, ativa, criada_em FROM regras",
+    "DROP TABLE regras",
+    "ALTER TABLE regras_nova RENAME TO regras",
+    "DELETE FROM disparos WHERE regra_id NOT IN (SELECT id FROM regras)",
+]
+
+# =============================================
+# Avaliacao
+# =============================================
+
+@dataclass(frozen=True)
+class Avaliacao:
+    """
+    Resultado de um snapshot: os disparos novos (COLUNAS_DISPAROS) e as
+    regras cuja condição mudou de estado (id, ativa), para persistir.
+    """
+    disparos: pd.DataFrame
+    estado: pd.DataFrame
+
+# =============================================
+# MotorAlertas
+# =============================================
+
+class MotorAlertas:
+    """
+    Avalia todas as regras de uma vez. As regras ficam em arrays ordenados
+    por (métrica, moeda), com a posição da moeda no índice do motor; a cada
+    snapshot é montada uma matriz métrica x moeda só com as moedas que têm
+    regra, e a condição de todas as regras sai de uma leitura indexada nessa
+    matriz e uma comparação vetorizada.
+
+    O disparo é por borda: a regra dispara quando a condição passa a valer
+    e só volta a disparar depois que ela deixar de valer. Moeda ausente no
+    snapshot (ou métrica NaN) mantém o estado anterior.
+    """
+
+    def __init__(self, regras=None):
+        self.ids = pd.Index([], dtype="object")
+        self._ranking = np.empty(0)
+        self.definir_regras(regras)
+
+    def definir_regras(self, regras):
+        """
+        Substitui as regras (DataFrame com id, moeda, tipo, limite e,
+        opcionalmente, ativa). O ranking anterior das moedas que continuam
+        no motor é preservado.
+        """
+        if regras is None:
+            regras = pd.DataFrame(columns=COLUNAS_REGRAS)
+        desconhecidos = set(regras["tipo"]) - TIPOS.keys()
+        if desconhecidos:
+            raise ValueError(f"Tipos de regra desconhecidos: {sorted(desconhecidos)}")
+
+        metrica = np.array([METRICAS.index(TIPOS[t][0]) for t in regras["tipo"]], dtype="int64")
+        sinal = np.array([TIPOS[t][1] for t in regras["tipo"]], dtype="float64")
+        moedas = regras["moeda"].to_numpy(dtype="object")
+
+        ids = pd.Index(pd.unique(moedas), dtype="object")
+        posicao = ids.get_indexer(moedas)
+        ordem = np.lexsort((posicao, metrica))  # Índice por métrica e, dentro dela, por moeda
+
+        anterior = pd.Series(self._ranking, index=self.ids)
+        self._ranking = anterior.reindex(ids).to_numpy(dtype="float64")
+        self.ids = ids
+
+        self._regra_id = regras["id"].to_numpy(dtype="int64")[ordem]
+        self._tipo = regras["tipo"].to_numpy(dtype="object")[ordem]
+        self._moeda = moedas[ordem]
+        self._posicao = posicao[ordem]
+        self._metrica = metrica[ordem]
+        self._sinal = sinal[ordem]
+        self._limite = regras["limite"].to_numpy(dtype="float64")[ordem]
+        ativa = regras["ativa"] if "ativa" in regras else pd.Series(False, index=regras.index)
+        self._ativa = ativa.to_numpy(dtype="bool")[ordem]
+
+    def __len__(self):
+        return len(self._regra_id)
+
+    def avaliar(self, df, instante=None):
+        """
+        Avalia as regras contra um snapshot (DataFrame da coleta).
+        """
+        instante = instante or datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with instrumentation.medir("alertas.avaliacao"):
+            matriz, presentes = self._matriz(df)
+
+            valores = matriz[self._metrica, self._posicao]
+            validos = ~np.isnan(valores)
+            with np.errstate(invalid="ignore"):
+                condicao = (valores - self._limite) * self._sinal >= 0
+
+            dispara = condicao & ~self._ativa
+            nova = np.where(validos, condicao, self._ativa)
+            mudou = nova != self._ativa
+            self._ativa = nova
+
+            # O ranking deste snapshot é a base da próxima mudança de ranking
+            rankings = matriz[len(METRICAS)]
+            self._ranking = np.where(presentes, rankings, self._ranking)
+
+        instrumentation.contar("alertas.disparos", int(dispara.sum()))
+        disparos = pd.DataFrame({
+            "regra_id": self._regra_id[dispara],
+            "instante": instante,
+            "moeda": self._moeda[dispara],
+            "tipo": self._tipo[dispara],
+            "limite": self._limite[dispara],
+            "valor": valores[dispara],
+        }, columns=COLUNAS_DISPAROS)
+        estado = pd.DataFrame({"id": self._regra_id[mudou], "ativa": nova[mudou]})
+        return Avaliacao(disparos, estado)
+
+    def _matriz(self, df):
+        """
+        Métricas (linhas de METRICAS) das moedas do motor (colunas), seguidas
+        do ranking atual, usado para a próxima mudança de ranking.
+        """
+        snapshot = df.drop_duplicates("id", keep="last")
+        linhas = pd.Index(snapshot["id"]).get_indexer(self.ids)
+        presentes = linhas >= 0
+
+        def coluna(nome):
+            # NaN no fim: moedas ausentes (posição -1) leem NaN
+            valores = snapshot[nome].to_numpy(dtype="float64", na_value=np.nan)
+            return np.append(valores, np.nan)[linhas]
+
+        preco = coluna("current_price")
+        ath = coluna("ath")
+        ranking = coluna("market_cap_rank")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            distancia_ath = (1 - preco / ath) * 100
+
+        return np.vstack([
+            preco,
+            coluna("price_change_percentage_24h"),
+            np.abs(ranking - self._ranking),
+            distancia_ath,
+            ranking,
+        ]), presentes & ~np.isnan(ranking)
+
+# =============================================
+# RepositorioAlertas
+# =============================================
+
+class RepositorioAlertas:
+    """
+    Regras e disparos em SQLite. Cada disparo é uma linha com chave
+    (regra, instante do snapshot): reavaliar o mesmo snapshot não duplica.
+    O estado "ativa" de cada regra também é gravado, para que um processo
+    reiniciado não dispare de novo o que já estava disparado.
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho, timeout=TIMEOUT_TRAVA, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.executescript(_ESQUEMA)
+        self._conexao.commit()
+        self._migrar()
+        self._lock = threading.Lock()
+
+    def adicionar_regras(self, regras, usuario=""):
+        """
+        regras: iterável de (moeda, tipo, limite). Retorna os ids criados.
+        """
+        regras = list(regras)
+        desconhecidos = {tipo for _, tipo, _ in regras} - TIPOS.keys()
+        if desconhecidos:
+            raise ValueError(f"Tipos de regra desconhecidos: {sorted(desconhecidos)}")
+        agora = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        # O id vem do AUTOINCREMENT do SQLite: único entre processos e nunca
+        # reaproveitado depois de uma remoção
+        with self._lock, self._conexao:
+            return [
+                self._conexao.execute(
+                    "INSERT INTO regras (usuario, moeda, tipo, limite, criada_em) VALUES (?, ?, ?, ?, ?)",
+                    (usuario, moeda, tipo, float(limite), agora)
+                ).lastrowid
+                for moeda, tipo, limite in regras
+            ]
+
+    def remover_regras(self, ids):
+        """
+        Apaga as regras e os disparos delas, na mesma transação.
+        """
+        ids = [(int(i),) for i in ids]
+        with self._lock, self._conexao:
+            self._conexao.executemany("DELETE FROM disparos WHERE regra_id = ?", ids)
+            self._conexao.executemany("DELETE FROM regras WHERE id = ?", ids)
+
+    def carregar_regras(self):
+        with self._lock:
+            linhas = self._conexao.execute(
+                "SELECT id, moeda, tipo, limite, ativa FROM regras ORDER BY id"
+            ).fetchall()
+        regras = pd.DataFrame(linhas, columns=COLUNAS_REGRAS)
+        regras["ativa"] = regras["ativa"].astype("bool")
+        return regras
+
+    def gravar(self, avaliacao):
+        """
+        Grava os disparos e o novo estado das regras em uma transação.
+        """
+        if avaliacao.disparos.empty and avaliacao.estado.empty:
+            return
+        disparos = avaliacao.disparos.astype({"regra_id": "int64", "limite": "float64", "valor": "float64"})
+        with self._lock, self._conexao:
+            self._conexao.executemany(
+                "INSERT OR IGNORE INTO disparos (regra_id, instante, moeda, tipo, limite, valor) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                disparos[COLUNAS_DISPAROS].itertuples(index=False, name=None)
+            )
+            self._conexao.executemany(
+                "UPDATE regras SET ativa = ? WHERE id = ?",
+                zip(avaliacao.estado["ativa"].astype(int).tolist(), avaliacao.estado["id"].tolist())
+            )
+
+    def recentes(self, limite=20):
+        """
+        Últimos disparos, do mais recente para o mais antigo.
+        """
+        with self._lock:
+            linhas = self._conexao.execute(
+                f"SELECT {', '.join(COLUNAS_DISPAROS)} FROM disparos ORDER BY instante DESC, regra_id LIMIT ?",
+                (limite,)
+            ).fetchall()
+        return pd.DataFrame(linhas, columns=COLUNAS_DISPAROS)
+
+    def versao(self):
+        """
+        Muda quando outra conexão grava no banco (novas regras, por exemplo).
+        """
+        with self._lock:
+            return self._conexao.execute("PRAGMA data_version").fetchone()[0]
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+    def _migrar(self):
+        """
+        Leva bancos antigos ao esquema atual. A verificação é refeita com a
+        trava de escrita (BEGIN IMMEDIATE): só um processo migra.
+        """
+        self._conexao.execute("BEGIN IMMEDIATE")
+        try:
+            sql = self._conexao.execute("SELECT sql FROM sqlite_master WHERE name = 'regras'").fetchone()[0]
+            if "AUTOINCREMENT" not in sql.upper():
+                for comando in _MIGRACAO_AUTOINCREMENT:
+                    self._conexao.execute(comando)
+            self._conexao.commit()
+        except BaseException:
+            self._conexao.rollback()
+            raise
+
+# =============================================
+# Execução principal (gerenciar regras)
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regras de alerta")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    adicionar = comandos.add_parser("adicionar", help="Cria uma regra")
+    adicionar.add_argument("moeda", help="id da moeda na CoinGecko (ex.: bitcoin)")
+    adicionar.add_argument("tipo", choices=sorted(TIPOS))
+    adicionar.add_argument("limite", type=float)
+    remover = comandos.add_parser("remover", help="Apaga regras pelo id")
+    remover.add_argument("ids", type=int, nargs="+")
+    comandos.add_parser("listar", help="Mostra as regras")
+    comandos.add_parser("disparos", help="Mostra os últimos disparos")
+    args = parser.parse_args()
+
+    repositorio = RepositorioAlertas()
+    if args.comando == "adicionar":
+        print(f"Regra {repositorio.adicionar_regras([(args.moeda, args.tipo, args.limite)])[0]} criada.")
+    elif args.comando == "remover":
+        repositorio.remover_regras(args.ids)
+    elif args.comando == "listar":
+        print(repositorio.carregar_regras().to_string(index=False))
+    else:
+        print(repositorio.recentes().to_string(index=False))
+    repositorio.fechar()
@@ -0,0 +1,335 @@
+# =============================================
+# Script: analytics.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Resumo tipado da análise e agregador incremental entre snapshots
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import heapq
+import itertools
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# =============================================
+# Configurações
+# =============================================
+
+TOP_K = 3  # Quantidade de moedas no ranking de maiores altas
+
+COLUNA_VARIACAO = "price_change_percentage_24h"
+
+# Acima desta fração de moedas alteradas, atualizar() recalcula tudo vetorizado
+# em vez de aplicar as mudanças uma a uma nos heaps (~6 µs por moeda)
+FRACAO_RECALCULO = 0.005
+
+# =============================================
+# ResumoAnalise
+# =============================================
+
+@dataclass(frozen=True)
+class ResumoAnalise:
+    """
+    Resultado da análise de um snapshot. `top` traz (nome, variação) das K
+    maiores altas, em ordem decrescente.
+    """
+    best_coin: Optional[str]
+    best_change: float
+    worst_coin: Optional[str]
+    worst_change: float
+    average_change: float
+    coins_up: int
+    coins_down: int
+    top: List[Tuple[str, float]] = field(default_factory=list)
+    ultima_atualizacao: str = ""
+
+    def para_registro(self):
+        """
+        Linha "larga" no formato do crypto_analysis.csv (top1_coin, top1_change, ...).
+        """
+        registro = {
+            "best_coin": self.best_coin,
+            "best_change": self.best_change,
+            "worst_coin": self.worst_coin,
+            "worst_change": self.worst_change,
+            "average_change": self.average_change,
+        }
+        for posicao, (nome, variacao) in enumerate(self.top, start=1):
+            registro[f"top{posicao}_coin"] = nome
+            registro[f"top{posicao}_change"] = variacao
+        registro["coins_up"] = self.coins_up
+        registro["coins_down"] = self.coins_down
+        registro["ultima_atualizacao"] = self.ultima_atualizacao
+        return registro
+
+    @classmethod
+    def de_registro(cls, registro):
+        """
+        Reconstrói o resumo a partir de uma linha do crypto_analysis.csv.
+        """
+        posicoes = sorted(
+            int(m.group(1)) for chave in registro
+            if (m := re.fullmatch(r"top(\d+)_coin", chave))
+        )
+        top = [
+            (registro[f"top{p}_coin"], float(registro[f"top{p}_change"]))
+            for p in posicoes if not pd.isna(registro[f"top{p}_coin"])
+        ]
+        return cls(
+            best_coin=registro["best_coin"],
+            best_change=float(registro["best_change"]),
+            worst_coin=registro["worst_coin"],
+            worst_change=float(registro["worst_change"]),
+            average_change=float(registro["average_change"]),
+            coins_up=int(registro["coins_up"]),
+            coins_down=int(registro["coins_down"]),
+            top=top,
+            ultima_atualizacao=str(registro["ultima_atualizacao"]),
+        )
+
+# =============================================
+# AgregadorIncremental
+# =============================================
+
+class AgregadorIncremental:
+    """
+    Mantém as estatísticas de variação 24h entre snapshots consecutivos
+    aplicando só as diferenças por moeda: soma, contagem, altas/baixas e dois
+    heaps (máximo e mínimo) com remoção preguiçosa para melhor/pior e top-K.
+
+    O trabalho em Python de cada atualização é proporcional às moedas que
+    mudaram; a comparação com o snapshot anterior em atualizar() é vetorizada.
+    Quando muda mais que FRACAO_RECALCULO das moedas (o caso comum numa
+    coleta completa, em que a variação 24h de quase todas muda), o estado
+    passa a ser só o vetor do snapshot e o resumo sai de argpartition/argmin;
+    dicionários e heaps são remontados apenas se vierem deltas depois.
+    """
+
+    def __init__(self, k=TOP_K):
+        self.k = k
+        self._variacoes = {}   # id -> variação (NaN quando a API não informa)
+        self._nomes = {}       # id -> nome
+        self._versao = {}      # id -> sequência da entrada válida nos heaps
+        self._heap_max = []    # (-variação, seq, id)
+        self._heap_min = []    # (variação, seq, id)
+        self._seq = itertools.count()
+        self._soma = 0.0
+        self._contagem = 0
+        self._altas = 0
+        self._baixas = 0
+
+        # Espelho vetorizado do estado (ids e valores), usado para comparar
+        # snapshots inteiros sem laço Python. None quando está desatualizado.
+        self._ids = None
+        self._valores = None
+        self._nomes_vetor = None
+        self._vetorial = False  # True: só o espelho vale; dicionários e heaps estão vazios
+
+    # -----------------------------------------
+    # Atualização
+    # -----------------------------------------
+
+    def atualizar(self, df):
+        """
+        Compara o snapshot com o estado atual e aplica só as moedas novas,
+        alteradas ou removidas.
+        """
+        ids = pd.Index(df["id"].to_numpy())
+        valores = df[COLUNA_VARIACAO].to_numpy(dtype="float64")
+        nomes = df["name"].to_numpy()
+        if not ids.is_unique:
+            unicos = ~ids.duplicated()
+            ids, valores, nomes = ids[unicos], valores[unicos], nomes[unicos]
+
+        if self._ids is not None and ids.equals(self._ids):
+            anteriores, existia, removidas = self._valores, np.ones(len(ids), dtype=bool), []
+        elif self._ids is not None:
+            posicoes = self._ids.get_indexer(ids)
+            existia = posicoes >= 0
+            anteriores = np.where(existia, self._valores[posicoes], np.nan)
+            removidas = list(self._ids.difference(ids))
+        else:
+            existia = np.fromiter((i in self._variacoes for i in ids), dtype=bool, count=len(ids))
+            anteriores = np.fromiter((self._variacoes.get(i, np.nan) for i in ids), dtype="float64", count=len(ids))
+            removidas = list(set(self._variacoes) - set(ids))
+
+        igual = (anteriores == valores) | (np.isnan(anteriores) & np.isnan(valores))
+        mudou = np.flatnonzero(~(existia & igual))
+
+        if len(mudou) + len(removidas) > FRACAO_RECALCULO * max(len(ids), 1):
+            self._recalcular(ids, valores, nomes)
+            return
+
+        self.aplicar_deltas(
+            list(ids[mudou]) + removidas,
+            list(valores[mudou]) + [None] * len(removidas),
+            dict(zip(ids[mudou], nomes[mudou]))
+        )
+        self._ids, self._valores = ids, valores.copy()
+
+    def aplicar_deltas(self, ids, variacoes, nomes=None):
+        """
+        Aplica mudanças pontuais (ex.: vindas de um stream): variação None
+        remove a moeda. `nomes` (id -> nome) é usado para moedas novas.
+        """
+        if self._vetorial:
+            self._materializar()
+
+        nomes = nomes or {}
+        posicoes = self._ids.get_indexer(ids) if self._ids is not None and len(ids) else None
+
+        for i, (id_moeda, nova) in enumerate(zip(ids, variacoes)):
+            if id_moeda in self._variacoes:
+                self._retirar(id_moeda, self._variacoes.pop(id_moeda))
+
+            if nova is None:
+                self._nomes.pop(id_moeda, None)
+                self._ids = None
+                continue
+
+            nova = float(nova)
+            self._variacoes[id_moeda] = nova
+            self._nomes[id_moeda] = nomes.get(id_moeda, self._nomes.get(id_moeda, id_moeda))
+            self._incluir(id_moeda, nova)
+
+            # Mantém o espelho vetorizado em dia (ou o descarta se surgiu moeda nova)
+            if posicoes is not None and self._ids is not None:
+                if posicoes[i] >= 0:
+                    self._valores[posicoes[i]] = nova
+                else:
+                    self._ids = None
+
+        if len(self._heap_max) > 2 * len(self._versao) + 64:
+            self._reconstruir_heaps()
+
+    # -----------------------------------------
+    # Consulta
+    # -----------------------------------------
+
+    def resumo(self, k=None):
+        k = self.k if k is None else k
+        if self._vetorial:
+            return self._resumo_vetorial(k)
+
+        top = self._topo(self._heap_max, max(k, 1))
+        pior = self._topo(self._heap_min, 1)
+
+        melhor_id = top[0] if top else None
+        pior_id = pior[0] if pior else None
+        top = top[:k]
+
+        return ResumoAnalise(
+            best_coin=self._nomes.get(melhor_id),
+            best_change=self._variacoes.get(melhor_id, math.nan),
+            worst_coin=self._nomes.get(pior_id),
+            worst_change=self._variacoes.get(pior_id, math.nan),
+            average_change=self._soma / self._contagem if self._contagem else math.nan,
+            coins_up=self._altas,
+            coins_down=self._baixas,
+            top=[(self._nomes[i], self._variacoes[i]) for i in top],
+            ultima_atualizacao=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+    # -----------------------------------------
+    # Funções Auxiliares
+    # -----------------------------------------
+
+    def _recalcular(self, ids, valores, nomes):
+        self._ids, self._valores, self._nomes_vetor = ids, valores.copy(), nomes
+        self._vetorial = True
+        self._variacoes, self._nomes, self._versao = {}, {}, {}
+        self._heap_max, self._heap_min = [], []
+
+    def _materializar(self):
+        """
+        Sai do modo vetorial: remonta dicionários, contadores e heaps a partir
+        do espelho, para voltar a aplicar mudanças pontuais.
+        """
+        ids, valores = self._ids, self._valores
+        validos = np.flatnonzero(~np.isnan(valores))
+        self._variacoes = dict(zip(ids, valores.tolist()))
+        self._nomes = dict(zip(ids, self._nomes_vetor))
+        self._versao = dict(zip(ids[validos], validos.tolist()))
+        self._seq = itertools.count(len(valores))
+        self._contagem = len(validos)
+        self._altas = int((valores[validos] > 0).sum())
+        self._baixas = int((valores[validos] < 0).sum())
+        self._reconstruir_heaps()
+        self._nomes_vetor = None
+        self._vetorial = False
+
+    def _resumo_vetorial(self, k):
+        validos = np.flatnonzero(~np.isnan(self._valores))
+        valores = self._valores[validos]
+        nomes = self._nomes_vetor
+
+        top, pior = [], None
+        if len(valores):
+            n = min(max(k, 1), len(valores))
+            candidatos = np.argpartition(-valores, n - 1)[:n]
+            # Empates na ordem do snapshot, como a sequência de inserção nos heaps
+            top = list(validos[candidatos[np.lexsort((candidatos, -valores[candidatos]))]])
+            pior = validos[np.argmin(valores)]
+
+        melhor = top[0] if top else None
+        return ResumoAnalise(
+            best_coin=None if melhor is None else nomes[melhor],
+            best_change=math.nan if melhor is None else float(self._valores[melhor]),
+            worst_coin=None if pior is None else nomes[pior],
+            worst_change=math.nan if pior is None else float(self._valores[pior]),
+            average_change=float(valores.mean()) if len(valores) else math.nan,
+            coins_up=int((valores > 0).sum()),
+            coins_down=int((valores < 0).sum()),
+            top=[(nomes[i], float(self._valores[i])) for i in top[:k]],
+            ultima_atualizacao=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+    def _incluir(self, id_moeda, variacao):
+        if math.isnan(variacao):
+            return
+        seq = next(self._seq)
+        self._versao[id_moeda] = seq
+        heapq.heappush(self._heap_max, (-variacao, seq, id_moeda))
+        heapq.heappush(self._heap_min, (variacao, seq, id_moeda))
+        self._soma += variacao
+        self._contagem += 1
+        self._altas += variacao > 0
+        self._baixas += variacao < 0
+
+    def _retirar(self, id_moeda, variacao):
+        # As entradas antigas dos heaps ficam obsoletas (versão não confere)
+        if self._versao.pop(id_moeda, None) is None:
+            return
+        self._soma -= variacao
+        self._contagem -= 1
+        self._altas -= variacao > 0
+        self._baixas -= variacao < 0
+
+    def _topo(self, heap, k):
+        """
+        Os k primeiros ids válidos do heap, descartando entradas obsoletas.
+        """
+        validos = []
+        while heap and len(validos) < k:
+            entrada = heapq.heappop(heap)
+            if self._versao.get(entrada[2]) == entrada[1]:
+                validos.append(entrada)
+        for entrada in validos:
+            heapq.heappush(heap, entrada)
+        return [entrada[2] for entrada in validos]
+
+    def _reconstruir_heaps(self):
+        variacoes = self._variacoes
+        self._heap_max = [(-variacoes[i], seq, i) for i, seq in self._versao.items()]
+        self._heap_min = [(variacoes[i], seq, i) for i, seq in self._versao.items()]
+        heapq.heapify(self._heap_max)
+        heapq.heapify(self._heap_min)
+        # Recalcula a soma do zero para não acumular erro de arredondamento
+        self._soma = math.fsum(variacoes[i] for i in self._versao)
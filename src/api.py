@@ -0,0 +1,377 @@
+# =============================================
+# Script: api.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: API HTTP assíncrona (tornado) com o snapshot, a análise e o histórico,
+#            independente do Streamlit
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import tornado.web
+from tornado.ioloop import IOLoop, PeriodicCallback
+
+import currency
+import downsampling
+import history_store
+import instrumentation
+import manifest
+import schema
+import shared_snapshot
+from analytics import ResumoAnalise
+
+# =============================================
+# Configurações
+# =============================================
+
+PORTA_PADRAO = int(os.environ.get("CRYPTO_PORTA_API", 8600))
+
+# Segundos entre as leituras do manifesto à procura de uma geração nova
+INTERVALO_VERIFICACAO = 1.0
+
+# Respostas codificadas guardadas por geração (LRU); cada uma já tem o gzip pronto
+MAX_RESPOSTAS = 64
+
+NIVEL_GZIP = 6
+TAMANHO_MINIMO_GZIP = 1024  # Corpos menores vão sem compressão
+
+# Janela do histórico quando `inicio` não é informado
+PERIODO_HISTORICO_PADRAO = pd.Timedelta(days=7)
+
+TIPO_JSON = "application/json; charset=utf-8"
+TIPO_ARROW = "application/vnd.apache.arrow.stream"
+
+# =============================================
+# RespostaPronta
+# =============================================
+
+@dataclass(frozen=True)
+class RespostaPronta:
+    """
+    Corpo já codificado (JSON ou Arrow IPC), sua versão gzip (None se o
+    corpo é pequeno) e o ETag, derivado do conteúdo.
+    """
+    corpo: bytes
+    comprimido: Optional[bytes]
+    etag: str
+    tipo: str
+
+# =============================================
+# GeracaoApi
+# =============================================
+
+class GeracaoApi:
+    """
+    Uma geração publicada carregada em memória: snapshot (mapeado do Arrow)
+    e resumo da análise; o histórico é lido dos níveis já agregados em
+    disco, só no intervalo pedido. As respostas são montadas uma vez por
+    (recurso, parâmetros, formato) e servidas da memória até a próxima
+    geração.
+    """
+
+    def __init__(self, entrada):
+        self.id = entrada["id"]
+        # O manifesto grava a hora local sem fuso; astimezone() a interpreta como local
+        self.timestamp = pd.Timestamp(datetime.fromisoformat(entrada["timestamp"]).astimezone(timezone.utc))
+        self.df = shared_snapshot.ler_snapshot(entrada)
+        self.resumo = ResumoAnalise.de_registro(pd.read_csv(entrada["caminho_analise"]).iloc[0].to_dict())
+        self._respostas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave):
+        with self._lock:
+            pronta = self._respostas.get(chave)
+            if pronta is not None:
+                self._respostas.move_to_end(chave)
+            return pronta
+
+    def montar(self, chave, dados, formato):
+        """
+        Codifica `dados()` no formato e guarda a resposta (chamado fora do
+        loop de eventos, em uma thread do executor).
+        """
+        with instrumentation.medir(f"api.montagem.{chave[0]}"):
+            corpo = _codificar(dados(), formato)
+            pronta = RespostaPronta(
+                corpo=corpo,
+                comprimido=gzip.compress(corpo, NIVEL_GZIP) if len(corpo) >= TAMANHO_MINIMO_GZIP else None,
+                etag='"' + hashlib.blake2b(corpo, digest_size=12).hexdigest() + '"',
+                tipo=TIPO_ARROW if formato == "arrow" else TIPO_JSON
+            )
+        with self._lock:
+            self._respostas[chave] = pronta
+            while len(self._respostas) > MAX_RESPOSTAS:
+                self._respostas.popitem(last=False)
+        return pronta
+
+    # Recursos -----------------------------------------------------------
+
+    def snapshot(self, moedas, divisa=schema.DIVISA_BASE):
+        df = self.df if moedas is None else self.df[self.df["id"].isin(moedas)].reset_index(drop=True)
+        if divisa != schema.DIVISA_BASE:
+            df = currency.converter(df, currency.cambio_do_snapshot(self.df)[divisa])
+        return df
+
+    def analise(self):
+        return self.resumo.para_registro()
+
+    def historico(self, moedas, inicio, fim, largura):
+        """
+        Preço das moedas no intervalo, no nível e com os pontos escolhidos
+        pela largura (history_store.ler_para_grafico). Sem `moedas`, todas
+        as do snapshot; acima do orçamento de pontos ficam as de melhor
+        ranking.
+        """
+        dados, _, _ = history_store.ler_para_grafico(self._ids(moedas), inicio, fim, largura)
+        return dados[["snapshot_ts", "id", "name", "current_price"]]
+
+    def arredondar_intervalo(self, moedas, inicio, fim, largura):
+        """
+        `inicio` e `fim` no início do balde do nível que historico() vai ler:
+        nesse nível entram os mesmos baldes (o que contém `inicio` entra
+        inteiro e o filtro de `fim` é inclusivo), e intervalos que só diferem
+        dentro de um balde dão a mesma chave de cache.
+        """
+        pontos, _ = downsampling.orcamento_series(len(self._ids(moedas)), largura)
+        balde = downsampling.NIVEIS[downsampling.escolher_nivel(inicio, fim, pontos)]
+        return inicio.floor(balde), fim.floor(balde)
+
+    def _ids(self, moedas):
+        ids = self.df["id"].tolist()
+        if moedas is not None:
+            # Na ordem do snapshot; moedas que já saíram dele vão por último
+            pedidas = set(moedas)
+            ids = [moeda for moeda in ids if moeda in pedidas] + sorted(pedidas - set(ids))
+        return ids
+
+# =============================================
+# ServicoApi
+# =============================================
+
+class ServicoApi:
+    """
+    Mantém a geração mais recente em memória. Só o manifesto é lido,
+    periodicamente; uma geração nova é carregada fora do loop de eventos e
+    trocada de uma vez. /snapshot e /analise não leem o disco; /historico lê
+    os níveis em Parquet a cada chave fora do cache, num executor.
+    """
+
+    def __init__(self):
+        self.geracao: Optional[GeracaoApi] = None
+        self.carregada_em = None
+
+    def verificar(self):
+        entrada = manifest.ultima_geracao(exigir="analise")
+        if entrada is None or (self.geracao is not None and self.geracao.id == entrada["id"]):
+            return False
+        self.geracao = GeracaoApi(entrada)
+        self.carregada_em = datetime.now(timezone.utc)
+        instrumentation.contar("api.geracoes")
+        return True
+
+    async def verificar_em_segundo_plano(self):
+        await IOLoop.current().run_in_executor(None, self.verificar)
+
+# =============================================
+# Handlers
+# =============================================
+
+class _Handler(tornado.web.RequestHandler):
+
+    def initialize(self, servico):
+        self.servico = servico
+
+    def formato(self):
+        """
+        ?formato=arrow|json tem prioridade; senão o Accept decide (JSON por padrão).
+        """
+        pedido = self.get_query_argument("formato", None)
+        if pedido is not None:
+            if pedido not in ("arrow", "json"):
+                raise tornado.web.HTTPError(400, reason="formato deve ser arrow ou json")
+            return pedido
+        return "arrow" if TIPO_ARROW in self.request.headers.get("Accept", "") else "json"
+
+    def divisa(self):
+        divisa = self.get_query_argument("divisa", schema.DIVISA_BASE).lower()
+        geracao = self.servico.geracao
+        if geracao is not None and divisa not in currency.cambio_do_snapshot(geracao.df):
+            raise tornado.web.HTTPError(400, reason=f"divisa sem câmbio nesta geração: {divisa}")
+        return divisa
+
+    def moedas(self):
+        valor = self.get_query_argument("moedas", "")
+        moedas = tuple(sorted({m.strip() for m in valor.split(",") if m.strip()}))
+        return moedas or None
+
+    async def responder(self, recurso, parametros, dados):
+        geracao = self.servico.geracao
+        if geracao is None:
+            raise tornado.web.HTTPError(503, reason="Nenhuma geração publicada")
+
+        instrumentation.contar("api.requisicoes")
+        formato = self.formato()
+        chave = (recurso, parametros, formato)
+        pronta = geracao.obter(chave)
+        if pronta is None:
+            pronta = await IOLoop.current().run_in_executor(
+                None, geracao.montar, chave, lambda: dados(geracao), formato
+            )
+
+        self.set_header("ETag", pronta.etag)
+        self.set_header("Vary", "Accept, Accept-Encoding")
+        self.set_header("Cache-Control", "no-cache")
+        self.set_header("X-Geracao", geracao.id)
+        if self.check_etag_header():
+            instrumentation.contar("api.304")
+            self.set_status(304)
+            return
+
+        self.set_header("Content-Type", pronta.tipo)
+        if pronta.comprimido is not None and "gzip" in self.request.headers.get("Accept-Encoding", ""):
+            self.set_header("Content-Encoding", "gzip")
+            self.write(pronta.comprimido)
+        else:
+            self.write(pronta.corpo)
+
+
+class SnapshotHandler(_Handler):
+    async def get(self):
+        moedas, divisa = self.moedas(), self.divisa()
+        await self.responder("snapshot", (moedas, divisa), lambda g: g.snapshot(moedas, divisa))
+
+
+class AnaliseHandler(_Handler):
+    async def get(self):
+        await self.responder("analise", None, lambda g: g.analise())
+
+
+class HistoricoHandler(_Handler):
+    async def get(self):
+        geracao = self.servico.geracao
+        # Sem `fim`, o intervalo termina na geração (não em "agora"), para a
+        # mesma URL dar a mesma resposta, e o mesmo ETag, até a próxima geração
+        fim = self._instante("fim", geracao.timestamp if geracao else pd.Timestamp.now(tz="UTC"))
+        inicio = self._instante("inicio", fim - PERIODO_HISTORICO_PADRAO)
+        try:
+            largura = int(self.get_query_argument("largura", downsampling.LARGURA_PADRAO_PX))
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="largura deve ser um inteiro")
+        if largura <= 0 or inicio > fim:
+            raise tornado.web.HTTPError(400, reason="intervalo ou largura inválidos")
+
+        moedas = self.moedas()
+        if geracao is not None:
+            inicio, fim = geracao.arredondar_intervalo(moedas, inicio, fim, largura)
+        await self.responder(
+            "historico",
+            (moedas, inicio.isoformat(), fim.isoformat(), largura),
+            lambda g: g.historico(moedas, inicio, fim, largura)
+        )
+
+    def _instante(self, nome, padrao):
+        valor = self.get_query_argument(nome, None)
+        if valor is None:
+            return padrao
+        try:
+            instante = pd.Timestamp(valor)
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason=f"{nome} deve ser uma data ISO 8601")
+        return instante.tz_localize("UTC") if instante.tzinfo is None else instante.tz_convert("UTC")
+
+
+class SaudeHandler(_Handler):
+    def get(self):
+        geracao = self.servico.geracao
+        self.set_header("Cache-Control", "no-store")
+        self.write({
+            "geracao": geracao.id if geracao else None,
+            "timestamp": geracao.timestamp.isoformat() if geracao else None,
+            "moedas": len(geracao.df) if geracao else 0,
+            "cambio": currency.cambio_do_snapshot(geracao.df) if geracao else None,
+            "carregada_em": self.servico.carregada_em.isoformat() if self.servico.carregada_em else None,
+        })
+
+# =============================================
+# Funções
+# =============================================
+
+def criar_aplicacao(servico):
+    rotas = [
+        (r"/api/v1/snapshot", SnapshotHandler),
+        (r"/api/v1/analise", AnaliseHandler),
+        (r"/api/v1/historico", HistoricoHandler),
+        (r"/api/v1/saude", SaudeHandler),
+    ]
+    return tornado.web.Application([(rota, handler, {"servico": servico}) for rota, handler in rotas])
+
+
+async def servir(porta=PORTA_PADRAO, host="127.0.0.1", intervalo=INTERVALO_VERIFICACAO, pronto=None):
+    """
+    Carrega a geração atual, escuta em host:porta e verifica o manifesto a
+    cada `intervalo` segundos. `pronto` (threading.Event) é sinalizado
+    quando o servidor já aceita conexões.
+    """
+    servico = ServicoApi()
+    servico.verificar()
+    servidor = criar_aplicacao(servico).listen(porta, address=host, xheaders=True)
+    PeriodicCallback(servico.verificar_em_segundo_plano, intervalo * 1000).start()
+    if pronto is not None:
+        pronto.set()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        servidor.stop()
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _codificar(dados, formato):
+    if isinstance(dados, dict):
+        if formato == "arrow":
+            dados = pd.DataFrame([dados])
+        else:
+            return json.dumps(dados, ensure_ascii=False, default=str).encode("utf-8")
+
+    if formato == "arrow":
+        tabela = pa.Table.from_pandas(dados, preserve_index=False)
+        saida = pa.BufferOutputStream()
+        with pa.ipc.new_stream(saida, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+        return saida.getvalue().to_pybytes()
+    return dados.to_json(orient="records", date_format="iso", date_unit="s", force_ascii=False).encode("utf-8")
+
+# =============================================
+# Execução principal
+# =============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API HTTP do CryptoPrice-Dashboard")
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--atualizar", action="store_true",
+                        help="Roda também o agendador de atualização neste processo")
+    args = parser.parse_args()
+
+    if args.atualizar:
+        from scheduler import AgendadorAtualizacao, INTERVALO_PADRAO
+        agendador = AgendadorAtualizacao(float(os.environ.get("CRYPTO_INTERVALO_ATUALIZACAO", INTERVALO_PADRAO)))
+        agendador.iniciar()
+
+    print(f"API em http://{args.host}:{args.porta}/api/v1/")
+    asyncio.run(servir(args.porta, args.host))
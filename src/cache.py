@@ -0,0 +1,106 @@
+# =============================================
+# Script: cache.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Cache compartilhado pelo processo para os carregadores do dashboard
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import os
+import threading
+from collections import defaultdict
+
+# =============================================
+# Configurações
+# =============================================
+
+# CRYPTO_CACHE=0 desliga o cache (útil para comparar nos benchmarks)
+HABILITADO = os.environ.get("CRYPTO_CACHE", "1") != "0"
+
+# =============================================
+# Estado do cache
+# =============================================
+
+# nome -> (identidade, valor). Guarda só a versão mais recente de cada carregador.
+_entradas = {}
+_lock = threading.Lock()  # Protege só os dicionários; nunca fica preso durante uma carga
+_travas_carga = defaultdict(threading.Lock)  # nome -> trava de quem está carregando aquele nome
+_acertos = defaultdict(int)
+_falhas = defaultdict(int)
+_AUSENTE = object()
+
+# =============================================
+# Funções
+# =============================================
+
+def identidade_arquivo(caminho):
+    """
+    Identidade de um arquivo para invalidação: (caminho, mtime em ns, tamanho).
+    Retorna None se o arquivo não existir.
+    """
+    try:
+        info = os.stat(caminho)
+    except FileNotFoundError:
+        return None
+    return (os.path.abspath(caminho), info.st_mtime_ns, info.st_size)
+
+
+def carregar_com_cache(nome, identidade, carregar):
+    """
+    Retorna o valor guardado para `nome` se a identidade não mudou; senão
+    executa `carregar()` e guarda o resultado. O valor é o mesmo objeto para
+    todas as sessões, então quem usar deve tratá-lo como somente leitura.
+    """
+    if not HABILITADO or identidade is None:
+        return carregar()
+
+    valor = _consultar(nome, identidade)
+    if valor is not _AUSENTE:
+        return valor
+
+    with _lock:
+        trava = _travas_carga[nome]
+
+    # Uma carga por nome: sessões simultâneas esperam a mesma leitura, mas
+    # acertos e cargas de outros nomes não esperam por ela
+    with trava:
+        valor = _consultar(nome, identidade)
+        if valor is not _AUSENTE:
+            return valor
+
+        valor = carregar()
+        with _lock:
+            _falhas[nome] += 1
+            _entradas[nome] = (identidade, valor)
+        return valor
+
+
+def estatisticas():
+    """
+    Contadores de acertos e falhas por carregador.
+    """
+    with _lock:
+        return {
+            nome: {"acertos": _acertos[nome], "falhas": _falhas[nome]}
+            for nome in sorted(set(_acertos) | set(_falhas))
+        }
+
+
+def limpar():
+    with _lock:
+        _entradas.clear()
+        _acertos.clear()
+        _falhas.clear()
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _consultar(nome, identidade):
+    with _lock:
+        entrada = _entradas.get(nome)
+        if entrada is not None and entrada[0] == identidade:
+            _acertos[nome] += 1
+            return entrada[1]
+    return _AUSENTE
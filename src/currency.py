@@ -0,0 +1,57 @@
+# =============================================
+# Script: currency.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Tabela de câmbio da geração e conversão vetorizada das colunas monetárias
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import numpy as np
+
+import schema
+
+# =============================================
+# Configurações
+# =============================================
+
+DIVISAS = tuple(schema.SIMBOLOS_DIVISA)
+
+# Colunas multiplicadas pelo fator de câmbio (preços, valor de mercado, volume, ATH/ATL)
+COLUNAS_MONETARIAS = schema.colunas_com_formato("moeda")
+
+# =============================================
+# Funções
+# =============================================
+
+def fatores_de_cambio(taxas, divisas=DIVISAS):
+    """
+    Converte as taxas de /exchange_rates (quanto vale 1 BTC em cada divisa)
+    em fatores a partir da divisa base: {divisa: valor de 1 US$ nela}.
+    Divisas ausentes na resposta ficam de fora.
+    """
+    base = float(taxas[schema.DIVISA_BASE]["value"])
+    return {
+        divisa: float(taxas[divisa]["value"]) / base
+        for divisa in divisas if divisa in taxas
+    }
+
+
+def cambio_do_snapshot(df):
+    """
+    Fatores da geração do snapshot (df.attrs["cambio"], preenchido por
+    shared_snapshot.ler_snapshot). Sem tabela, só a divisa base.
+    """
+    return df.attrs.get("cambio") or {schema.DIVISA_BASE: 1.0}
+
+
+def converter(df, fator):
+    """
+    Cópia rasa de df com as colunas monetárias multiplicadas por `fator`;
+    as demais colunas são as mesmas do original.
+    """
+    convertido = df.copy(deep=False)
+    for coluna in COLUNAS_MONETARIAS:
+        if coluna in convertido:
+            convertido[coluna] = convertido[coluna].to_numpy(dtype="float64", na_value=np.nan) * fator
+    return convertido
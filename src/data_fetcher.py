@@ -1,17 +1,24 @@
 # =============================================
 # Script: data_fetcher.py
 # Projeto: CryptoPrice-Dashboard
-# Descrição: Coleta dados detalhados das 10 principais criptomoedas e salva em CSV
+# Descrição: Coleta dados detalhados das principais criptomoedas (top N) e salva em CSV
 # Autor: Nathan Thomaz
 # Data de Criação: 27/04/2025
 # Versão: 1.0
 # =============================================
 
-import requests
 import pandas as pd
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
 import os
-import glob
+
+import currency
+import history_store
+import instrumentation
+import json_stream
+import manifest
+import schema
+from http_client import obter_cliente
 
 # =============================================
 # Configurações
@@ -19,79 +26,161 @@ import glob
 
 MAX_ARQUIVOS_RAW = 5  # Número máximo de arquivos para manter
 
+TAMANHO_UNIVERSO = int(os.environ.get("CRYPTO_TOP_N", 10))  # Quantas moedas coletar
+MOEDAS_POR_PAGINA = 250       # Máximo aceito pela API em /coins/markets
+MAX_PAGINAS_SIMULTANEAS = 4   # Páginas baixadas em paralelo
+
+# Campos lidos de cada moeda em /coins/markets (o resto da resposta é descartado na leitura)
+CAMPOS_COLETADOS = schema.CAMPOS
+
+# URL base da API (pode ser trocada por um servidor local nos benchmarks)
+API_URL = os.environ.get("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+
 # =============================================
-# Funções
+# Exceções
 # =============================================
 
+class ColetaParcialError(RuntimeError):
+    """
+    Uma ou mais páginas de /coins/markets falharam mesmo após as novas tentativas.
+    """
+
+    def __init__(self, paginas_com_falha, erros):
+        self.paginas_com_falha = paginas_com_falha
+        self.erros = erros
+        super().__init__(f"Falha ao coletar as páginas {paginas_com_falha}: {erros[0]}")
+
 # =============================================
 # fetch_crypto_data
 # =============================================
-def fetch_crypto_data():
+def fetch_crypto_data(top_n=TAMANHO_UNIVERSO, permitir_parcial=False, publicar=True):
     """
-    Busca dados de criptomoedas, salva e mantém apenas os 5 arquivos mais recentes.
+    Busca dados de criptomoedas, anexa ao histórico em Parquet e publica o
+    snapshot como uma nova geração (mantendo apenas as 5 mais recentes).
+    Com publicar=False, quem chama publica a geração depois, junto com a
+    análise (ver pipeline.py).
+    Retorna o DataFrame coletado para quem chamar a função em processo.
     """
+    df = buscar_moedas(top_n, permitir_parcial=permitir_parcial)
+    cambio = obter_cotacoes() if publicar else None
 
-    # Define URL e parâmetros da API
-    url = "https://api.coingecko.com/api/v3/coins/markets"
+    # Anexa ao histórico (o CSV da geração fica só como "último snapshot" legível)
+    history_store.anexar_snapshot(df)
+    history_store.manter_historico()
+
+    if publicar:
+        manifest.publicar_geracao(df, cambio=cambio)
+
+        # Agora limpa os CSVs antigos (o histórico completo fica em data/history)
+        manter_apenas_ultimos_arquivos()
+
+    return df
+
+# =============================================
+# buscar_moedas
+# =============================================
+@instrumentation.cronometrar("coleta.moedas")
+def buscar_moedas(top_n=TAMANHO_UNIVERSO, max_paralelo=MAX_PAGINAS_SIMULTANEAS, permitir_parcial=False,
+                  campos=CAMPOS_COLETADOS):
+    """
+    Busca as top_n moedas por valor de mercado, baixando as páginas de
+    /coins/markets em paralelo (todas passam pelo mesmo limitador de taxa).
+    Cada resposta é lida em blocos direto para colunas tipadas (ver
+    json_stream.py), sem montar a lista de dicts da página.
+
+    Falhas parciais: por padrão o snapshot é tudo ou nada e uma página com
+    falha levanta ColetaParcialError. Com permitir_parcial=True, as páginas
+    que deram certo são devolvidas e as que falharam ficam em
+    df.attrs["paginas_com_falha"]; se nenhuma página der certo, o erro é levantado.
+    """
+    por_pagina = min(top_n, MOEDAS_POR_PAGINA)
+    paginas = list(range(1, math.ceil(top_n / por_pagina) + 1))
+    cliente = obter_cliente(API_URL)
+
+    lidas, paginas_com_falha, erros = {}, [], []
+    with ThreadPoolExecutor(max_workers=min(len(paginas), max_paralelo)) as executor:
+        futuros = {
+            executor.submit(_buscar_pagina, cliente, pagina, por_pagina, campos): pagina
+            for pagina in paginas
+        }
+        for futuro in as_completed(futuros):
+            try:
+                lidas[futuros[futuro]] = futuro.result()
+            except Exception as e:
+                paginas_com_falha.append(futuros[futuro])
+                erros.append(e)
+
+    if paginas_com_falha and (not permitir_parcial or not lidas):
+        raise ColetaParcialError(sorted(paginas_com_falha), erros)
+
+    # Junta as páginas (na ordem) em um único snapshot ordenado pelo ranking
+    df = schema.aplicar_tipos(json_stream.para_dataframe([lidas[p] for p in sorted(lidas)], campos))
+    if not df["market_cap_rank"].is_monotonic_increasing:
+        df = df.sort_values("market_cap_rank", na_position="last", kind="stable")
+    if len(df) > top_n or not isinstance(df.index, pd.RangeIndex) or not df.index.is_monotonic_increasing:
+        df = df.head(top_n).reset_index(drop=True)
+    df.attrs["paginas_com_falha"] = sorted(paginas_com_falha)
+
+    return df
+
+@instrumentation.cronometrar("coleta.pagina")
+def _buscar_pagina(cliente, pagina, por_pagina, campos=CAMPOS_COLETADOS):
+    # Define parâmetros da API
     params = {
-        "vs_currency": "usd",
+        "vs_currency": schema.DIVISA_BASE,  # Outras divisas são derivadas pelo câmbio
         "order": "market_cap_desc",
-        "per_page": 10,
-        "page": 1,
+        "per_page": por_pagina,
+        "page": pagina,
         "sparkline": False
     }
 
-    # Faz a requisição
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
-
-    # Organiza os dados
-    coins = []
-    for coin in data:
-        coins.append({
-            "id": coin.get("id"),
-            "symbol": coin.get("symbol"),
-            "name": coin.get("name"),
-            "current_price": coin.get("current_price"),
-            "price_change_percentage_24h": coin.get("price_change_percentage_24h"),
-            "market_cap": coin.get("market_cap"),
-            "market_cap_rank": coin.get("market_cap_rank"),
-            "total_volume": coin.get("total_volume"),
-            "circulating_supply": coin.get("circulating_supply"),
-            "ath": coin.get("ath"),
-            "atl": coin.get("atl"),
-            "last_updated": coin.get("last_updated")
-        })
-
-    # Salva os dados
-    df = pd.DataFrame(coins)
-
-    today = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = os.path.join("data", "raw", f"crypto_data_{today}.csv")
-
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
-    df.to_csv(filename, index=False)
-
-    # Agora limpa os antigos
-    manter_apenas_ultimos_arquivos()
+    # Faz a requisição (sessão compartilhada, com timeout, limite de taxa e novas tentativas)
+    # e lê a resposta em blocos direto para as colunas
+    return cliente.get_stream(
+        "/coins/markets",
+        params,
+        lambda blocos: json_stream.ler_colunas(blocos, campos, capacidade=por_pagina),
+        tipo=("colunas", tuple(campos)),
+    )
+
+# =============================================
+# buscar_cotacoes
+# =============================================
+@instrumentation.cronometrar("coleta.cambio")
+def buscar_cotacoes():
+    """
+    Tabela de câmbio da coleta: {divisa: valor de 1 US$ nela}, para as
+    divisas de currency.DIVISAS. Uma chamada a /exchange_rates por ciclo,
+    em vez de repetir /coins/markets para cada vs_currency.
+    """
+    resposta = obter_cliente(API_URL).get_json("/exchange_rates")
+    return currency.fatores_de_cambio(resposta["rates"])
+
+
+_ultimas_cotacoes = None  # Reaproveitada se /exchange_rates falhar
+
+def obter_cotacoes():
+    """
+    Tabela de câmbio do ciclo. Uma falha só em /exchange_rates não perde o
+    snapshot: a geração sai com a última tabela obtida (ou só em USD).
+    """
+    global _ultimas_cotacoes
+
+    try:
+        _ultimas_cotacoes = buscar_cotacoes()
+    except Exception:
+        instrumentation.contar("coleta.cambio.falhas")
+    return _ultimas_cotacoes
 
 # =============================================
 # manter_apenas_ultimos_arquivos
 # =============================================
 def manter_apenas_ultimos_arquivos():
     """
-    Mantém apenas os 5 arquivos mais recentes na pasta data/raw.
+    Mantém apenas as 5 gerações mais recentes (CSV bruto, análise e
+    indicadores); a ordem vem do manifesto, não do ctime dos arquivos.
     """
-    arquivos = sorted(
-        glob.glob(os.path.join("data", "raw", "*.csv")),
-        key=os.path.getctime,
-        reverse=True
-    )
-
-    # Se tiver mais que 5 arquivos, apaga os mais antigos
-    for arquivo in arquivos[MAX_ARQUIVOS_RAW:]:
-        os.remove(arquivo)
+    return manifest.podar(MAX_ARQUIVOS_RAW)
 
 # =============================================
 # Execução principal
@@ -0,0 +1,296 @@
+# =============================================
+# Script: downsampling.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Níveis de resolução (1m/1h/1d) e redução de pontos (LTTB, mín/máx) para gráficos
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import numpy as np
+import pandas as pd
+
+# =============================================
+# Configurações
+# =============================================
+
+# Resoluções pré-agregadas, da mais fina para a mais grossa
+NIVEIS = {
+    "1m": pd.Timedelta(minutes=1),
+    "1h": pd.Timedelta(hours=1),
+    "1d": pd.Timedelta(days=1),
+}
+
+# Pontos por série quando a largura do gráfico não é informada
+LARGURA_PADRAO_PX = 800
+
+# Pontos somados de todas as séries de um gráfico, e o mínimo por série: com
+# muitas moedas o orçamento é dividido entre elas e, abaixo do mínimo, só as
+# primeiras (MAX_PONTOS_GRAFICO // MIN_PONTOS_SERIE) são desenhadas
+MAX_PONTOS_GRAFICO = 20_000
+MIN_PONTOS_SERIE = 200
+
+# =============================================
+# Níveis de resolução
+# =============================================
+
+def agregar_nivel(historico, nivel, coluna="current_price"):
+    """
+    Agrega o histórico (snapshot_ts, id, name, coluna) em baldes do nível:
+    último valor (fechamento), mínimo e máximo de cada moeda por balde, e o
+    instante do fechamento (ultimo_ts).
+
+    Também aceita baldes já agregados (com minimo, maximo e ultimo_ts), então
+    um balde aberto pode ser combinado com os snapshots que chegam depois
+    (ver history_store.anexar_snapshot).
+    """
+    if historico.empty:
+        return pd.DataFrame(columns=["id", "snapshot_ts", "name", coluna, "minimo", "maximo", "ultimo_ts"])
+
+    if "ultimo_ts" not in historico:
+        historico = historico.assign(
+            ultimo_ts=historico["snapshot_ts"], minimo=historico[coluna], maximo=historico[coluna]
+        )
+    if not historico["ultimo_ts"].is_monotonic_increasing:
+        historico = historico.sort_values("ultimo_ts", kind="stable")
+
+    balde = historico["snapshot_ts"].dt.floor(NIVEIS[nivel])
+    agrupado = historico.groupby(["id", balde], sort=True)
+    agregado = agrupado.agg(
+        name=("name", "last"),
+        ultimo=(coluna, "last"),
+        minimo=("minimo", "min"),
+        maximo=("maximo", "max"),
+        ultimo_ts=("ultimo_ts", "max"),
+    ).rename(columns={"ultimo": coluna})
+    return agregado.reset_index()
+
+
+def somar_ao_balde(balde, snapshot, nivel, coluna="current_price"):
+    """
+    Combina um balde já agregado (uma linha por moeda, como os de
+    agregar_nivel) com um snapshot que cai no mesmo balde, alinhando pelos
+    ids em vez de reagrupar. Mesmo resultado de agregar_nivel sobre os dois
+    juntos, sem groupby por texto (é o caminho de cada anexação).
+    """
+    colunas = ["id", "snapshot_ts", "name", coluna, "minimo", "maximo", "ultimo_ts"]
+    if snapshot["id"].is_unique:
+        novo = snapshot.set_index("id")[[coluna, "name"]].assign(
+            snapshot_ts=snapshot["snapshot_ts"].dt.floor(NIVEIS[nivel]).array,
+            minimo=snapshot[coluna].to_numpy(),
+            maximo=snapshot[coluna].to_numpy(),
+            ultimo_ts=snapshot["snapshot_ts"].array,
+        )
+    else:
+        novo = agregar_nivel(snapshot, nivel, coluna).set_index("id")
+    if balde.empty:
+        return novo.reset_index()[colunas]
+    atual = balde.set_index("id")
+    ids = atual.index.union(novo.index)
+    atual, novo = atual.reindex(ids), novo.reindex(ids)
+
+    # O snapshot vale onde é mais recente que o balde (ou a moeda é nova);
+    # o fechamento é o último valor não nulo, como o "last" do groupby
+    linha_nova = novo["ultimo_ts"].notna() & (atual["ultimo_ts"].isna() | (novo["ultimo_ts"] >= atual["ultimo_ts"]))
+    valor_novo = novo[coluna].notna() & (atual[coluna].isna() | linha_nova)
+
+    combinado = pd.DataFrame({
+        "snapshot_ts": atual["snapshot_ts"].fillna(novo["snapshot_ts"]),
+        "name": atual["name"].mask(linha_nova & novo["name"].notna(), novo["name"]),
+        coluna: atual[coluna].mask(valor_novo, novo[coluna]),
+        "minimo": np.fmin(atual["minimo"], novo["minimo"]),
+        "maximo": np.fmax(atual["maximo"], novo["maximo"]),
+        "ultimo_ts": atual["ultimo_ts"].mask(linha_nova, novo["ultimo_ts"]),
+    })
+    return combinado.rename_axis("id").reset_index()[colunas]
+
+
+def agregar_niveis(historico, coluna="current_price"):
+    """
+    Todos os níveis de uma vez: {nível: DataFrame agregado}.
+    """
+    return {nivel: agregar_nivel(historico, nivel, coluna) for nivel in NIVEIS}
+
+
+def escolher_nivel(inicio, fim, largura_px=LARGURA_PADRAO_PX):
+    """
+    O nível mais grosso que ainda tem ao menos um ponto por pixel (ou por
+    ponto do orçamento da série) no intervalo visível; a redução até a
+    largura do gráfico é feita depois.
+    """
+    resolucao_pixel = (pd.Timestamp(fim) - pd.Timestamp(inicio)) / max(largura_px, 1)
+    escolhido = next(iter(NIVEIS))
+    for nivel, resolucao in NIVEIS.items():
+        if resolucao <= resolucao_pixel:
+            escolhido = nivel
+    return escolhido
+
+
+def orcamento_series(series, largura_px=LARGURA_PADRAO_PX, max_pontos=MAX_PONTOS_GRAFICO,
+                     min_pontos=MIN_PONTOS_SERIE):
+    """
+    Divide o orçamento de pontos do gráfico entre `series` séries.
+    Retorna (pontos por série, quantas séries desenhar): cada série fica com
+    até largura_px pontos e o total não passa de max_pontos.
+    """
+    exibidas = min(series, max(max_pontos // min_pontos, 1))
+    pontos = min(largura_px, max(max_pontos // max(exibidas, 1), min_pontos))
+    return pontos, exibidas
+
+# =============================================
+# Redução de pontos
+# =============================================
+
+def lttb(x, y, limite):
+    """
+    Largest-Triangle-Three-Buckets: escolhe `limite` índices de (x, y)
+    preservando a forma visual da série. x deve estar em ordem crescente.
+    Retorna os índices escolhidos.
+    """
+    return _lttb_agrupado(np.asarray(x, dtype="float64"), np.asarray(y, dtype="float64"),
+                          np.array([0, len(x)]), limite)
+
+
+def min_max(x, y, largura_px):
+    """
+    Divide o eixo x em `largura_px` colunas de pixel e mantém, em cada uma,
+    o ponto de mínimo e o de máximo (no máximo 2 pontos por pixel). Picos
+    e vales nunca somem. Retorna os índices escolhidos, em ordem.
+    """
+    return _min_max_agrupado(np.asarray(x, dtype="float64"), np.asarray(y, dtype="float64"),
+                             np.array([0, len(x)]), largura_px)
+
+
+def reduzir_series(df, x, y, largura_px=LARGURA_PADRAO_PX, metodo="lttb", por="id", ordenado=False):
+    """
+    Reduz cada série (agrupada por `por`) para caber na largura do gráfico
+    antes de ir para o Altair. `metodo` é "lttb" ou "minmax". Todas as
+    séries são reduzidas juntas, sem laço Python por série. Com
+    ordenado=True, df já vem ordenado por (por, x) e não é reordenado.
+    """
+    if df.empty:
+        return df
+
+    df = df.dropna(subset=[y])
+    if not ordenado:
+        df = df.sort_values([por, x], kind="stable")
+    if pd.api.types.is_datetime64_any_dtype(df[x]):
+        eixo_x = df[x].to_numpy(dtype="datetime64[ns]").astype(np.int64).astype("float64")
+    else:
+        eixo_x = df[x].to_numpy(dtype="float64")
+    valores = df[y].to_numpy(dtype="float64")
+
+    grupos = df[por].to_numpy()
+    cortes = np.flatnonzero(np.r_[True, grupos[1:] != grupos[:-1], True])
+
+    reduzir = _min_max_agrupado if metodo == "minmax" else _lttb_agrupado
+    return df.iloc[reduzir(eixo_x, valores, cortes, largura_px)]
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _lttb_agrupado(x, y, cortes, limite):
+    """
+    LTTB de várias séries concatenadas (a série g ocupa cortes[g]:cortes[g+1]).
+    A escolha de cada balde depende do ponto escolhido no anterior, então o
+    laço é sobre os baldes (até `limite`), vetorizado sobre as séries.
+    Retorna os índices escolhidos, em ordem.
+    """
+    inicios, tamanhos = cortes[:-1], np.diff(cortes)
+    reduzir = tamanhos > limite if limite >= 3 else np.zeros(len(tamanhos), dtype=bool)
+    intactos = _intervalos(inicios[~reduzir], tamanhos[~reduzir])
+    if not reduzir.any():
+        return intactos
+
+    g0, n = inicios[reduzir], tamanhos[reduzir]
+    ultimo = g0 + n - 1
+
+    # Baldes internos de cada série (o primeiro e o último ponto são sempre
+    # mantidos): as mesmas divisas de np.linspace(1, n - 1, limite - 1)
+    passo = (n - 2) / (limite - 2)
+    limites = np.floor(1 + np.arange(limite - 1) * passo[:, None]).astype(np.int64)
+    limites[:, -1] = n - 1
+    limites += g0[:, None]
+    baldes_ini, baldes_fim = limites[:, :-1], limites[:, 1:]
+    contagem = baldes_fim - baldes_ini
+
+    # Média de cada balde (terceiro vértice do triângulo do balde anterior);
+    # o fim do último balde entra como corte para as somas não invadirem a
+    # série seguinte
+    cortes_soma = limites.ravel()
+    soma_x = np.add.reduceat(x, cortes_soma).reshape(limites.shape)[:, :-1]
+    soma_y = np.add.reduceat(y, cortes_soma).reshape(limites.shape)[:, :-1]
+    media_x = np.column_stack([soma_x[:, 1:] / contagem[:, 1:], x[ultimo]])
+    media_y = np.column_stack([soma_y[:, 1:] / contagem[:, 1:], y[ultimo]])
+
+    escolhidos = np.empty((len(g0), limite), dtype=np.int64)
+    escolhidos[:, 0], escolhidos[:, -1] = g0, ultimo
+    a = g0
+    for i in range(limite - 2):
+        tamanho = contagem[:, i]
+        pontos = _intervalos(baldes_ini[:, i], tamanho)
+        xa, ya = np.repeat(x[a], tamanho), np.repeat(y[a], tamanho)
+        area = np.abs(
+            (xa - np.repeat(media_x[:, i], tamanho)) * (y[pontos] - ya)
+            - (xa - x[pontos]) * (np.repeat(media_y[:, i], tamanho) - ya)
+        )
+        a = pontos[_primeiro_maximo(area, tamanho)]
+        escolhidos[:, i + 1] = a
+
+    return np.sort(np.concatenate([intactos, escolhidos.ravel()]))
+
+
+def _min_max_agrupado(x, y, cortes, largura_px):
+    """
+    min_max de várias séries concatenadas de uma vez: cada ponto recebe a
+    chave (série, coluna de pixel) e mínimos e máximos saem de um reduceat.
+    """
+    inicios, tamanhos = cortes[:-1], np.diff(cortes)
+    reduzir = tamanhos > 2 * largura_px
+    intactos = _intervalos(inicios[~reduzir], tamanhos[~reduzir])
+    if not reduzir.any():
+        return intactos
+
+    pontos = _intervalos(inicios[reduzir], tamanhos[reduzir])
+    serie = np.repeat(np.arange(reduzir.sum()), tamanhos[reduzir])
+    x0 = x[inicios[reduzir]]
+    amplitude = x[inicios[reduzir] + tamanhos[reduzir] - 1] - x0
+    amplitude[amplitude == 0] = 1.0
+    xs, ys = x[pontos], y[pontos]
+
+    coluna = np.minimum(((xs - x0[serie]) / amplitude[serie] * largura_px).astype(np.int64), largura_px - 1)
+    chave = serie * largura_px + coluna
+    baldes = np.flatnonzero(np.r_[True, chave[1:] != chave[:-1]])
+    tamanhos_balde = np.diff(np.r_[baldes, len(chave)])
+
+    indices = np.concatenate([
+        _primeiro_igual(ys, np.minimum.reduceat(ys, baldes), tamanhos_balde),
+        _primeiro_igual(ys, np.maximum.reduceat(ys, baldes), tamanhos_balde),
+    ])
+    return np.sort(np.concatenate([intactos, np.unique(pontos[indices])]))
+
+
+def _intervalos(inicios, tamanhos):
+    """
+    Concatenação de arange(inicio, inicio + tamanho) para cada par.
+    """
+    total = int(tamanhos.sum())
+    deslocamento = np.repeat(inicios - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+    return np.arange(total, dtype=np.int64) + deslocamento
+
+
+def _primeiro_maximo(valores, tamanhos):
+    """
+    Posição (em `valores`) do primeiro máximo de cada segmento consecutivo.
+    """
+    return _primeiro_igual(valores, np.maximum.reduceat(valores, np.cumsum(tamanhos) - tamanhos), tamanhos)
+
+
+def _primeiro_igual(valores, extremos, tamanhos):
+    """
+    Posição do primeiro valor igual ao extremo do seu segmento, por segmento.
+    """
+    segmento = np.repeat(np.arange(len(tamanhos)), tamanhos)
+    iguais = np.flatnonzero(valores == np.repeat(extremos, tamanhos))
+    return iguais[np.r_[True, segmento[iguais][1:] != segmento[iguais][:-1]]]
@@ -0,0 +1,110 @@
+# =============================================
+# Script: exports.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Geração dos arquivos de exportação da tabela (CSV, Excel, Parquet, Arrow)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter  # type: ignore
+
+# =============================================
+# Configurações
+# =============================================
+
+NOME_PLANILHA = "Criptomoedas"
+FORMATO_DATA_EXCEL = "yyyy-mm-dd hh:mm:ss"
+LINHAS_POR_LOTE = 4096  # Linhas convertidas por vez na escrita do Excel
+
+# =============================================
+# Funções
+# =============================================
+
+def exportar_csv(df):
+    """
+    CSV com BOM (abre com acentos corretos no Excel), sem o índice.
+    """
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding="utf-8-sig")
+    return buffer.getvalue()
+
+
+def exportar_excel(df):
+    """
+    Planilha gravada linha a linha pelo xlsxwriter em modo constant_memory:
+    cada linha vai para o arquivo temporário assim que é escrita, então a
+    memória não cresce com a tabela (o ExcelWriter do pandas monta todas as
+    células antes e escreve coluna a coluna). Datas com fuso vão em UTC,
+    já que o Excel não guarda fuso.
+    """
+    buffer = io.BytesIO()
+    livro = xlsxwriter.Workbook(buffer, {
+        "constant_memory": True,
+        "default_date_format": FORMATO_DATA_EXCEL,
+    })
+    planilha = livro.add_worksheet(NOME_PLANILHA)
+    negrito = livro.add_format({"bold": True, "border": 1, "align": "center"})
+    planilha.write_row(0, 0, [str(coluna) for coluna in df.columns], negrito)
+
+    for inicio in range(0, len(df), LINHAS_POR_LOTE):
+        lote = df.iloc[inicio:inicio + LINHAS_POR_LOTE]
+        colunas = [_valores_excel(lote[coluna]) for coluna in lote.columns]
+        for deslocamento, linha in enumerate(zip(*colunas), start=inicio + 1):
+            planilha.write_row(deslocamento, 0, linha)
+
+    livro.close()
+    return buffer.getvalue()
+
+
+def exportar_parquet(df):
+    buffer = io.BytesIO()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    return buffer.getvalue()
+
+
+def exportar_arrow(df):
+    """
+    Arrow IPC (formato de arquivo), o mesmo usado pelos snapshots mapeados.
+    """
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    buffer = io.BytesIO()
+    with pa.ipc.new_file(buffer, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return buffer.getvalue()
+
+
+# rótulo -> (função, extensão, tipo MIME)
+FORMATOS = {
+    "CSV": (exportar_csv, "csv", "text/csv"),
+    "Excel (.xlsx)": (exportar_excel, "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": (exportar_parquet, "parquet", "application/vnd.apache.parquet"),
+    "Arrow": (exportar_arrow, "arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def exportar(df, formato):
+    return FORMATOS[formato][0](df)
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _valores_excel(serie):
+    """
+    Valores Python de uma coluna para o xlsxwriter; ausentes e, nas colunas
+    float, também ±inf (que o xlsxwriter não aceita) viram None (célula vazia).
+    """
+    if isinstance(serie.dtype, pd.DatetimeTZDtype):
+        serie = serie.dt.tz_convert("UTC").dt.tz_localize(None)
+    if pd.api.types.is_float_dtype(serie.dtype):
+        valores = serie.to_numpy(dtype="float64", na_value=np.nan)
+        return np.where(np.isfinite(valores), valores.astype(object), None).tolist()
+    valores = serie.astype(object).to_numpy()
+    return np.where(pd.isna(valores), None, valores).tolist()
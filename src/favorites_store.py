@@ -0,0 +1,109 @@
+# =============================================
+# Script: favorites_store.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Moedas favoritas por usuário, persistidas em SQLite no servidor
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+# =============================================
+# Configurações
+# =============================================
+
+CAMINHO_BANCO = os.environ.get("CRYPTO_FAVORITAS_DB", os.path.join("data", "favorites.db"))
+
+# Espera máxima por uma trava de escrita de outro processo (segundos)
+TIMEOUT_TRAVA = 5.0
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS favoritas (
+    usuario   TEXT NOT NULL,
+    moeda     TEXT NOT NULL,
+    criada_em TEXT NOT NULL,
+    PRIMARY KEY (usuario, moeda)
+) WITHOUT ROWID
+"""
+
+# =============================================
+# RepositorioFavoritas
+# =============================================
+
+class RepositorioFavoritas:
+    """
+    Lista de favoritas de cada usuário em uma tabela SQLite com chave
+    (usuario, moeda): consultar, marcar e desmarcar são buscas na chave
+    primária. As listas lidas ficam em memória como frozenset e só são
+    relidas quando o banco muda (PRAGMA data_version cobre escritas de
+    outros processos). Uma conexão por repositório, protegida por trava.
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho, timeout=TIMEOUT_TRAVA, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(_ESQUEMA)
+        self._conexao.commit()
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._versao_banco = self._data_version()
+
+    def listar(self, usuario):
+        """
+        Favoritas do usuário (frozenset de nomes).
+        """
+        with self._lock:
+            self._validar_cache()
+            favoritas = self._cache.get(usuario)
+            if favoritas is None:
+                linhas = self._conexao.execute(
+                    "SELECT moeda FROM favoritas WHERE usuario = ?", (usuario,)
+                ).fetchall()
+                favoritas = self._cache[usuario] = frozenset(moeda for (moeda,) in linhas)
+            return favoritas
+
+    def adicionar(self, usuario, moedas):
+        agora = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._escrever(
+            usuario,
+            "INSERT OR IGNORE INTO favoritas (usuario, moeda, criada_em) VALUES (?, ?, ?)",
+            [(usuario, moeda, agora) for moeda in moedas]
+        )
+
+    def remover(self, usuario, moedas):
+        self._escrever(
+            usuario,
+            "DELETE FROM favoritas WHERE usuario = ? AND moeda = ?",
+            [(usuario, moeda) for moeda in moedas]
+        )
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+    def _escrever(self, usuario, sql, parametros):
+        if not parametros:
+            return
+        with self._lock:
+            with self._conexao:  # Uma transação por chamada
+                self._conexao.executemany(sql, parametros)
+            self._cache.pop(usuario, None)
+            self._versao_banco = self._data_version()
+
+    def _validar_cache(self):
+        versao = self._data_version()
+        if versao != self._versao_banco:
+            self._cache.clear()
+            self._versao_banco = versao
+
+    def _data_version(self):
+        # Muda quando outra conexão grava no banco (as escritas desta não contam)
+        return self._conexao.execute("PRAGMA data_version").fetchone()[0]
@@ -0,0 +1,125 @@
+# =============================================
+# Script: formatting.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Formatação vetorizada de números no padrão pt-BR (1.234,56)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# =============================================
+# Configurações
+# =============================================
+
+# Acima disso o valor escalado não é mais inteiro exato em float64
+LIMITE_EXATO = 2.0 ** 53
+
+# Potências de 10 usadas para contar dígitos (até 10^16)
+_POTENCIAS = 10 ** np.arange(1, 17, dtype=np.int64)
+
+# =============================================
+# Funções
+# =============================================
+
+def formatar_numero_br(serie, casas=2):
+    """
+    Equivalente vetorizado de f"{x:,.{casas}f}" com "." no milhar e "," no decimal.
+    """
+    return _formatar(serie, casas, milhar=".", decimal=",")
+
+
+def formatar_percentual(serie, casas=2):
+    """
+    Equivalente vetorizado de f"{x:.{casas}f}%".
+    """
+    return _formatar(serie, casas, milhar="", decimal=".", sufixo="%")
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _formatar(serie, casas, milhar, decimal, sufixo=""):
+    """
+    Monta os textos como uma matriz de bytes (linhas x caracteres) calculando
+    os dígitos com aritmética inteira do NumPy, sem laço Python por célula.
+
+    O arredondamento é o mesmo do f-string: valores cujo escalonamento cai
+    perto de um empate (x,xx5), não finitos ou grandes demais para float64
+    exato são formatados pelo caminho Python, célula a célula.
+    """
+    valores = np.asarray(serie, dtype="float64")
+    indice = getattr(serie, "index", None)
+    if not len(valores):
+        return pd.Series([], index=indice, dtype=object)
+
+    fator = 10 ** casas
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        escalado = np.abs(valores) * fator
+        distancia_empate = np.abs(escalado - np.floor(escalado) - 0.5)
+        seguro = (
+            np.isfinite(escalado)
+            & (escalado < LIMITE_EXATO)
+            & (distancia_empate > 4 * np.spacing(escalado))
+        )
+        inteiros = np.where(seguro, np.rint(escalado), 0).astype(np.int64)
+
+    parte_inteira, parte_decimal = np.divmod(inteiros, fator)
+    negativo = np.signbit(valores)
+
+    digitos = 1 + np.searchsorted(_POTENCIAS, parte_inteira, side="right")
+    separadores = (digitos - 1) // 3 if milhar else 0
+    largura_decimal = casas + 1 if casas else 0
+    comprimento = negativo + digitos + separadores + largura_decimal + len(sufixo)
+    largura = int(comprimento.max())
+
+    # Cada linha p da matriz guarda o p-ésimo caractere (contado da direita) de
+    # todos os valores, então toda escrita é uma linha contígua. Posições além
+    # do comprimento de cada texto ficam com espaço e são removidas no fim.
+    invertida = np.empty((largura, len(valores)), dtype=np.uint8)
+    p = 0
+
+    def escrever(caracteres):
+        nonlocal p
+        invertida[p] = np.where(comprimento > p, caracteres, ord(" "))
+        p += 1
+
+    for caractere in reversed(sufixo.encode()):
+        escrever(caractere)
+
+    resto = parte_decimal
+    for _ in range(casas):
+        resto, digito = np.divmod(resto, 10)
+        escrever(digito + ord("0"))
+    if casas:
+        escrever(ord(decimal))
+
+    resto = parte_inteira
+    for j in range(int(digitos.max())):
+        if milhar and j and j % 3 == 0:
+            escrever(np.where(digitos > j, ord(milhar), ord(" ")))
+        resto, digito = np.divmod(resto, 10)
+        escrever(np.where(digitos > j, digito + ord("0"), ord(" ")))
+
+    invertida[p:] = ord(" ")
+
+    # Sinal logo antes do primeiro dígito de cada valor negativo
+    invertida[comprimento[negativo] - 1, np.flatnonzero(negativo)] = ord("-")
+
+    # Transpõe para uma linha por valor (alinhada à direita) e tira os espaços à esquerda
+    matriz = np.ascontiguousarray(invertida[::-1].T)
+    textos = pc.utf8_ltrim_whitespace(pa.array(matriz.view(f"S{largura}").ravel()).cast(pa.string()))
+    textos = textos.to_numpy(zero_copy_only=False)
+
+    # Casos que precisam do arredondamento exato do Python
+    traducao = str.maketrans({",": milhar, ".": decimal})
+    especificacao = f"{',' if milhar else ''}.{casas}f"
+    for i in np.flatnonzero(~seguro):
+        textos[i] = format(valores[i], especificacao).translate(traducao) + sufixo
+
+    return pd.Series(textos, index=indice, dtype=object)
@@ -0,0 +1,457 @@
+# =============================================
+# Script: history_store.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Histórico de snapshots em Parquet particionado por dia (somente anexação)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import contextlib
+import glob
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import downsampling
+import schema
+
+try:
+    import fcntl
+except ImportError:  # Windows: só a trava entre threads do mesmo processo
+    fcntl = None
+
+# =============================================
+# Configurações
+# =============================================
+
+PASTA_HISTORICO = os.path.join("data", "history")
+
+# Dias de histórico mantidos (0 mantém tudo)
+RETENCAO_DIAS = int(os.environ.get("CRYPTO_RETENCAO_DIAS", 365))
+
+# Colunas tipadas de cada snapshot (esquema único + instante da coleta)
+ESQUEMA = pa.schema([("snapshot_ts", pa.timestamp("us", tz="UTC"))] + list(schema.ESQUEMA_ARROW))
+
+PARTICIONAMENTO = ds.partitioning(pa.schema([("data", pa.string())]), flavor="hive")
+
+# Níveis pré-agregados (1m/1h/1d do preço), atualizados a cada anexação em
+# data/history/_niveis/nivel=<nível>/data=<dia>; o prefixo "_" os esconde do
+# dataset do histórico bruto
+PASTA_NIVEIS = "_niveis"
+ESQUEMA_NIVEL = pa.schema([
+    ("snapshot_ts", ESQUEMA.field("snapshot_ts").type),  # Início do balde
+    ESQUEMA.field("id"),
+    ESQUEMA.field("name"),
+    ("current_price", pa.float64()),  # Fechamento do balde
+    ("minimo", pa.float64()),
+    ("maximo", pa.float64()),
+    ("ultimo_ts", ESQUEMA.field("snapshot_ts").type),  # Instante do fechamento
+])
+
+# Trava da manutenção (retenção/compactação) entre processos; oculta, o dataset a ignora
+NOME_TRAVA = ".manutencao.lock"
+
+# Pastas ocultas usadas na troca atômica de uma partição compactada
+SUFIXO_NOVA = ".nova"
+SUFIXO_ANTIGA = ".antiga"
+
+# Tentativas de leitura quando uma compactação troca a partição durante a listagem
+TENTATIVAS_LEITURA = 3
+
+_lock = threading.Lock()
+
+# =============================================
+# Escrita
+# =============================================
+
+def anexar_snapshot(df, coletado_em=None, pasta=PASTA_HISTORICO):
+    """
+    Grava um snapshot como um novo arquivo na partição do dia, sem reescrever
+    nada do que já existe, e o soma aos baldes abertos dos níveis 1m/1h/1d.
+    Retorna o caminho do arquivo criado.
+    """
+    coletado_em = _para_utc(coletado_em or datetime.now(timezone.utc))
+
+    df = schema.aplicar_tipos(df)
+    df["snapshot_ts"] = coletado_em
+
+    tabela = pa.Table.from_pandas(df[ESQUEMA.names], schema=ESQUEMA, preserve_index=False)
+
+    particao = os.path.join(pasta, f"data={coletado_em.strftime('%Y-%m-%d')}")
+    os.makedirs(particao, exist_ok=True)
+    caminho = os.path.join(particao, f"snapshot_{coletado_em.strftime('%Y%m%dT%H%M%S%f')}.parquet")
+
+    _gravar_parquet(tabela, caminho)
+    with _travado(pasta):
+        _atualizar_niveis(tabela, coletado_em, pasta)
+
+    return caminho
+
+# =============================================
+# Leitura
+# =============================================
+
+def ler_historico(moedas=None, inicio=None, fim=None, colunas=None, pasta=PASTA_HISTORICO):
+    """
+    Lê o histórico filtrando por moeda (ids) e intervalo de tempo. Os filtros
+    são empurrados para o Parquet: partições fora do intervalo nem são abertas
+    e row groups sem as moedas pedidas são pulados.
+    """
+    if not glob.glob(os.path.join(pasta, "data=*", "*.parquet")):
+        return ESQUEMA.empty_table().to_pandas()
+
+    tabela = _ler_dataset(pasta, colunas or ESQUEMA.names, _filtro(moedas, inicio, fim))
+    if "snapshot_ts" in tabela.column_names:
+        tabela = tabela.sort_by("snapshot_ts")
+    return tabela.to_pandas()
+
+
+def ler_nivel(nivel, moedas=None, inicio=None, fim=None, pasta=PASTA_HISTORICO):
+    """
+    Baldes de um nível pré-agregado (1m/1h/1d) no intervalo, com os mesmos
+    filtros empurrados para o Parquet de ler_historico; o balde que contém
+    `inicio` entra inteiro. Ordenado por (id, snapshot_ts), como
+    downsampling.reduzir_series espera.
+    """
+    raiz = _pasta_nivel(pasta, nivel)
+    if not glob.glob(os.path.join(raiz, "data=*", "*.parquet")):
+        return ESQUEMA_NIVEL.empty_table().to_pandas()
+
+    if inicio is not None:
+        inicio = _para_utc(inicio).floor(downsampling.NIVEIS[nivel])
+    tabela = _ler_dataset(raiz, ESQUEMA_NIVEL.names, _filtro(moedas, inicio, fim))
+    return tabela.sort_by([("id", "ascending"), ("snapshot_ts", "ascending")]).to_pandas()
+
+
+def ler_para_grafico(moedas, inicio, fim, largura_px=downsampling.LARGURA_PADRAO_PX, metodo="lttb",
+                     pasta=PASTA_HISTORICO):
+    """
+    Histórico de preço pronto para um gráfico de linhas: o orçamento de
+    pontos é dividido entre as moedas (ids, em ordem de prioridade; as que
+    não cabem ficam de fora), o nível é escolhido pelos pontos de cada série
+    e só os baldes do intervalo são lidos e reduzidos.
+    Retorna (dados, nível, séries exibidas).
+    """
+    pontos, exibidas = downsampling.orcamento_series(len(moedas), largura_px)
+    nivel = downsampling.escolher_nivel(inicio, fim, pontos)
+    dados = ler_nivel(nivel, list(moedas)[:exibidas], inicio, fim, pasta)
+    dados = downsampling.reduzir_series(dados, "snapshot_ts", "current_price", pontos, metodo, ordenado=True)
+    return dados.reset_index(drop=True), nivel, exibidas
+
+
+def primeiro_dia(pasta=PASTA_HISTORICO):
+    """
+    Início (UTC) do dia mais antigo com níveis agregados; None sem histórico.
+    """
+    particoes = sorted(glob.glob(os.path.join(_pasta_nivel(pasta, "1d"), "data=*")))
+    if not particoes:
+        return None
+    return pd.Timestamp(os.path.basename(particoes[0]).split("=", 1)[1], tz="UTC")
+
+# =============================================
+# Retenção e compactação
+# =============================================
+
+def aplicar_retencao(retencao_dias=RETENCAO_DIAS, pasta=PASTA_HISTORICO, agora=None):
+    """
+    Apaga as partições (dias) mais antigas que a retenção configurada, no
+    histórico bruto e nos níveis agregados.
+    """
+    if retencao_dias <= 0:
+        return []
+
+    limite = ((agora or datetime.now(timezone.utc)) - timedelta(days=retencao_dias)).strftime("%Y-%m-%d")
+    removidas = []
+    with _travado(pasta):
+        for raiz in _raizes(pasta):
+            for particao in glob.glob(os.path.join(raiz, "data=*")):
+                if os.path.basename(particao).split("=", 1)[1] < limite:
+                    shutil.rmtree(particao)
+                    removidas.append(particao)
+    return removidas
+
+
+def compactar(pasta=PASTA_HISTORICO, agora=None):
+    """
+    Junta os arquivos de cada partição já fechada (dias anteriores) em um único
+    Parquet, sem linhas repetidas de (snapshot_ts, id), no histórico bruto e
+    nos níveis agregados (um arquivo por balde vira um por dia). A partição
+    do dia corrente continua recebendo anexações.
+
+    A partição compactada é montada em uma pasta oculta e trocada pela
+    original por rename: quem lê vê só os arquivos antigos ou só o
+    compactado, e uma queda no meio não deixa os dois (ver _recuperar).
+    """
+    hoje = (agora or datetime.now(timezone.utc)).strftime("%Y-%m-%d")
+    compactadas = []
+
+    with _travado(pasta):
+        _completar_niveis(pasta, hoje)
+
+        for raiz in _raizes(pasta):
+            _recuperar(raiz)
+            if raiz == pasta:
+                esquema, ordem = ESQUEMA, [("snapshot_ts", "ascending"), ("market_cap_rank", "ascending")]
+            else:
+                esquema, ordem = ESQUEMA_NIVEL, [("id", "ascending"), ("snapshot_ts", "ascending")]
+
+            for particao in sorted(glob.glob(os.path.join(raiz, "data=*"))):
+                if os.path.basename(particao).split("=", 1)[1] >= hoje:
+                    continue
+
+                arquivos = sorted(glob.glob(os.path.join(particao, "*.parquet")))
+                if len(arquivos) <= 1:
+                    continue
+
+                tabela = pa.concat_tables(pq.read_table(arquivo, schema=esquema) for arquivo in arquivos)
+                _trocar_particao(particao, _sem_repetidas(tabela).sort_by(ordem))
+                compactadas.append(particao)
+
+    return compactadas
+
+
+def manter_historico(retencao_dias=RETENCAO_DIAS, pasta=PASTA_HISTORICO):
+    """
+    Política de manutenção chamada após cada coleta: retenção + compactação
+    (que também agrega os dias gravados antes de existirem os níveis).
+    """
+    aplicar_retencao(retencao_dias, pasta)
+    compactar(pasta)
+
+# =============================================
+# Níveis agregados
+# =============================================
+
+def _atualizar_niveis(tabela, coletado_em, pasta):
+    """
+    Soma o snapshot ao balde aberto de cada nível: lê o arquivo do balde (uma
+    linha por moeda), combina com o snapshot alinhando pelos ids e o regrava
+    por rename. Cada balde tem um único arquivo, então quem lê nunca precisa
+    combinar nada.
+    Chamada com a trava da manutenção.
+    """
+    dia = coletado_em.strftime("%Y-%m-%d")
+    if not os.path.isdir(os.path.join(_pasta_nivel(pasta, "1d"), f"data={dia}")):
+        # Primeiro snapshot do dia (ou dia gravado antes dos níveis): agrega o
+        # dia inteiro do histórico bruto, que já inclui este snapshot
+        _materializar_dia(pasta, dia, fechado=False)
+        return
+
+    snapshot = tabela.select(["snapshot_ts", "id", "name", "current_price"]).to_pandas()
+    for nivel, resolucao in downsampling.NIVEIS.items():
+        balde = coletado_em.floor(resolucao)
+        caminho = os.path.join(_pasta_nivel(pasta, nivel), f"data={dia}", f"balde_{balde.strftime('%Y%m%dT%H%M')}.parquet")
+        balde_atual = pq.read_table(caminho).to_pandas() if os.path.exists(caminho) else ESQUEMA_NIVEL.empty_table().to_pandas()
+        _gravar_parquet(_tabela_nivel(downsampling.somar_ao_balde(balde_atual, snapshot, nivel)), caminho)
+
+
+def _materializar_dia(pasta, dia, fechado):
+    """
+    (Re)agrega um dia inteiro do histórico bruto em todos os níveis. Dia
+    fechado vira um arquivo por nível; o dia corrente, um arquivo por balde,
+    para as próximas anexações. O 1d é gravado por último: é ele que marca o
+    dia como agregado.
+    """
+    inicio = pd.Timestamp(dia, tz="UTC")
+    historico = ler_historico(
+        inicio=inicio, fim=inicio + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1),
+        colunas=["snapshot_ts", "id", "name", "current_price"], pasta=pasta
+    )
+    for nivel in downsampling.NIVEIS:
+        particao = os.path.join(_pasta_nivel(pasta, nivel), f"data={dia}")
+        shutil.rmtree(particao, ignore_errors=True)
+        os.makedirs(particao)
+
+        agregado = downsampling.agregar_nivel(historico, nivel)
+        if fechado:
+            _gravar_parquet(_tabela_nivel(agregado), os.path.join(particao, "compactado.parquet"))
+            continue
+        for balde, do_balde in agregado.groupby("snapshot_ts"):
+            _gravar_parquet(_tabela_nivel(do_balde), os.path.join(particao, f"balde_{balde.strftime('%Y%m%dT%H%M')}.parquet"))
+
+
+def _completar_niveis(pasta, hoje):
+    """
+    Agrega os dias do histórico bruto que ainda não têm níveis (histórico
+    gravado antes deles ou por fora de anexar_snapshot).
+    """
+    for particao in sorted(glob.glob(os.path.join(pasta, "data=*"))):
+        dia = os.path.basename(particao).split("=", 1)[1]
+        if not os.path.isdir(os.path.join(_pasta_nivel(pasta, "1d"), f"data={dia}")):
+            _materializar_dia(pasta, dia, fechado=dia < hoje)
+
+
+def _tabela_nivel(agregado):
+    return pa.Table.from_pandas(agregado[ESQUEMA_NIVEL.names], schema=ESQUEMA_NIVEL, preserve_index=False)
+
+
+def _pasta_nivel(pasta, nivel):
+    return os.path.join(pasta, PASTA_NIVEIS, f"nivel={nivel}")
+
+
+def _raizes(pasta):
+    """
+    Pastas particionadas por dia: o histórico bruto e cada nível agregado.
+    """
+    return [pasta] + [_pasta_nivel(pasta, nivel) for nivel in downsampling.NIVEIS]
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+@contextlib.contextmanager
+def _travado(pasta):
+    """
+    Serializa a manutenção do histórico entre threads e, onde há fcntl,
+    entre processos (cada processo roda o próprio agendador).
+    """
+    with _lock:
+        if fcntl is None:
+            yield
+            return
+
+        os.makedirs(pasta, exist_ok=True)
+        with open(os.path.join(pasta, NOME_TRAVA), "a") as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(trava, fcntl.LOCK_UN)
+
+
+def _trocar_particao(particao, tabela):
+    """
+    Troca o conteúdo da partição por um único compactado.parquet: montado em
+    uma pasta oculta e posto no lugar da original por rename.
+    """
+    nova, antiga = _pastas_da_troca(particao)
+    shutil.rmtree(nova, ignore_errors=True)
+    os.makedirs(nova)
+    _gravar_parquet(tabela, os.path.join(nova, "compactado.parquet"))
+
+    os.rename(particao, antiga)
+    os.rename(nova, particao)
+    _fsync_pasta(os.path.dirname(particao))
+    shutil.rmtree(antiga)
+
+
+def _filtro(moedas, inicio, fim):
+    """
+    Expressão do dataset para moedas (ids) e intervalo: o filtro pela
+    partição do dia poda diretórios inteiros, o de snapshot_ts, row groups.
+    """
+    tipo = ESQUEMA.field("snapshot_ts").type
+    filtro = None
+
+    def adicionar(expressao):
+        nonlocal filtro
+        filtro = expressao if filtro is None else filtro & expressao
+
+    if moedas is not None:
+        adicionar(ds.field("id").isin(list(moedas)))
+    if inicio is not None:
+        inicio = _para_utc(inicio)
+        adicionar(ds.field("data") >= inicio.strftime("%Y-%m-%d"))
+        adicionar(ds.field("snapshot_ts") >= pa.scalar(inicio, tipo))
+    if fim is not None:
+        fim = _para_utc(fim)
+        adicionar(ds.field("data") <= fim.strftime("%Y-%m-%d"))
+        adicionar(ds.field("snapshot_ts") <= pa.scalar(fim, tipo))
+    return filtro
+
+
+def _recuperar(pasta):
+    """
+    Termina (ou desfaz) uma troca de partição interrompida por uma queda:
+    - só a pasta nova: o compactado pode estar incompleto, os originais estão
+      intactos → descarta a nova;
+    - a antiga sem a partição: caiu entre os dois renames → a nova (completa)
+      assume, ou a antiga volta se a nova não chegou a existir;
+    - a antiga com a partição: a troca terminou → descarta a antiga.
+    """
+    for antiga in glob.glob(os.path.join(pasta, f".data=*{SUFIXO_ANTIGA}")):
+        particao = os.path.join(pasta, os.path.basename(antiga)[1:-len(SUFIXO_ANTIGA)])
+        nova = _pastas_da_troca(particao)[0]
+        if not os.path.exists(particao):
+            if os.path.exists(os.path.join(nova, "compactado.parquet")):
+                os.rename(nova, particao)
+            else:
+                os.rename(antiga, particao)
+                continue
+        shutil.rmtree(antiga)
+
+    for nova in glob.glob(os.path.join(pasta, f".data=*{SUFIXO_NOVA}")):
+        shutil.rmtree(nova)
+
+
+def _pastas_da_troca(particao):
+    pasta, nome = os.path.split(particao)
+    return os.path.join(pasta, f".{nome}{SUFIXO_NOVA}"), os.path.join(pasta, f".{nome}{SUFIXO_ANTIGA}")
+
+
+def _sem_repetidas(tabela):
+    """
+    Remove linhas repetidas de (snapshot_ts, id), mantendo a primeira (ex.:
+    snapshots que sobraram ao lado de um compactado que já os contém).
+    """
+    if tabela.num_rows <= 1:
+        return tabela
+    tabela = tabela.sort_by([("snapshot_ts", "ascending"), ("id", "ascending")])
+    instantes = tabela["snapshot_ts"].combine_chunks()
+    ids = tabela["id"].combine_chunks()
+    repetida = pc.and_(
+        pc.equal(instantes[1:], instantes[:-1]),
+        pc.equal(ids[1:], ids[:-1]),
+    ).fill_null(False)
+    if not pc.any(repetida).as_py():
+        return tabela
+    return tabela.filter(pa.concat_arrays([pa.array([True]), pc.invert(repetida)]))
+
+
+def _ler_dataset(pasta, colunas, filtro):
+    """
+    Lê o dataset, listando de novo se um arquivo sumir entre a listagem e a
+    leitura (partição trocada por uma compactação em outro processo).
+    """
+    for tentativa in range(TENTATIVAS_LEITURA):
+        try:
+            dataset = ds.dataset(pasta, format="parquet", partitioning=PARTICIONAMENTO)
+            return dataset.to_table(columns=colunas, filter=filtro)
+        except FileNotFoundError:
+            if tentativa == TENTATIVAS_LEITURA - 1:
+                raise
+
+
+def _fsync_pasta(pasta):
+    # Garante que os renames sobrevivam a uma queda (não suportado no Windows)
+    if os.name == "nt":
+        return
+    descritor = os.open(pasta, os.O_RDONLY)
+    try:
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+
+def _gravar_parquet(tabela, caminho):
+    """
+    Escreve em um arquivo temporário oculto (ignorado pelo dataset) e renomeia,
+    então leitores nunca veem um Parquet pela metade.
+    """
+    pasta, nome = os.path.split(caminho)
+    temporario = os.path.join(pasta, f".{nome}.tmp")
+    pq.write_table(tabela, temporario)
+    os.replace(temporario, caminho)
+
+
+def _para_utc(momento):
+    momento = pd.Timestamp(momento)
+    return momento.tz_localize("UTC") if momento.tzinfo is None else momento.tz_convert("UTC")
@@ -0,0 +1,243 @@
+# =============================================
+# Script: http_client.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Cliente HTTP da CoinGecko com sessão persistente, limite de taxa,
+#            novas tentativas e revalidação condicional (ETag/Last-Modified)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import instrumentation
+
+# =============================================
+# Configurações
+# =============================================
+
+TIMEOUT_PADRAO = (3.05, 15)  # (conexão, leitura) em segundos
+TENTATIVAS_PADRAO = 4        # Total de tentativas por requisição
+BACKOFF_BASE = 0.5           # Espera inicial entre tentativas (dobra a cada falha)
+BACKOFF_MAXIMO = 30          # Espera máxima entre tentativas
+TAXA_PADRAO = 0.5            # Requisições por segundo (~30/min, plano gratuito)
+RAJADA_PADRAO = 5            # Requisições permitidas em rajada
+TAMANHO_POOL = 10            # Conexões mantidas abertas por host
+TAMANHO_BLOCO_STREAM = 64 * 1024  # Bytes lidos por vez em get_stream
+
+STATUS_TRANSITORIOS = {500, 502, 503, 504}
+
+# Falhas de rede repetidas, inclusive as que acontecem no meio da leitura do corpo
+ERROS_TRANSITORIOS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+# =============================================
+# LimitadorTaxa
+# =============================================
+
+class LimitadorTaxa:
+    """
+    Token bucket compartilhado entre threads. Também pode ser pausado até um
+    instante futuro quando a API responde com Retry-After.
+    """
+
+    def __init__(self, taxa=TAXA_PADRAO, capacidade=RAJADA_PADRAO):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._ultimo = time.monotonic()
+        self._pausado_ate = 0.0
+        self._lock = threading.Lock()
+
+    def adquirir(self):
+        """
+        Bloqueia até haver um token disponível.
+        """
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+
+                if agora < self._pausado_ate:
+                    espera = self._pausado_ate - agora
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    espera = (1 - self._tokens) / self.taxa
+
+            time.sleep(espera)
+
+    def pausar(self, segundos):
+        with self._lock:
+            self._pausado_ate = max(self._pausado_ate, time.monotonic() + segundos)
+
+# =============================================
+# ClienteCoinGecko
+# =============================================
+
+class ClienteCoinGecko:
+    """
+    Cliente com sessão HTTP persistente (pool de conexões), timeout por
+    requisição, limite de taxa, novas tentativas com backoff exponencial e
+    cache de respostas revalidado via ETag/If-Modified-Since.
+    """
+
+    def __init__(
+        self,
+        url_base,
+        timeout=TIMEOUT_PADRAO,
+        tentativas=TENTATIVAS_PADRAO,
+        limitador=None
+    ):
+        self.url_base = url_base.rstrip("/")
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.limitador = limitador or LimitadorTaxa()
+
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=TAMANHO_POOL, pool_maxsize=TAMANHO_POOL)
+        self.session.mount("http://", adaptador)
+        self.session.mount("https://", adaptador)
+
+        # (url, params, tipo de leitura) -> (etag, last_modified, payload)
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    def get_json(self, caminho, params=None):
+        """
+        Faz um GET e retorna o JSON. Se o servidor responder 304, devolve o
+        payload guardado da última resposta completa.
+        """
+        return self._get_com_cache(caminho, params, "json", lambda response: response.json())
+
+    def get_stream(self, caminho, params, processar, tipo="stream", tamanho_bloco=TAMANHO_BLOCO_STREAM):
+        """
+        Faz um GET sem carregar o corpo inteiro na memória: `processar`
+        recebe um iterador de blocos de bytes e o que ele retornar é o
+        resultado (e o que fica em cache para as respostas 304). `tipo`
+        separa no cache resultados de leituras diferentes da mesma URL.
+        """
+        def ler(response):
+            with response:
+                return processar(response.iter_content(tamanho_bloco))
+
+        return self._get_com_cache(caminho, params, tipo, ler, stream=True)
+
+    @instrumentation.cronometrar("coingecko.get")
+    def _get_com_cache(self, caminho, params, tipo, ler, stream=False):
+        url = f"{self.url_base}/{caminho.lstrip('/')}"
+        chave = (url, tuple(sorted((params or {}).items())), tipo)
+
+        with self._cache_lock:
+            em_cache = self._cache.get(chave)
+
+        headers = {}
+        if em_cache:
+            etag, last_modified, _ = em_cache
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response, payload = self._requisitar(url, params, headers, ler, stream=stream)
+
+        if response.status_code == 304:
+            if em_cache is None:
+                # Sem cabeçalhos condicionais não há o que reaproveitar: um 304 aqui é erro do servidor
+                raise requests.HTTPError(
+                    f"304 Not Modified sem requisição condicional para {url}", response=response
+                )
+            instrumentation.contar("coingecko.nao_modificado")
+            return em_cache[2]
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._cache_lock:
+                self._cache[chave] = (etag, last_modified, payload)
+
+        return payload
+
+    def _requisitar(self, url, params, headers, ler, stream=False):
+        """
+        Retorna (response, payload lido por `ler`); num 304 o payload é None.
+        Com stream=True o corpo só chega em `ler`, então a leitura fica dentro
+        das tentativas: uma queda no meio do corpo repete a requisição inteira.
+        """
+        for tentativa in range(1, self.tentativas + 1):
+            ultima = tentativa == self.tentativas
+            self.limitador.adquirir()
+
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout, stream=stream)
+
+                if response.status_code == 429 and not ultima:
+                    response.close()
+                    instrumentation.contar("coingecko.limite_429")
+                    espera = _ler_retry_after(response.headers.get("Retry-After"))
+                    self.limitador.pausar(espera if espera is not None else self._backoff(tentativa))
+                    continue
+
+                if response.status_code in STATUS_TRANSITORIOS and not ultima:
+                    response.close()
+                    instrumentation.contar("coingecko.novas_tentativas")
+                    time.sleep(self._backoff(tentativa))
+                    continue
+
+                if response.status_code == 304:
+                    response.close()
+                    return response, None
+
+                if not response.ok:
+                    response.close()
+                response.raise_for_status()
+                return response, ler(response)
+            except ERROS_TRANSITORIOS:
+                if ultima:
+                    raise
+                instrumentation.contar("coingecko.novas_tentativas")
+                time.sleep(self._backoff(tentativa))
+
+    def _backoff(self, tentativa):
+        espera = min(BACKOFF_BASE * 2 ** (tentativa - 1), BACKOFF_MAXIMO)
+        return espera * random.uniform(0.5, 1.0)
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _ler_retry_after(valor):
+    """
+    Converte o header Retry-After (segundos ou data HTTP) em segundos de espera.
+    """
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_clientes = {}
+_clientes_lock = threading.Lock()
+
+def obter_cliente(url_base):
+    """
+    Retorna o cliente compartilhado do processo para a URL informada, para que
+    todas as coletas reaproveitem a mesma sessão e o mesmo limite de taxa.
+    """
+    with _clientes_lock:
+        if url_base not in _clientes:
+            _clientes[url_base] = ClienteCoinGecko(url_base)
+        return _clientes[url_base]
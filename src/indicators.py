@@ -0,0 +1,297 @@
+# =============================================
+# Script: indicators.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Indicadores móveis (retorno, volatilidade, SMA/EMA, drawdown, z-score de volume) em lote
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import numpy as np
+import pandas as pd
+
+import history_store
+
+# =============================================
+# Configurações
+# =============================================
+
+# Janelas medidas em snapshots (com o intervalo padrão de 5 min, 12 = 1 hora)
+JANELA_RETORNO = 12
+JANELA_VOLATILIDADE = 12
+JANELA_SMA = 12
+SPAN_EMA = 12
+JANELA_ZSCORE = 12
+
+# Linhas (instantes) processadas por vez ao montar a partir do histórico
+TAMANHO_BLOCO = 4096
+
+# Dias de histórico lidos para aquecer as janelas e a EMA ao iniciar o processo
+DIAS_AQUECIMENTO = 7
+
+INDICADORES = ["retorno", "volatilidade", "sma", "ema", "drawdown", "zscore_volume"]
+
+ROTULOS = {
+    "retorno": "Retorno",
+    "volatilidade": "Volatilidade",
+    "sma": "Média Móvel (SMA)",
+    "ema": "Média Exponencial (EMA)",
+    "drawdown": "Distância do ATH",
+    "zscore_volume": "Z-score do Volume",
+}
+
+# =============================================
+# MotorIndicadores
+# =============================================
+
+class MotorIndicadores:
+    """
+    Calcula os indicadores sobre matrizes (tempo x moeda), todas as moedas de
+    uma vez. O estado necessário para continuar a série (últimas linhas da
+    janela, EMA e máximo acumulado) fica guardado, então os blocos podem
+    chegar aos poucos: um bloco de uma linha é um snapshot novo e o resultado
+    é o mesmo de processar a série inteira de uma vez.
+    """
+
+    def __init__(
+        self,
+        janela_retorno=JANELA_RETORNO,
+        janela_volatilidade=JANELA_VOLATILIDADE,
+        janela_sma=JANELA_SMA,
+        span_ema=SPAN_EMA,
+        janela_zscore=JANELA_ZSCORE
+    ):
+        self.janela_retorno = janela_retorno
+        self.janela_volatilidade = janela_volatilidade
+        self.janela_sma = janela_sma
+        self.janela_zscore = janela_zscore
+        self.alfa = 2.0 / (span_ema + 1)
+
+        # Linhas anteriores necessárias para as janelas do próximo bloco
+        self._memoria = max(janela_retorno, janela_volatilidade + 1, janela_sma, janela_zscore)
+
+        self.ids = pd.Index([], dtype=object)
+        self._precos = np.empty((0, 0))
+        self._volumes = np.empty((0, 0))
+        self._ema = np.empty(0)
+        self._maximo = np.empty(0)
+        self.instantes = 0
+
+    # -----------------------------------------
+    # Processamento
+    # -----------------------------------------
+
+    def garantir_moedas(self, ids):
+        """
+        Acrescenta colunas (com estado vazio) para ids ainda não vistos.
+        """
+        novas = pd.Index(ids).difference(self.ids)
+        if not len(novas):
+            return
+        n = len(novas)
+        self.ids = self.ids.append(novas) if len(self.ids) else novas
+        self._precos = np.hstack([self._precos, np.full((len(self._precos), n), np.nan)])
+        self._volumes = np.hstack([self._volumes, np.full((len(self._volumes), n), np.nan)])
+        self._ema = np.concatenate([self._ema, np.full(n, np.nan)])
+        self._maximo = np.concatenate([self._maximo, np.full(n, np.nan)])
+
+    def processar(self, precos, volumes, ath=None):
+        """
+        Processa um bloco (linhas x moedas, colunas na ordem de self.ids) e
+        devolve {indicador: matriz do mesmo formato}. NaN marca moeda sem
+        dado no instante ou janela ainda incompleta.
+        """
+        precos = np.asarray(precos, dtype="float64")
+        volumes = np.asarray(volumes, dtype="float64")
+        linhas = len(precos)
+        if precos.shape[1] != len(self.ids):
+            raise ValueError(f"Bloco com {precos.shape[1]} moedas; o motor tem {len(self.ids)} (use garantir_moedas).")
+
+        # Bloco precedido das últimas linhas já vistas, para as janelas
+        p = np.vstack([self._precos, precos])
+        v = np.vstack([self._volumes, volumes])
+        inicio = len(self._precos)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            retorno = p[inicio:] / _deslocar(p, self.janela_retorno)[inicio:] - 1
+
+            log_retornos = np.diff(np.log(p), axis=0, prepend=np.nan)
+            _, volatilidade = _estatisticas_moveis(log_retornos, self.janela_volatilidade, calcular_media=False)
+
+            sma, _ = _estatisticas_moveis(p, self.janela_sma, calcular_desvio=False)
+
+            media_volume, desvio_volume = _estatisticas_moveis(v, self.janela_zscore)
+            zscore_volume = (volumes - media_volume[inicio:]) / desvio_volume[inicio:]
+
+            # Drawdown em relação à máxima acumulada (e ao ATH da API, quando informado)
+            maximo = np.fmax.accumulate(np.vstack([self._maximo, precos]), axis=0)[1:]
+            if ath is not None:
+                maximo = np.fmax(maximo, np.asarray(ath, dtype="float64"))
+            drawdown = precos / maximo - 1
+
+        ema = np.empty_like(precos)
+        atual = self._ema
+        for t in range(linhas):
+            atual = _passo_ema(atual, precos[t], self.alfa)
+            ema[t] = atual
+
+        if linhas:
+            self._ema = atual
+            self._maximo = maximo[-1]
+        self._precos = p[-self._memoria:]
+        self._volumes = v[-self._memoria:]
+        self.instantes += linhas
+
+        return {
+            "retorno": retorno,
+            "volatilidade": volatilidade[inicio:],
+            "sma": sma[inicio:],
+            "ema": ema,
+            "drawdown": drawdown,
+            "zscore_volume": zscore_volume,
+        }
+
+    def adicionar_snapshot(self, df):
+        """
+        Processa um snapshot (DataFrame da coleta) como um bloco de uma linha e
+        devolve os indicadores por moeda, indexados pelo id.
+        """
+        df = df.drop_duplicates("id").set_index("id")
+        self.garantir_moedas(df.index)
+
+        linha = df.reindex(self.ids)
+        resultado = self.processar(
+            linha["current_price"].to_numpy(dtype="float64")[None, :],
+            linha["total_volume"].to_numpy(dtype="float64")[None, :],
+            linha["ath"].to_numpy(dtype="float64")[None, :]
+        )
+        return _tabela(resultado, self.ids, -1).reindex(df.index)
+
+# =============================================
+# Funções
+# =============================================
+
+def matrizes_do_historico(df_historico):
+    """
+    Converte o histórico em formato longo (snapshot_ts, id, ...) nas matrizes
+    (tempo x moeda) de preço, volume e ATH.
+    """
+    df = df_historico.drop_duplicates(["snapshot_ts", "id"], keep="last")
+    largas = df.pivot(index="snapshot_ts", columns="id", values=["current_price", "total_volume", "ath"])
+    ids = largas["current_price"].columns
+    return (
+        largas.index,
+        ids,
+        largas["current_price"].to_numpy(dtype="float64"),
+        largas["total_volume"].reindex(columns=ids).to_numpy(dtype="float64"),
+        largas["ath"].reindex(columns=ids).to_numpy(dtype="float64"),
+    )
+
+
+def carregar_do_historico(inicio=None, motor=None, tamanho_bloco=TAMANHO_BLOCO, pasta=history_store.PASTA_HISTORICO):
+    """
+    Monta o motor a partir dos snapshots já gravados, em blocos de linhas, e
+    devolve (motor, indicadores do último snapshot por id).
+    """
+    motor = motor or MotorIndicadores()
+    historico = history_store.ler_historico(
+        inicio=inicio,
+        colunas=["snapshot_ts", "id", "current_price", "total_volume", "ath"],
+        pasta=pasta
+    )
+    if historico.empty:
+        return motor, None
+
+    _, ids, precos, volumes, ath = matrizes_do_historico(historico)
+    motor.garantir_moedas(ids)
+    colunas = motor.ids.get_indexer(ids)
+
+    for inicio_bloco in range(0, len(precos), tamanho_bloco):
+        fatia = slice(inicio_bloco, inicio_bloco + tamanho_bloco)
+        resultado = motor.processar(
+            _alinhar(precos[fatia], colunas, len(motor.ids)),
+            _alinhar(volumes[fatia], colunas, len(motor.ids)),
+            _alinhar(ath[fatia], colunas, len(motor.ids))
+        )
+
+    # Só as moedas presentes no último snapshot
+    ultimo = historico.loc[historico["snapshot_ts"] == historico["snapshot_ts"].iloc[-1], "id"]
+    return motor, _tabela(resultado, motor.ids, -1).reindex(pd.Index(ultimo.unique()))
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _passo_ema(anterior, valores, alfa):
+    """
+    Um passo da EMA; começa no primeiro valor válido e mantém o anterior
+    quando a moeda não tem dado no instante.
+    """
+    return np.where(
+        np.isnan(valores),
+        anterior,
+        np.where(np.isnan(anterior), valores, alfa * valores + (1 - alfa) * anterior)
+    )
+
+
+def _deslocar(x, periodos):
+    deslocado = np.full_like(x, np.nan)
+    if periodos < len(x):
+        deslocado[periodos:] = x[:-periodos]
+    return deslocado
+
+
+def _soma_movel(x, janela):
+    """
+    Soma das últimas `janela` linhas via soma acumulada (custo linear, sem
+    depender da janela).
+    """
+    soma = np.cumsum(x, axis=0)
+    soma[janela:] -= soma[:-janela]
+    return soma
+
+
+def _estatisticas_moveis(x, janela, calcular_media=True, calcular_desvio=True):
+    """
+    Média e desvio padrão amostral das últimas `janela` linhas de cada coluna.
+    Janelas incompletas ou com algum NaN resultam em NaN. Cada coluna é
+    centrada antes das somas para reduzir o cancelamento numérico.
+    """
+    invalidos = np.isnan(x)
+    tem_falhas = invalidos.any()
+
+    if tem_falhas:
+        validos_coluna = len(x) - invalidos.sum(axis=0)
+        referencia = np.where(invalidos, 0.0, x).sum(axis=0) / np.maximum(validos_coluna, 1)
+        centrado = x - referencia
+        centrado[invalidos] = 0.0
+        incompleta = _soma_movel(invalidos.astype(np.int32), janela) > 0
+    else:
+        referencia = x.mean(axis=0)
+        centrado = x - referencia
+        incompleta = np.zeros(x.shape, dtype=bool)
+    incompleta[:janela - 1] = True
+
+    soma = _soma_movel(centrado, janela)
+    media = desvio = None
+    if calcular_media:
+        media = soma / janela + referencia
+        media[incompleta] = np.nan
+    if calcular_desvio:
+        quadrados = _soma_movel(np.square(centrado, out=centrado), janela)
+        variancia = (quadrados - soma * soma / janela) / (janela - 1)
+        desvio = np.sqrt(np.maximum(variancia, 0.0, out=variancia), out=variancia)
+        desvio[incompleta] = np.nan
+    return media, desvio
+
+
+def _alinhar(matriz, colunas, total):
+    if len(colunas) == total and (colunas == np.arange(total)).all():
+        return matriz
+    alinhada = np.full((len(matriz), total), np.nan)
+    alinhada[:, colunas] = matriz
+    return alinhada
+
+
+def _tabela(resultado, ids, linha):
+    return pd.DataFrame({nome: resultado[nome][linha] for nome in INDICADORES}, index=ids)
@@ -0,0 +1,210 @@
+# =============================================
+# Script: instrumentation.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Spans de tempo e contadores dos caminhos quentes, com exportação Prometheus/JSON
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+# =============================================
+# Configurações
+# =============================================
+
+# CRYPTO_METRICAS=0 desliga a coleta (spans e contadores viram chamadas vazias)
+HABILITADO = os.environ.get("CRYPTO_METRICAS", "1") != "0"
+
+AMOSTRAS_POR_SPAN = 1024  # Durações recentes guardadas por span para os percentis
+QUANTIS = (0.5, 0.95, 0.99)
+
+PREFIXO_PROMETHEUS = "crypto"
+
+# =============================================
+# Estado
+# =============================================
+
+# nome -> [contagem, soma em segundos, deque das durações recentes]
+_spans = {}
+_contadores = {}
+_lock = threading.Lock()
+_NULO = nullcontext()
+
+# =============================================
+# Registro
+# =============================================
+
+def registrar(nome, segundos):
+    """
+    Registra a duração de um span já medido por quem chamou.
+    """
+    if not HABILITADO:
+        return
+    with _lock:
+        span = _spans.get(nome)
+        if span is None:
+            span = _spans[nome] = [0, 0.0, deque(maxlen=AMOSTRAS_POR_SPAN)]
+        span[0] += 1
+        span[1] += segundos
+        span[2].append(segundos)
+
+
+def contar(nome, valor=1):
+    if not HABILITADO:
+        return
+    with _lock:
+        _contadores[nome] = _contadores.get(nome, 0) + valor
+
+
+def medir(nome):
+    """
+    Context manager que registra a duração do bloco no span `nome`.
+    Desligado, devolve um contexto vazio compartilhado.
+    """
+    if not HABILITADO:
+        return _NULO
+    return _Span(nome)
+
+
+class _Span:
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registrar(self.nome, time.perf_counter() - self.inicio)
+        return False
+
+
+def cronometrar(nome):
+    """
+    Decorador: cada chamada da função vira uma amostra do span `nome`.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not HABILITADO:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registrar(nome, time.perf_counter() - inicio)
+        return envolvida
+    return decorador
+
+
+def limpar():
+    with _lock:
+        _spans.clear()
+        _contadores.clear()
+
+# =============================================
+# Leitura e exportação
+# =============================================
+
+def resumo():
+    """
+    {"spans": {nome: {"contagem", "soma_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}},
+     "contadores": {nome: valor}}. Percentis sobre as amostras recentes.
+    """
+    with _lock:
+        copias = {nome: (contagem, soma, np.fromiter(amostras, dtype="float64"))
+                  for nome, (contagem, soma, amostras) in _spans.items()}
+        contadores = dict(_contadores)
+
+    spans = {}
+    for nome in sorted(copias):
+        contagem, soma, valores = copias[nome]
+        p50, p95, p99 = np.quantile(valores, QUANTIS) * 1000
+        spans[nome] = {
+            "contagem": contagem,
+            "soma_ms": soma * 1000,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "max_ms": float(valores.max() * 1000),
+        }
+    return {"spans": spans, "contadores": dict(sorted(contadores.items()))}
+
+
+def exportar_json():
+    return json.dumps(resumo(), ensure_ascii=False)
+
+
+def exportar_prometheus():
+    """
+    Formato texto do Prometheus: um summary por span (segundos) e um
+    counter por contador, com o nome como label.
+    """
+    dados = resumo()
+    span = f"{PREFIXO_PROMETHEUS}_span_seconds"
+    eventos = f"{PREFIXO_PROMETHEUS}_eventos_total"
+    linhas = [
+        f"# HELP {span} Duração das etapas instrumentadas.",
+        f"# TYPE {span} summary",
+    ]
+    for nome, valores in dados["spans"].items():
+        rotulo = _rotulo(nome)
+        for quantil, chave in zip(QUANTIS, ("p50_ms", "p95_ms", "p99_ms")):
+            linhas.append(f'{span}{{span="{rotulo}",quantile="{quantil}"}} {valores[chave] / 1000:.9g}')
+        linhas.append(f'{span}_sum{{span="{rotulo}"}} {valores["soma_ms"] / 1000:.9g}')
+        linhas.append(f'{span}_count{{span="{rotulo}"}} {valores["contagem"]}')
+
+    linhas += [f"# HELP {eventos} Contadores dos caminhos instrumentados.", f"# TYPE {eventos} counter"]
+    for nome, valor in dados["contadores"].items():
+        linhas.append(f'{eventos}{{contador="{_rotulo(nome)}"}} {valor}')
+    return "\n".join(linhas) + "\n"
+
+
+def iniciar_servidor(porta, host="127.0.0.1"):
+    """
+    Servidor HTTP em uma thread com /metrics (Prometheus) e /metrics.json.
+    Retorna o servidor (use shutdown() para parar).
+    """
+    servidor = ThreadingHTTPServer((host, porta), _Handler)
+    threading.Thread(target=servidor.serve_forever, name="servidor-metricas", daemon=True).start()
+    return servidor
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _rotulo(nome):
+    return nome.replace("\\", "\\\\").replace('"', '\\"')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        caminho = self.path.split("?", 1)[0]
+        if caminho == "/metrics":
+            corpo, tipo = exportar_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif caminho == "/metrics.json":
+            corpo, tipo = exportar_json(), "application/json; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        dados = corpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args):
+        pass
@@ -0,0 +1,215 @@
+# =============================================
+# Script: json_stream.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Leitura incremental de listas JSON direto para colunas tipadas (NumPy)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import codecs
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+import schema
+
+# =============================================
+# Configurações
+# =============================================
+
+TAMANHO_LOTE = 256  # Elementos decodificados mantidos antes de irem para as colunas
+
+_BRANCOS = re.compile(r"[ \t\n\r]*")
+_SEPARADORES = re.compile(r"[ \t\n\r,]*")
+_FIM_ESCALAR = " \t\n\r,]"
+
+# =============================================
+# Leitura incremental
+# =============================================
+
+def iterar_objetos(blocos):
+    """
+    Percorre uma lista JSON (`[{...}, {...}]`) chegando em blocos de bytes e
+    devolve um elemento por vez. Só o elemento atual e o trecho ainda não
+    lido ficam em memória, nunca a lista inteira.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    ler_valor = json.JSONDecoder().scan_once
+    texto, posicao = "", 0
+    dentro_da_lista = terminou = False
+
+    for bloco in blocos:
+        texto = texto[posicao:] + decodificador.decode(bloco)
+        posicao = 0
+
+        while not terminou:
+            posicao = (_SEPARADORES if dentro_da_lista else _BRANCOS).match(texto, posicao).end()
+            if posicao >= len(texto):
+                break
+
+            if not dentro_da_lista:
+                if texto[posicao] != "[":
+                    raise ValueError(f"Resposta não é uma lista JSON: {texto[posicao:posicao + 80]!r}")
+                dentro_da_lista = True
+                posicao += 1
+                continue
+
+            if texto[posicao] == "]":
+                terminou = True
+                posicao += 1
+                break
+
+            try:
+                elemento, fim = ler_valor(texto, posicao)
+            except (json.JSONDecodeError, StopIteration):
+                break  # Elemento cortado no fim do bloco: espera o próximo
+            if not isinstance(elemento, (dict, list, str)) and (fim == len(texto) or texto[fim] not in _FIM_ESCALAR):
+                break  # Número cortado no fim do bloco ("1.5" chegando como "1."): espera o próximo
+            posicao = fim
+            yield elemento
+
+    texto = texto[posicao:] + decodificador.decode(b"", final=True)
+    if not terminou or texto.strip():
+        raise ValueError("Lista JSON incompleta ou com conteúdo após o fim.")
+
+# =============================================
+# ColunasTipadas
+# =============================================
+
+class ColunasTipadas:
+    """
+    Buffers pré-alocados, um por campo, no dtype do esquema (schema.py):
+    float64 com NaN para ausentes, Int64 como valores + máscara e textos em
+    arrays de objetos. Crescem dobrando quando a capacidade acaba.
+    """
+
+    def __init__(self, campos=schema.CAMPOS, capacidade=256):
+        self.campos = list(campos)
+        self.tamanho = 0
+        self._tipos = {campo: _tipo_buffer(campo) for campo in self.campos}
+        self._buffers = {campo: self._alocar(campo, max(capacidade, 1)) for campo in self.campos}
+        self._mascaras = {
+            campo: np.zeros(max(capacidade, 1), dtype=bool)
+            for campo in self.campos if self._tipos[campo] == "int64"
+        }
+
+    def adicionar(self, objetos):
+        """
+        Copia os campos de um lote de elementos da resposta para os buffers,
+        uma coluna por vez (ausentes viram NaN, máscara ou NA).
+        """
+        inicio, fim = self.tamanho, self.tamanho + len(objetos)
+        while fim > self.capacidade:
+            self._crescer()
+
+        for campo in self.campos:
+            valores = [objeto.get(campo) for objeto in objetos]
+            tipo = self._tipos[campo]
+            if tipo == "int64":
+                ausentes = [valor is None for valor in valores]
+                self._mascaras[campo][inicio:fim] = ausentes
+                if any(ausentes):
+                    valores = [0 if valor is None else valor for valor in valores]
+            elif tipo == "string":
+                valores = [pd.NA if valor is None else valor if isinstance(valor, str) else str(valor) for valor in valores]
+            # float64: o NumPy converte None em NaN na atribuição
+            self._buffers[campo][inicio:fim] = valores
+        self.tamanho = fim
+
+    @property
+    def capacidade(self):
+        return len(next(iter(self._buffers.values())))
+
+    def colunas(self):
+        """
+        {campo: array} com as linhas preenchidas (fatias dos buffers, sem cópia).
+        """
+        resultado = {}
+        for campo in self.campos:
+            dados = self._buffers[campo][:self.tamanho]
+            if self._tipos[campo] == "int64":
+                dados = (dados, self._mascaras[campo][:self.tamanho])
+            resultado[campo] = dados
+        return resultado
+
+    def _alocar(self, campo, capacidade):
+        tipo = self._tipos[campo]
+        if tipo in ("float64", "int64"):
+            return np.empty(capacidade, dtype=tipo)
+        return np.empty(capacidade, dtype=object)
+
+    def _crescer(self):
+        for campo, buffer in self._buffers.items():
+            novo = self._alocar(campo, 2 * len(buffer))
+            novo[:len(buffer)] = buffer
+            self._buffers[campo] = novo
+        for campo, mascara in self._mascaras.items():
+            nova = np.zeros(2 * len(mascara), dtype=bool)
+            nova[:len(mascara)] = mascara
+            self._mascaras[campo] = nova
+
+# =============================================
+# Funções
+# =============================================
+
+def ler_colunas(blocos, campos=schema.CAMPOS, capacidade=256):
+    """
+    Lê uma lista JSON em blocos direto para ColunasTipadas. Só um lote de
+    até TAMANHO_LOTE elementos decodificados existe por vez.
+    """
+    colunas = ColunasTipadas(campos, capacidade)
+    lote = []
+    for objeto in iterar_objetos(blocos):
+        lote.append(objeto)
+        if len(lote) == TAMANHO_LOTE:
+            colunas.adicionar(lote)
+            lote.clear()
+    if lote:
+        colunas.adicionar(lote)
+    return colunas
+
+
+def para_dataframe(partes, campos=schema.CAMPOS):
+    """
+    Junta as colunas de uma ou mais leituras (ex.: páginas) em um DataFrame.
+    Com uma única parte, o DataFrame usa os próprios buffers (sem cópia);
+    com várias, cada coluna é concatenada uma única vez.
+    """
+    partes = [parte.colunas() for parte in partes]
+    dados = {}
+    for campo in campos:
+        pedacos = [parte[campo] for parte in partes]
+        if _tipo_buffer(campo) == "int64":
+            valores = _juntar([p[0] for p in pedacos], "int64")
+            mascara = _juntar([p[1] for p in pedacos], bool)
+            dados[campo] = pd.arrays.IntegerArray(valores, mascara)
+        elif _tipo_buffer(campo) == "string":
+            dados[campo] = pd.arrays.StringArray(_juntar(pedacos, object))
+        else:
+            dados[campo] = _juntar(pedacos, _tipo_buffer(campo))
+    return pd.DataFrame(dados, columns=list(campos), copy=False)
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _tipo_buffer(campo):
+    coluna = schema.POR_CAMPO.get(campo)
+    if coluna is None:
+        return "object"
+    if coluna.dtype == "Int64":
+        return "int64"
+    if coluna.dtype in ("float64", "string"):
+        return coluna.dtype
+    return "object"  # Datas ficam como texto e são convertidas em schema.aplicar_tipos
+
+
+def _juntar(pedacos, dtype):
+    if len(pedacos) == 1:
+        return pedacos[0]
+    if not pedacos:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(pedacos)
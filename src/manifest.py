@@ -0,0 +1,393 @@
+# =============================================
+# Script: manifest.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Gerações publicadas atomicamente (snapshot + análise + indicadores) e seu índice
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+import shared_snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: só a trava entre threads do mesmo processo
+    fcntl = None
+
+# =============================================
+# Configurações
+# =============================================
+
+PASTA_RAW = os.path.join("data", "raw")
+NOME_MANIFESTO = "manifest.json"
+NOME_TRAVA = ".manifest.lock"
+
+# Arquivos de cada geração; análise e indicadores ficam em data/processed.
+# O snapshot também vai em Arrow IPC, mapeado pelos dashboards (shared_snapshot.py)
+ARQUIVOS = {
+    "snapshot": ("raw", "crypto_data_{id}.csv"),
+    "snapshot_arrow": ("raw", "crypto_data_{id}.arrow"),
+    "analise": ("processed", "crypto_analysis_{id}.csv"),
+    "indicadores": ("processed", "crypto_indicators_{id}.csv"),
+}
+
+# Nome dos CSVs gravados pelo fetcher (crypto_data_AAAA-MM-DD_HH-MM-SS[-ffffff].csv)
+PADRAO_ARQUIVO = re.compile(r"crypto_data_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}(?:-\d{6})?)\.csv")
+FORMATO_ID = "%Y-%m-%d_%H-%M-%S-%f"
+FORMATO_ID_ANTIGO = "%Y-%m-%d_%H-%M-%S"
+
+# Análise gravada antes das gerações (associada ao snapshot mais recente na reconstrução)
+ANALISE_ANTIGA = "crypto_analysis.csv"
+
+_lock = threading.RLock()
+_profundidade = 0  # Níveis de _travado() abertos pela thread que tem o _lock
+
+# =============================================
+# Escrita
+# =============================================
+
+def publicar_geracao(snapshot, analise=None, indicadores=None, coletado_em=None, cambio=None, pasta=PASTA_RAW):
+    """
+    Publica uma geração: cada arquivo é gravado por inteiro (temporário,
+    fsync e rename) e só depois a entrada entra no manifesto, que também é
+    trocado por rename. Quem lê vê a geração anterior ou a nova completa.
+    A tabela de câmbio ({divisa: fator}), pequena, vai na própria entrada.
+    Retorna a entrada publicada.
+    """
+    coletado_em = coletado_em or datetime.now()
+    id_geracao = coletado_em.strftime(FORMATO_ID)
+
+    entrada = {
+        "id": id_geracao,
+        "timestamp": coletado_em.isoformat(timespec="seconds"),
+        "linhas": int(len(snapshot)),
+    }
+    if cambio:
+        entrada["cambio"] = {divisa: float(fator) for divisa, fator in cambio.items()}
+    entrada.update(_gravar_tabelas(
+        pasta, id_geracao,
+        snapshot=snapshot, snapshot_arrow=snapshot, analise=analise, indicadores=indicadores
+    ))
+
+    with _travado(pasta):
+        snapshots = [s for s in _ler(pasta)["snapshots"] if s["id"] != id_geracao]
+        snapshots.append(entrada)
+        snapshots.sort(key=lambda s: s["id"])
+        _gravar(pasta, snapshots)
+
+    return _resolver(pasta, entrada)
+
+
+def anexar_a_geracao(id_geracao=None, analise=None, indicadores=None, pasta=PASTA_RAW):
+    """
+    Acrescenta análise e/ou indicadores a uma geração já publicada (a mais
+    recente por padrão), publicando uma nova versão da entrada.
+    """
+    with _travado(pasta):
+        snapshots = _ler(pasta)["snapshots"]
+        if not snapshots:
+            raise FileNotFoundError("Nenhum snapshot publicado em 'data/raw/'.")
+        posicao = len(snapshots) - 1 if id_geracao is None else next(
+            (i for i, s in enumerate(snapshots) if s["id"] == id_geracao), None
+        )
+        if posicao is None:
+            raise KeyError(f"Geração {id_geracao} não está no manifesto.")
+
+        entrada = dict(snapshots[posicao])
+        entrada.update(_gravar_tabelas(pasta, entrada["id"], analise=analise, indicadores=indicadores))
+        snapshots[posicao] = entrada
+        _gravar(pasta, snapshots)
+
+    return _resolver(pasta, entrada)
+
+
+def podar(manter, pasta=PASTA_RAW):
+    """
+    Deixa no manifesto só as `manter` gerações mais recentes e apaga os
+    arquivos das que saíram, além de sobras de publicações interrompidas
+    mais antigas que a geração mais velha mantida. Retorna as entradas removidas.
+    """
+    with _travado(pasta):
+        snapshots = _ler(pasta)["snapshots"]
+        removidos = []
+        if len(snapshots) > manter:
+            removidos, snapshots = snapshots[:-manter], snapshots[-manter:]
+            _gravar(pasta, snapshots)
+
+    removidos = [_resolver(pasta, s) for s in removidos]
+    for entrada in removidos:
+        for papel in ARQUIVOS:
+            _remover(entrada.get(f"caminho_{papel}"))
+
+    if snapshots:
+        _remover_orfaos(pasta, snapshots)
+
+    return removidos
+
+# =============================================
+# Leitura
+# =============================================
+
+def ultima_geracao(exigir=None, pasta=PASTA_RAW):
+    """
+    Entrada da geração mais recente (ou None), com os caminhos resolvidos.
+    Com `exigir` ("analise" ou "indicadores"), a mais recente que tem esse
+    arquivo. Lê só o manifesto, sem listar a pasta.
+    """
+    conteudo = _ler(pasta)
+    if exigir is None:
+        ultimo = conteudo["ultimo"]
+    else:
+        ultimo = next((s for s in reversed(conteudo["snapshots"]) if exigir in s), None)
+    return _resolver(pasta, ultimo) if ultimo is not None else None
+
+
+def ler_geracao(ler, exigir=None, tentativas=3, pasta=PASTA_RAW):
+    """
+    Fixa uma geração e chama ler(entrada), sem travas. Os arquivos de uma
+    geração nunca são reescritos; se ela for podada no meio da leitura,
+    tenta de novo com a geração mais recente. Retorna (entrada, valor).
+    """
+    for tentativa in range(tentativas):
+        entrada = ultima_geracao(exigir, pasta)
+        if entrada is None:
+            return None, None
+        try:
+            return entrada, ler(entrada)
+        except FileNotFoundError:
+            if tentativa == tentativas - 1:
+                raise
+
+
+def publicada_em(entrada):
+    """
+    Instante (hora local, como o id) em que a geração foi publicada.
+    """
+    formato = FORMATO_ID if len(entrada["id"]) > len("AAAA-MM-DD_HH-MM-SS") else FORMATO_ID_ANTIGO
+    return datetime.strptime(entrada["id"], formato)
+
+
+def listar_snapshots(pasta=PASTA_RAW):
+    """
+    Entradas do manifesto em ordem cronológica.
+    """
+    return [_resolver(pasta, s) for s in _ler(pasta)["snapshots"]]
+
+
+def checksum(caminho):
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def verificar(entrada):
+    """
+    Confere se os arquivos da entrada ainda têm os checksums registrados.
+    """
+    try:
+        return all(
+            checksum(entrada[f"caminho_{papel}"]) == entrada[f"sha256_{papel}"]
+            for papel in ARQUIVOS if papel in entrada
+        )
+    except FileNotFoundError:
+        return False
+
+
+def gravar_atomico(caminho, escrever):
+    """
+    escrever(temporario) grava o conteúdo; depois fsync, rename sobre o
+    destino e fsync da pasta. Uma queda no meio deixa só o temporário oculto.
+    """
+    pasta, nome = os.path.split(caminho)
+    os.makedirs(pasta or ".", exist_ok=True)
+    temporario = os.path.join(pasta, f".{nome}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        escrever(temporario)
+        with open(temporario, "rb+") as arquivo:
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+    except BaseException:
+        _remover(temporario)
+        raise
+    _fsync_pasta(pasta)
+
+def travado(pasta=PASTA_RAW):
+    """
+    A trava de escrita do manifesto para uma operação inteira: o agendador
+    a segura durante a atualização para ser o único escritor do host. As
+    funções deste módulo chamadas dentro dela reaproveitam a trava.
+    """
+    return _travado(pasta)
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _gravar_tabelas(pasta, id_geracao, **tabelas):
+    """
+    Grava as tabelas informadas da geração e devolve os campos da entrada
+    (arquivo e checksum de cada papel).
+    """
+    raiz = os.path.dirname(pasta)
+    campos = {}
+    for papel, df in tabelas.items():
+        if df is None:
+            continue
+        subpasta, modelo = ARQUIVOS[papel]
+        relativo = os.path.join(subpasta, modelo.format(id=id_geracao))
+        caminho = os.path.join(raiz, relativo)
+        if caminho.endswith(".arrow"):
+            gravar_atomico(caminho, lambda temporario, df=df: shared_snapshot.gravar_arrow(df, temporario))
+        else:
+            gravar_atomico(caminho, lambda temporario, df=df: df.to_csv(temporario, index=False))
+        campos[papel] = relativo
+        campos[f"sha256_{papel}"] = checksum(caminho)
+    return campos
+
+
+def _resolver(pasta, entrada):
+    raiz = os.path.dirname(pasta)
+    resolvida = dict(entrada)
+    for papel in ARQUIVOS:
+        if papel in entrada:
+            resolvida[f"caminho_{papel}"] = os.path.join(raiz, entrada[papel])
+    resolvida["caminho"] = resolvida.get("caminho_snapshot")
+    return resolvida
+
+
+def _ler(pasta):
+    caminho = os.path.join(pasta, NOME_MANIFESTO)
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except FileNotFoundError:
+        with _travado(pasta):
+            try:
+                with open(caminho, encoding="utf-8") as arquivo:
+                    return json.load(arquivo)
+            except FileNotFoundError:
+                return _reconstruir(pasta)
+
+
+def _gravar(pasta, snapshots):
+    """
+    Grava o manifesto (temporário + rename): leitores veem o manifesto
+    antigo ou o novo, nunca um JSON pela metade.
+    """
+    conteudo = {"versao": 2, "ultimo": snapshots[-1] if snapshots else None, "snapshots": snapshots}
+
+    def escrever(temporario):
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(conteudo, arquivo, ensure_ascii=False, indent=2)
+
+    gravar_atomico(os.path.join(pasta, NOME_MANIFESTO), escrever)
+    return conteudo
+
+
+@contextlib.contextmanager
+def _travado(pasta):
+    """
+    Serializa quem altera o manifesto (threads e, onde há fcntl, processos).
+    Reentrante dentro da mesma thread. Leitores não passam por aqui.
+    """
+    global _profundidade
+    with _lock:
+        if _profundidade or fcntl is None:
+            _profundidade += 1
+            try:
+                yield
+            finally:
+                _profundidade -= 1
+            return
+
+        os.makedirs(pasta, exist_ok=True)
+        with open(os.path.join(pasta, NOME_TRAVA), "a") as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+            _profundidade += 1
+            try:
+                yield
+            finally:
+                _profundidade -= 1
+                fcntl.flock(trava, fcntl.LOCK_UN)
+
+
+def _fsync_pasta(pasta):
+    # Garante que o rename sobreviva a uma queda (não suportado no Windows)
+    if os.name == "nt":
+        return
+    descritor = os.open(pasta or ".", os.O_RDONLY)
+    try:
+        os.fsync(descritor)
+    finally:
+        os.close(descritor)
+
+
+def _remover(caminho):
+    if caminho:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(caminho)
+
+
+def _remover_orfaos(pasta, snapshots):
+    """
+    Arquivos de gerações que nunca chegaram ao manifesto (queda no meio da
+    publicação). Só os mais antigos que a geração mais velha mantida, para
+    não apagar uma publicação em andamento.
+    """
+    mais_antigo = snapshots[0]["id"]
+    referenciados = {os.path.basename(s[papel]) for s in snapshots for papel in ARQUIVOS if papel in s}
+    raiz = os.path.dirname(pasta)
+
+    for papel, (subpasta, modelo) in ARQUIVOS.items():
+        prefixo, sufixo = modelo.split("{id}")
+        diretorio = os.path.join(raiz, subpasta)
+        if not os.path.isdir(diretorio):
+            continue
+        for nome in os.listdir(diretorio):
+            if nome.startswith(prefixo) and nome.endswith(sufixo) and nome not in referenciados:
+                if nome[len(prefixo):-len(sufixo)] < mais_antigo:
+                    _remover(os.path.join(diretorio, nome))
+
+
+def _reconstruir(pasta):
+    """
+    Monta o manifesto a partir dos CSVs já existentes (pastas anteriores ao
+    manifesto). A ordem vem do instante no nome do arquivo, não do ctime.
+    """
+    if not os.path.isdir(pasta):
+        return {"versao": 2, "ultimo": None, "snapshots": []}
+
+    snapshots = []
+    for nome in sorted(os.listdir(pasta)):
+        encontrado = PADRAO_ARQUIVO.fullmatch(nome)
+        if not encontrado:
+            continue
+        caminho = os.path.join(pasta, nome)
+        with open(caminho, "rb") as arquivo:
+            linhas = max(sum(1 for _ in arquivo) - 1, 0)  # sem o cabeçalho
+        id_geracao = encontrado.group(1)
+        snapshots.append({
+            "id": id_geracao,
+            "timestamp": publicada_em({"id": id_geracao}).isoformat(timespec="seconds"),
+            "linhas": linhas,
+            "snapshot": os.path.join("raw", nome),
+            "sha256_snapshot": checksum(caminho),
+        })
+
+    # A análise única de antes das gerações vale para o snapshot mais recente
+    analise = os.path.join(os.path.dirname(pasta), "processed", ANALISE_ANTIGA)
+    if snapshots and os.path.exists(analise):
+        snapshots[-1]["analise"] = os.path.join("processed", ANALISE_ANTIGA)
+        snapshots[-1]["sha256_analise"] = checksum(analise)
+
+    return _gravar(pasta, snapshots)
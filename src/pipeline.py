@@ -0,0 +1,141 @@
+# =============================================
+# Script: pipeline.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Pipeline de atualização em processo (coleta → análise → persistência)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import alerts
+import data_fetcher
+import data_processor
+import indicators
+import instrumentation
+import manifest
+import shared_snapshot
+from analytics import AgregadorIncremental
+
+# =============================================
+# Estado do processo
+# =============================================
+
+# Mantido entre atualizações para aplicar só o que mudou de um snapshot para o outro
+_agregador = AgregadorIncremental()
+_motor_indicadores = None  # Montado a partir do histórico na primeira atualização
+_motor_alertas = None  # Regras recarregadas do banco quando outro processo as altera
+_repositorio_alertas = None
+_versao_alertas = None
+_lock = threading.Lock()
+
+# =============================================
+# TemposAtualizacao
+# =============================================
+
+@dataclass(frozen=True)
+class TemposAtualizacao:
+    """
+    Duração de cada etapa de uma atualização, em milissegundos.
+    """
+    coleta_ms: float
+    analise_ms: float
+    persistencia_ms: float
+
+    @property
+    def total_ms(self):
+        return self.coleta_ms + self.analise_ms + self.persistencia_ms
+
+# =============================================
+# Funções
+# =============================================
+
+# =============================================
+# atualizar_pipeline
+# =============================================
+def atualizar_pipeline():
+    """
+    Executa coleta, análise e persistência no mesmo processo, reaproveitando
+    os módulos já importados (pandas, requests...).
+    Retorna o DataFrame bruto, o ResumoAnalise do snapshot e os TemposAtualizacao.
+    """
+    global _motor_indicadores
+
+    with _lock:
+        comeco = time.perf_counter()
+        df = data_fetcher.fetch_crypto_data(publicar=False)
+        cotacoes = data_fetcher.obter_cotacoes()
+        fim_coleta = time.perf_counter()
+
+        _agregador.atualizar(df)
+        resultado = _agregador.resumo()
+
+        # O snapshot recém-coletado já está no histórico: na primeira vez o
+        # motor é montado a partir dele; depois só recebe o snapshot novo.
+        if _motor_indicadores is None:
+            inicio = datetime.now(timezone.utc) - timedelta(days=indicators.DIAS_AQUECIMENTO)
+            _motor_indicadores, tabela = indicators.carregar_do_historico(inicio=inicio)
+        else:
+            tabela = None
+        if tabela is None:
+            tabela = _motor_indicadores.adicionar_snapshot(df)
+        avaliacao = _avaliar_alertas(df)
+        fim_analise = time.perf_counter()
+
+        # Snapshot, análise e indicadores ficam visíveis juntos, como uma geração
+        entrada = manifest.publicar_geracao(
+            df,
+            analise=data_processor.tabela_analise(resultado),
+            indicadores=data_processor.tabela_indicadores(tabela, df),
+            cambio=cotacoes
+        )
+        data_fetcher.manter_apenas_ultimos_arquivos()
+        _repositorio_alertas.gravar(avaliacao)
+
+        # Quem guarda o snapshot (agendador, sessões) passa a usar o Arrow
+        # mapeado da geração, compartilhado com os outros processos, e a
+        # cópia coletada no heap pode ser liberada
+        df = shared_snapshot.ler_snapshot(entrada)
+        fim = time.perf_counter()
+
+    tempos = TemposAtualizacao(
+        coleta_ms=(fim_coleta - comeco) * 1000,
+        analise_ms=(fim_analise - fim_coleta) * 1000,
+        persistencia_ms=(fim - fim_analise) * 1000
+    )
+    instrumentation.registrar("pipeline.coleta", tempos.coleta_ms / 1000)
+    instrumentation.registrar("pipeline.analise", tempos.analise_ms / 1000)
+    instrumentation.registrar("pipeline.persistencia", tempos.persistencia_ms / 1000)
+    return df, resultado, tempos
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _avaliar_alertas(df):
+    """
+    Avalia as regras de alerta contra o snapshot novo. As regras só são
+    recompiladas quando o banco muda (PRAGMA data_version).
+    """
+    global _motor_alertas, _repositorio_alertas, _versao_alertas
+
+    if _repositorio_alertas is None:
+        _repositorio_alertas = alerts.RepositorioAlertas()
+    versao = _repositorio_alertas.versao()
+    if _motor_alertas is None:
+        _motor_alertas = alerts.MotorAlertas(_repositorio_alertas.carregar_regras())
+    elif versao != _versao_alertas:
+        _motor_alertas.definir_regras(_repositorio_alertas.carregar_regras())
+    _versao_alertas = versao
+    return _motor_alertas.avaliar(df)
+
+# =============================================
+# Execução principal (uso via cron)
+# =============================================
+
+if __name__ == "__main__":
+    atualizar_pipeline()
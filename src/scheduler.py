@@ -0,0 +1,224 @@
+# =============================================
+# Script: scheduler.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Agendador de atualização em segundo plano (um por processo, um escritor por host)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import random
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+import cache
+import manifest
+import pipeline
+import shared_snapshot
+from pipeline import TemposAtualizacao
+from analytics import ResumoAnalise
+from view_models import VisoesPaginas
+
+# =============================================
+# Configurações
+# =============================================
+
+INTERVALO_PADRAO = 300   # Segundos entre atualizações
+JITTER_PADRAO = 0.1      # Variação aleatória de ±10% no intervalo
+BACKOFF_MAXIMO = 1800    # Espera máxima após falhas consecutivas
+
+# =============================================
+# Snapshot
+# =============================================
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Resultado imutável de uma atualização. É publicado trocando a referência
+    inteira, então quem lê sempre vê um snapshot completo. `visoes` traz
+    os dados das páginas já prontos, montados na thread de atualização;
+    `tempos`, quanto durou cada etapa da atualização que o gerou (None se
+    a geração foi publicada por outro processo e só adotada por este);
+    `geracao`, o id da geração no manifesto.
+    """
+    versao: int
+    df: pd.DataFrame
+    resultado: ResumoAnalise
+    gerado_em: datetime
+    visoes: VisoesPaginas
+    tempos: Optional[TemposAtualizacao]
+    geracao: Optional[str] = None
+
+# =============================================
+# AgendadorAtualizacao
+# =============================================
+
+class AgendadorAtualizacao:
+    """
+    Executa o pipeline periodicamente em uma thread e publica o snapshot mais
+    recente. Pedidos simultâneos de atualização são agrupados em uma única
+    execução em andamento.
+
+    Cada processo do servidor tem o seu agendador, mas a atualização roda
+    com a trava do manifesto: um processo coleta e publica por vez. Quem
+    pega a trava e encontra uma geração recente o bastante, publicada por
+    outro processo enquanto esperava, adota essa geração em vez de coletar
+    de novo, então o host faz uma coleta por intervalo, não uma por processo.
+    """
+
+    def __init__(
+        self,
+        intervalo: float = INTERVALO_PADRAO,
+        jitter: float = JITTER_PADRAO,
+        backoff_maximo: float = BACKOFF_MAXIMO,
+        funcao: Callable[[], Any] = pipeline.atualizar_pipeline
+    ):
+        self.intervalo = intervalo
+        self.jitter = jitter
+        self.backoff_maximo = backoff_maximo
+        self._funcao = funcao
+
+        self._snapshot: Optional[Snapshot] = None
+        self._lock = threading.Lock()
+        self._em_andamento: Optional[Future] = None
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.falhas_consecutivas = 0
+        self.ultimo_erro: Optional[BaseException] = None
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        """
+        Snapshot mais recente (leitura sem bloqueio).
+        """
+        return self._snapshot
+
+    def acompanhar(self) -> Optional[Snapshot]:
+        """
+        Snapshot da geração mais recente do manifesto. Se outro processo
+        publicou uma geração mais nova que a deste agendador, ela é adotada
+        já (mapeada e com as visões montadas uma vez por processo), sem
+        esperar o próximo ciclo. Custa uma leitura do manifesto.
+        """
+        entrada = manifest.ultima_geracao(exigir="analise")
+        atual = self._snapshot
+        if entrada is None or (atual is not None and atual.geracao is not None and entrada["id"] <= atual.geracao):
+            return atual
+        try:
+            adotado = self._adotar(entrada)
+        except FileNotFoundError:
+            return atual  # Podada no meio da leitura: fica a atual até a próxima
+        with self._lock:
+            if self._snapshot is None or (self._snapshot.geracao or "") < entrada["id"]:
+                self._snapshot = adotado
+            return self._snapshot
+
+    def iniciar(self):
+        if self._thread is not None or self.intervalo <= 0:
+            return
+        self._thread = threading.Thread(target=self._loop, name="agendador-atualizacao", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def atualizar_agora(self, esperar: bool = True, validade: float = 0.0):
+        """
+        Dispara uma atualização ou se junta à que já está em andamento.
+        Uma geração publicada depois do pedido, ou há menos de `validade`
+        segundos, é adotada em vez de coletada de novo.
+        Retorna o Snapshot publicado (ou o Future, se esperar=False).
+        """
+        with self._lock:
+            dono = self._em_andamento is None
+            if dono:
+                self._em_andamento = Future()
+            futuro = self._em_andamento
+
+        if dono:
+            self._executar(futuro, datetime.now() - timedelta(seconds=validade))
+
+        return futuro.result() if esperar else futuro
+
+    def _executar(self, futuro: Future, recente_desde: datetime):
+        try:
+            with manifest.travado():
+                entrada = manifest.ultima_geracao(exigir="analise")
+                adotar = entrada is not None and manifest.publicada_em(entrada) >= recente_desde
+                if not adotar:
+                    df, resultado, tempos = self._funcao()
+
+            # As visões são montadas fora da trava, sem segurar os outros processos
+            if adotar:
+                snapshot = self._adotar(entrada)
+            else:
+                snapshot = Snapshot(
+                    self._proxima_versao(), df, resultado, datetime.now(), VisoesPaginas(df, resultado), tempos,
+                    df.attrs.get("geracao")
+                )
+            self._snapshot = snapshot
+            self.falhas_consecutivas = 0
+            self.ultimo_erro = None
+            futuro.set_result(self._snapshot)
+        except Exception as e:
+            self.falhas_consecutivas += 1
+            self.ultimo_erro = e
+            futuro.set_exception(e)
+        finally:
+            with self._lock:
+                self._em_andamento = None
+
+    def _adotar(self, entrada) -> Snapshot:
+        """
+        Snapshot de uma geração já publicada (por este ou outro processo).
+        """
+        resultado, df, visoes = carregar_geracao(entrada)
+        return Snapshot(self._proxima_versao(), df, resultado, manifest.publicada_em(entrada), visoes, None, entrada["id"])
+
+    def _proxima_versao(self) -> int:
+        return self._snapshot.versao + 1 if self._snapshot else 1
+
+    def _proxima_espera(self) -> float:
+        espera = self.intervalo
+        if self.falhas_consecutivas:
+            espera = min(self.intervalo * 2 ** self.falhas_consecutivas, self.backoff_maximo)
+        return espera * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _loop(self):
+        espera = 0.0  # Primeira coleta logo ao iniciar o servidor
+        # Gerações mais novas que o menor intervalo possível ainda valem por este ciclo
+        validade = self.intervalo * (1 - self.jitter)
+        while not self._parar.wait(espera):
+            try:
+                self.atualizar_agora(validade=validade)
+            except Exception:
+                pass  # Erro já registrado em ultimo_erro; tenta de novo com backoff
+            espera = self._proxima_espera()
+
+# =============================================
+# Funções
+# =============================================
+
+def carregar_geracao(entrada):
+    """
+    (ResumoAnalise, snapshot mapeado, VisoesPaginas) de uma geração
+    publicada, montados uma vez por processo e geração: todas as sessões
+    (e o agendador, ao adotar a geração) recebem os mesmos objetos.
+    """
+    def montar():
+        resultado = ResumoAnalise.de_registro(pd.read_csv(entrada["caminho_analise"]).iloc[0].to_dict())
+        df = shared_snapshot.ler_snapshot(entrada)
+        return resultado, df, VisoesPaginas(df, resultado)
+
+    return cache.carregar_com_cache(
+        "geracao", (entrada["id"], entrada["sha256_snapshot"], entrada["sha256_analise"]), montar
+    )
@@ -0,0 +1,116 @@
+# =============================================
+# Script: schema.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Esquema único das colunas de moedas (campo da API, rótulo, tipo e formato)
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+
+# =============================================
+# Coluna
+# =============================================
+
+@dataclass(frozen=True)
+class Coluna:
+    """
+    Uma coluna dos snapshots. Os dados circulam sempre com o nome do `campo`
+    e o `dtype` declarado aqui; `rotulo` e `formato` só são usados na exibição.
+    """
+    campo: str
+    rotulo: str
+    dtype: str
+    formato: Optional[str] = None  # "moeda", "quantidade", "percentual" ou "data"
+
+# =============================================
+# Configurações
+# =============================================
+
+# Colunas com formato "moeda" recebem o símbolo da divisa no rótulo, ex.: "Preço Atual (US$)"
+COLUNAS = [
+    Coluna("id", "Nome Técnico", "string"),
+    Coluna("symbol", "Símbolo", "string"),
+    Coluna("name", "Nome da Moeda", "string"),
+    Coluna("current_price", "Preço Atual", "float64", "moeda"),
+    Coluna("price_change_percentage_24h", "Variação 24h (%)", "float64", "percentual"),
+    Coluna("market_cap", "Valor de Mercado", "float64", "moeda"),
+    Coluna("market_cap_rank", "Ranking de Mercado", "Int64"),
+    Coluna("total_volume", "Volume Total", "float64", "moeda"),
+    Coluna("circulating_supply", "Quantidade Circulante", "float64", "quantidade"),
+    Coluna("ath", "Preço Máximo Histórico", "float64", "moeda"),
+    Coluna("atl", "Preço Mínimo Histórico", "float64", "moeda"),
+    Coluna("last_updated", "Última Atualização", "datetime64[us, UTC]", "data"),
+]
+
+# Divisas de exibição (código da CoinGecko -> símbolo). A coleta é sempre na
+# DIVISA_BASE; as demais são derivadas pela tabela de câmbio (currency.py)
+DIVISA_BASE = "usd"
+SIMBOLOS_DIVISA = {"usd": "US$", "brl": "R$", "eur": "€"}
+
+CAMPOS = [coluna.campo for coluna in COLUNAS]
+POR_CAMPO = {coluna.campo: coluna for coluna in COLUNAS}
+
+_ROTULOS_POR_DIVISA = {
+    divisa: {
+        coluna.campo: f"{coluna.rotulo} ({simbolo})" if coluna.formato == "moeda" else coluna.rotulo
+        for coluna in COLUNAS
+    }
+    for divisa, simbolo in SIMBOLOS_DIVISA.items()
+}
+ROTULOS = _ROTULOS_POR_DIVISA[DIVISA_BASE]
+
+_TIPOS_ARROW = {
+    "string": pa.string(),
+    "float64": pa.float64(),
+    "Int64": pa.int64(),
+    "datetime64[us, UTC]": pa.timestamp("us", tz="UTC"),
+}
+
+ESQUEMA_ARROW = pa.schema([(coluna.campo, _TIPOS_ARROW[coluna.dtype]) for coluna in COLUNAS])
+
+# =============================================
+# Funções
+# =============================================
+
+def aplicar_tipos(df):
+    """
+    Garante as colunas do esquema, na ordem e com os dtypes declarados.
+    Campos ausentes viram colunas vazias; campos extras são mantidos no fim.
+    """
+    df = df.copy(deep=False)  # As colunas convertidas são substituídas, não alteradas no lugar
+    for coluna in COLUNAS:
+        if coluna.campo not in df:
+            df[coluna.campo] = None
+        if df[coluna.campo].dtype == coluna.dtype:
+            continue  # Já no tipo certo: mantém a coluna (e o buffer) como está
+        if coluna.dtype.startswith("datetime"):
+            # Microssegundos, como no Arrow e no Parquet: o snapshot mapeado é lido sem conversão
+            df[coluna.campo] = pd.to_datetime(df[coluna.campo], utc=True, format="ISO8601").dt.as_unit("us")
+        else:
+            df[coluna.campo] = df[coluna.campo].astype(coluna.dtype)
+
+    extras = [campo for campo in df.columns if campo not in POR_CAMPO]
+    if list(df.columns) == CAMPOS + extras:
+        return df
+    return df[CAMPOS + extras]
+
+
+def rotulos(divisa=DIVISA_BASE):
+    """
+    {campo: rótulo} com o símbolo da divisa nas colunas monetárias.
+    """
+    return _ROTULOS_POR_DIVISA[divisa]
+
+
+def rotulo(campo, divisa=DIVISA_BASE):
+    return rotulos(divisa).get(campo, campo)
+
+
+def colunas_com_formato(*formatos):
+    return [coluna.campo for coluna in COLUNAS if coluna.formato in formatos]
@@ -0,0 +1,86 @@
+# =============================================
+# Script: shared_snapshot.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Snapshot em Arrow IPC mapeado em memória, compartilhado por sessões e processos
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import pandas as pd
+import pyarrow as pa
+
+import instrumentation
+import schema
+
+# =============================================
+# Configurações
+# =============================================
+
+# Colunas de texto viram ArrowStringArray (apontam para o arquivo mapeado);
+# Int64 precisa montar a máscara do pandas, as demais são lidas sem cópia
+TIPOS_PANDAS = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.int64(): pd.Int64Dtype(),
+}
+
+# =============================================
+# Escrita
+# =============================================
+
+def gravar_arrow(df, caminho):
+    """
+    Grava o DataFrame em Arrow IPC (formato de arquivo, sem compressão),
+    que pode ser mapeado direto do page cache. Colunas float guardam NaN
+    como valor, não como nulo, para o pandas ler o buffer sem copiar.
+    """
+    colunas = {}
+    for campo in df.columns:
+        serie = df[campo]
+        if pd.api.types.is_float_dtype(serie.dtype):
+            colunas[campo] = pa.array(serie.to_numpy(), from_pandas=False)
+        else:
+            colunas[campo] = pa.Array.from_pandas(serie)
+    tabela = pa.table(colunas)
+
+    with pa.OSFile(caminho, "wb") as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+
+# =============================================
+# Leitura
+# =============================================
+
+def mapear(caminho):
+    """
+    Tabela Arrow cujos buffers apontam para o arquivo mapeado em memória.
+    As páginas ficam no page cache do sistema e são compartilhadas por
+    todos os processos que mapeiam o mesmo arquivo; nada é copiado para o heap.
+    """
+    return pa.ipc.open_file(pa.memory_map(caminho, "r")).read_all()
+
+
+def mapear_dataframe(caminho):
+    """
+    DataFrame sobre o arquivo mapeado (somente leitura). Colunas float e de
+    data usam o buffer do arquivo, textos ficam como string[pyarrow].
+    """
+    return mapear(caminho).to_pandas(split_blocks=True, types_mapper=TIPOS_PANDAS.get)
+
+
+@instrumentation.cronometrar("snapshot.leitura")
+def ler_snapshot(entrada):
+    """
+    Snapshot de uma geração do manifesto: mapeado do Arrow quando a geração
+    o tem; gerações antigas (só CSV) são lidas e tipadas como antes.
+    """
+    if "caminho_snapshot_arrow" in entrada:
+        instrumentation.contar("snapshot.arrow")
+        df = schema.aplicar_tipos(mapear_dataframe(entrada["caminho_snapshot_arrow"]))
+    else:
+        instrumentation.contar("snapshot.csv")
+        df = schema.aplicar_tipos(pd.read_csv(entrada["caminho"]))
+
+    # Tabela de câmbio da geração, usada nas conversões de divisa (currency.py)
+    df.attrs["cambio"] = dict(entrada.get("cambio") or {schema.DIVISA_BASE: 1.0})
+    df.attrs["geracao"] = entrada["id"]
+    return df
@@ -0,0 +1,380 @@
+# =============================================
+# Script: streaming.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Modo ao vivo: fontes de ticks (SSE, replay de CSVs), tabela do último
+#            tick por moeda e medição de latência tick → tela
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import codecs
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+import manifest
+
+# =============================================
+# Configurações
+# =============================================
+
+# Campos mantidos por moeda na tabela ao vivo (um tick pode trazer só parte deles)
+CAMPOS_AO_VIVO = [
+    "id", "symbol", "name", "current_price", "price_change_percentage_24h",
+    "market_cap", "market_cap_rank", "total_volume",
+]
+
+INTERVALO_REPLAY = 1.0     # Segundos entre snapshots reproduzidos
+RECONEXAO_BASE = 0.5       # Espera inicial antes de reconectar ao feed (dobra a cada falha)
+RECONEXAO_MAXIMA = 30      # Espera máxima entre reconexões
+AMOSTRAS_LATENCIA = 10_000 # Medições guardadas por etapa (as mais recentes)
+TAMANHO_BLOCO_SSE = 64 * 1024
+
+_FIM_LINHA = re.compile(r"\r\n|\r|\n")
+
+# =============================================
+# Fontes de ticks
+# =============================================
+
+class FonteTicks:
+    """
+    Interface das fontes do modo ao vivo. `lotes(parar)` produz listas de
+    ticks (dicts com "id", campos de CAMPOS_AO_VIVO e, opcionalmente, "ts":
+    instante de emissão em segundos desde a época) até `parar` ser acionado.
+    """
+
+    def lotes(self, parar: threading.Event) -> Iterator[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+
+class FonteSSE(FonteTicks):
+    """
+    Feed Server-Sent Events. Cada evento traz um tick ou uma lista de ticks
+    em JSON no campo `data`. Reconecta com backoff e Last-Event-ID.
+    """
+
+    def __init__(self, url, timeout=(3.05, 30), session=None):
+        self.url = url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.ultimo_evento = None
+        self.reconexoes = 0
+
+    def lotes(self, parar):
+        falhas = 0
+        espera_servidor = None
+        while not parar.is_set():
+            headers = {"Accept": "text/event-stream"}
+            if self.ultimo_evento is not None:
+                headers["Last-Event-ID"] = self.ultimo_evento
+            try:
+                with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    falhas = 0
+                    # read1 devolve o que já chegou, sem esperar encher um bloco de tamanho fixo
+                    blocos = iter(lambda: response.raw.read1(TAMANHO_BLOCO_SSE), b"")
+                    for campo, valor in _eventos_sse(_linhas(blocos)):
+                        if campo == "id":
+                            self.ultimo_evento = valor
+                        elif campo == "retry" and valor.isdigit():
+                            espera_servidor = int(valor) / 1000
+                        elif campo == "data":
+                            dados = json.loads(valor)
+                            yield dados if isinstance(dados, list) else [dados]
+                        if parar.is_set():
+                            return
+            except (requests.RequestException, ValueError):
+                falhas += 1
+
+            # Conexão encerrada ou com erro: reconecta
+            self.reconexoes += 1
+            espera = espera_servidor if espera_servidor is not None else min(
+                RECONEXAO_BASE * 2 ** max(falhas - 1, 0), RECONEXAO_MAXIMA
+            )
+            parar.wait(espera * random.uniform(0.5, 1.0))
+
+
+class FonteReplayCSV(FonteTicks):
+    """
+    Reproduz snapshots CSV gravados (por padrão, os das gerações do
+    manifesto, do mais antigo ao mais recente), um a cada `intervalo`
+    segundos. Serve para testar o modo ao vivo sem depender da rede.
+    """
+
+    def __init__(self, caminhos=None, intervalo=INTERVALO_REPLAY, repetir=True, pasta=manifest.PASTA_RAW):
+        self.caminhos = caminhos
+        self.intervalo = intervalo
+        self.repetir = repetir
+        self.pasta = pasta
+
+    def lotes(self, parar):
+        while not parar.is_set():
+            caminhos = self.caminhos or [entrada["caminho"] for entrada in manifest.listar_snapshots(self.pasta)]
+            if not caminhos:
+                parar.wait(self.intervalo)
+                continue
+
+            for caminho in caminhos:
+                df = pd.read_csv(caminho, usecols=lambda coluna: coluna in CAMPOS_AO_VIVO)
+                ticks = df.astype(object).where(df.notna(), None).to_dict("records")
+                agora = time.time()
+                for tick in ticks:
+                    tick["ts"] = agora
+                yield ticks
+                if parar.wait(self.intervalo):
+                    return
+
+            if not self.repetir:
+                return
+
+# =============================================
+# TabelaTicks
+# =============================================
+
+@dataclass(frozen=True)
+class LinhaTick:
+    versao: int
+    valores: Dict[str, Any]
+    ts_origem: float
+    recebido_em: float
+
+
+class TabelaTicks:
+    """
+    Último tick de cada moeda, em memória. Toda linha alterada recebe a
+    próxima versão e vai para o fim da ordem, então as alterações desde uma
+    versão são lidas do fim sem percorrer a tabela inteira. Ticks que não
+    mudam nenhum valor são ignorados.
+    """
+
+    def __init__(self, campos=CAMPOS_AO_VIVO):
+        self.campos = list(campos)
+        self.versao = 0
+        self._linhas: "OrderedDict[str, LinhaTick]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._linhas)
+
+    def aplicar(self, ticks, recebido_em=None):
+        """
+        Aplica um lote de ticks. Retorna quantas linhas mudaram.
+        """
+        recebido_em = recebido_em or time.time()
+        alteradas = 0
+        with self._lock:
+            for tick in ticks:
+                moeda = tick.get("id")
+                if moeda is None:
+                    continue
+                atual = self._linhas.get(moeda)
+                novos = {campo: tick[campo] for campo in self.campos if campo in tick}
+                if atual is not None:
+                    if all(_iguais(atual.valores.get(campo), valor) for campo, valor in novos.items()):
+                        continue
+                    novos = {**atual.valores, **novos}
+
+                self.versao += 1
+                self._linhas[moeda] = LinhaTick(self.versao, novos, tick.get("ts", recebido_em), recebido_em)
+                self._linhas.move_to_end(moeda)
+                alteradas += 1
+        return alteradas
+
+    def alteracoes_desde(self, versao):
+        """
+        (versão atual, DataFrame indexado por id com as linhas alteradas
+        depois de `versao`, mais ts_origem e recebido_em). Com versao=0, é a
+        tabela inteira.
+        """
+        linhas = []
+        with self._lock:
+            atual = self.versao
+            for moeda in reversed(self._linhas):
+                linha = self._linhas[moeda]
+                if linha.versao <= versao:
+                    break
+                linhas.append((moeda, linha))
+
+        df = pd.DataFrame(
+            [{**linha.valores, "ts_origem": linha.ts_origem, "recebido_em": linha.recebido_em} for _, linha in linhas],
+            index=pd.Index([moeda for moeda, _ in linhas], name="id"),
+            columns=[c for c in self.campos if c != "id"] + ["ts_origem", "recebido_em"],
+        )
+        return atual, df
+
+def aplicar_alteracoes(tabela, alteradas):
+    """
+    Atualiza a cópia de uma sessão com as linhas de alteracoes_desde():
+    troca as linhas das moedas alteradas e acrescenta as novas.
+    """
+    if tabela is None:
+        return alteradas
+    if not len(alteradas):
+        return tabela
+    return pd.concat([tabela[~tabela.index.isin(alteradas.index)], alteradas])
+
+# =============================================
+# MedidorLatencia
+# =============================================
+
+class MedidorLatencia:
+    """
+    Latências recentes por etapa, em segundos desde a emissão do tick:
+    "ingestao" (chegou à tabela) e "tela" (foi enviado a uma sessão).
+    """
+
+    def __init__(self, amostras=AMOSTRAS_LATENCIA):
+        self._amostras = {}
+        self._tamanho = amostras
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa, latencias):
+        with self._lock:
+            fila = self._amostras.setdefault(etapa, deque(maxlen=self._tamanho))
+            fila.extend(latencias)
+
+    def resumo(self):
+        """
+        {etapa: {"amostras", "p50_ms", "p95_ms", "p99_ms", "max_ms"}}
+        """
+        with self._lock:
+            copias = {etapa: np.fromiter(fila, dtype="float64") for etapa, fila in self._amostras.items()}
+        resultado = {}
+        for etapa, valores in copias.items():
+            if not len(valores):
+                continue
+            p50, p95, p99 = np.percentile(valores, [50, 95, 99]) * 1000
+            resultado[etapa] = {
+                "amostras": len(valores),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(valores.max() * 1000),
+            }
+        return resultado
+
+# =============================================
+# TransmissorTicks
+# =============================================
+
+class TransmissorTicks:
+    """
+    Consome uma fonte em uma thread e mantém a TabelaTicks atualizada. As
+    sessões leem só as linhas alteradas desde a última versão que exibiram.
+    """
+
+    def __init__(self, fonte: FonteTicks, tabela: Optional[TabelaTicks] = None):
+        self.fonte = fonte
+        self.tabela = tabela or TabelaTicks()
+        self.latencia = MedidorLatencia()
+        self.ticks_recebidos = 0
+        self.linhas_alteradas = 0
+        self.iniciado_em: Optional[float] = None
+        self.ultimo_erro: Optional[BaseException] = None
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self):
+        if self._thread is not None:
+            return
+        self.iniciado_em = time.time()
+        self._thread = threading.Thread(target=self._loop, name="transmissor-ticks", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def registrar_exibicao(self, alteradas, exibido_em=None):
+        """
+        Chamado pela sessão ao enviar as linhas alteradas para a tela.
+        """
+        exibido_em = exibido_em or time.time()
+        if len(alteradas):
+            self.latencia.registrar("tela", exibido_em - alteradas["ts_origem"].to_numpy(dtype="float64"))
+
+    def metricas(self):
+        decorrido = time.time() - self.iniciado_em if self.iniciado_em else 0.0
+        return {
+            "moedas": len(self.tabela),
+            "versao": self.tabela.versao,
+            "ticks_recebidos": self.ticks_recebidos,
+            "linhas_alteradas": self.linhas_alteradas,
+            "ticks_por_segundo": self.ticks_recebidos / decorrido if decorrido else 0.0,
+            "latencia": self.latencia.resumo(),
+            "ultimo_erro": repr(self.ultimo_erro) if self.ultimo_erro else None,
+        }
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                for lote in self.fonte.lotes(self._parar):
+                    recebido_em = time.time()
+                    self.linhas_alteradas += self.tabela.aplicar(lote, recebido_em)
+                    self.ticks_recebidos += len(lote)
+                    self.latencia.registrar("ingestao", [recebido_em - tick["ts"] for tick in lote if "ts" in tick])
+                return  # Fonte terminou (ex.: replay sem repetir)
+            except Exception as e:
+                self.ultimo_erro = e
+                self._parar.wait(RECONEXAO_BASE)
+
+# =============================================
+# Funções Auxiliares
+# =============================================
+
+def _iguais(a, b):
+    if a == b:
+        return True
+    return isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b)
+
+
+def _linhas(blocos):
+    """
+    Linhas de texto (UTF-8) de um stream de bytes, aceitando \n, \r\n ou \r.
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    resto = ""
+    for bloco in blocos:
+        texto = resto + decodificador.decode(bloco)
+        # Um \r no fim pode ser metade de um \r\n: fica para o próximo bloco
+        corte = len(texto) - 1 if texto.endswith("\r") else len(texto)
+        partes = _FIM_LINHA.split(texto[:corte])
+        resto = partes.pop() + texto[corte:]
+        yield from partes
+    if resto:
+        yield resto.rstrip("\r")
+
+
+def _eventos_sse(linhas):
+    """
+    (campo, valor) de um stream SSE; linhas `data:` do mesmo evento são
+    juntas com quebra de linha e entregues quando o evento termina.
+    """
+    dados = []
+    for linha in linhas:
+        if not linha:
+            if dados:
+                yield "data", "\n".join(dados)
+                dados = []
+            continue
+        if linha.startswith(":"):
+            continue  # Comentário / keep-alive
+        campo, _, valor = linha.partition(":")
+        valor = valor[1:] if valor.startswith(" ") else valor
+        if campo == "data":
+            dados.append(valor)
+        else:
+            yield campo, valor
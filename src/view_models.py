@@ -0,0 +1,328 @@
+# =============================================
+# Script: view_models.py
+# Projeto: CryptoPrice-Dashboard
+# Descrição: Dados prontos para exibição de cada página, montados uma vez por snapshot
+# Autor: Nathan Thomaz
+# Data de Criação: 16/10/2026
+# Versão: 1.0
+# =============================================
+
+import copy
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import currency
+import exports
+import history_store
+import instrumentation
+import schema
+from formatting import formatar_numero_br, formatar_percentual
+
+# =============================================
+# Configurações
+# =============================================
+
+# Métricas do gráfico de barras da página de gráficos
+METRICAS_GRAFICO = ["price_change_percentage_24h", "current_price", "circulating_supply"]
+
+ORDENACOES = ("Misto", "Crescente", "Decrescente")
+
+# Arquivos de exportação guardados por snapshot (os mais recentes ficam)
+MAX_EXPORTACOES = 8
+
+# Históricos de preço (moedas, período) guardados por snapshot
+MAX_HISTORICOS = 8
+
+# =============================================
+# VisoesPaginas
+# =============================================
+
+class VisoesPaginas:
+    """
+    Tudo o que as páginas do dashboard derivam do snapshot, calculado uma vez
+    quando o snapshot é publicado: lista de moedas ordenada, linhas de cada
+    moeda, quadros dos gráficos, permutações de ordenação e tabelas rotuladas.
+    Uma interação (filtro, métrica, ordenação) vira só seleção de linhas por
+    posição. O objeto é compartilhado pelas sessões e é somente leitura.
+
+    Os valores estão na divisa base; na_divisa() devolve as visões em outra
+    divisa da tabela de câmbio do snapshot.
+    """
+
+    @instrumentation.cronometrar("visoes.montagem")
+    def __init__(self, df, resumo):
+        nomes = df["name"]
+
+        # Posições (0..n-1) das linhas de cada moeda; nomes repetidos têm várias
+        codigos, unicos = pd.factorize(nomes, sort=True, use_na_sentinel=True)
+        ordem = np.argsort(codigos, kind="stable")
+        limites = np.searchsorted(codigos[ordem], np.arange(len(unicos) + 1))
+        self.moedas = [str(nome) for nome in unicos]
+        self._linhas_por_moeda = {
+            nome: ordem[limites[i]:limites[i + 1]] for i, nome in enumerate(self.moedas)
+        }
+        self.total_linhas = len(df)
+
+        # Busca por nome na página de favoritas (sem diferenciar maiúsculas)
+        self._moedas_array = np.array(self.moedas, dtype=object)
+        self._nomes_busca = pd.Series(self.moedas, dtype="string[pyarrow]").str.lower()
+
+        # Visão geral
+        self.grafico_status = pd.DataFrame({
+            "Status": ["Subiram", "Caíram"],
+            "Quantidade": [resumo.coins_up, resumo.coins_down],
+        })
+
+        # Gráficos: um quadro (nome, métrica) por métrica e as permutações de
+        # cada ordenação ("Misto" mantém a ordem do snapshot); NaN fica no fim
+        self.graficos = {}
+        self._ordens = {}
+        for metrica in METRICAS_GRAFICO:
+            quadro = df[["name", metrica]].reset_index(drop=True)
+            valores = quadro[metrica].to_numpy(dtype="float64", na_value=np.nan)
+            self.graficos[metrica] = quadro
+            self._ordens[metrica] = {
+                "Misto": None,
+                "Crescente": np.argsort(valores, kind="stable"),
+                "Decrescente": np.argsort(-valores, kind="stable"),
+            }
+
+        # Tabela: índice 1..n já aplicado; a versão formatada só é montada
+        # quando alguma sessão a abre
+        self.divisa = schema.DIVISA_BASE
+        self.fator = 1.0
+        self.rotulos = schema.rotulos(self.divisa)
+        self.cambio = currency.cambio_do_snapshot(df)
+        self.tabela_bruta = df.rename(columns=self.rotulos).set_axis(pd.RangeIndex(1, len(df) + 1))
+        self._df = df
+        self._tabela_formatada = None
+        self._exportacoes = OrderedDict()
+        self._lock = threading.Lock()
+        self._lock_exportacoes = threading.Lock()
+        self._historicos = OrderedDict()
+        self._lock_historicos = threading.Lock()
+
+        # Visões em outras divisas, derivadas desta quando pedidas. Elas
+        # apontam para a base por referência fraca: com uma forte, o ciclo
+        # base -> convertidas -> base manteria o snapshot (e o Arrow mapeado
+        # da geração) vivo depois da troca de geração, até uma coleta do gc
+        self._base = weakref.ref(self)
+        self._por_divisa = {}
+
+    @property
+    def _visao_base(self):
+        # Uma visão convertida que sobreviveu à base (geração já trocada)
+        # serve de base para si mesma
+        return self._base() or self
+
+    @property
+    def tabela_formatada(self):
+        """
+        Tabela em pt-BR (textos), com o mesmo índice da tabela bruta.
+        """
+        with self._lock:
+            if self._tabela_formatada is None:
+                self._tabela_formatada = formatar_tabela(self._df, self.divisa).set_axis(self.tabela_bruta.index)
+            return self._tabela_formatada
+
+    @property
+    def divisas(self):
+        """
+        Divisas disponíveis para este snapshot (a base primeiro).
+        """
+        return [divisa for divisa in currency.DIVISAS if divisa in self.cambio]
+
+    def na_divisa(self, divisa):
+        """
+        Visões com as colunas monetárias convertidas para `divisa`. A
+        conversão é feita uma vez por divisa e fica guardada enquanto o
+        snapshot estiver em uso; trocar de divisa não refaz a coleta.
+        """
+        base = self._visao_base
+        if divisa == base.divisa:
+            return base
+        with base._lock:
+            convertidas = base._por_divisa.get(divisa)
+            if convertidas is None:
+                if divisa not in base.cambio:
+                    raise ValueError(f"Divisa sem câmbio neste snapshot: {divisa}")
+                convertidas = base._por_divisa[divisa] = base._converter(divisa, base.cambio[divisa])
+            return convertidas
+
+    @instrumentation.cronometrar("visoes.conversao")
+    def _converter(self, divisa, fator):
+        """
+        Cópia das visões com os quadros monetários multiplicados pelo fator
+        (relativo à divisa base). Lista de moedas, linhas por moeda e
+        ordenações são compartilhadas: o fator é positivo, então a ordem dos
+        valores não muda.
+        """
+        df = currency.converter(self._df, fator / self.fator)
+        convertidas = copy.copy(self)
+        convertidas.divisa = divisa
+        convertidas.fator = fator
+        convertidas.rotulos = schema.rotulos(divisa)
+        convertidas.graficos = {
+            metrica: df[["name", metrica]].reset_index(drop=True) if metrica in currency.COLUNAS_MONETARIAS
+            else quadro
+            for metrica, quadro in self.graficos.items()
+        }
+        convertidas.tabela_bruta = df.rename(columns=convertidas.rotulos).set_axis(self.tabela_bruta.index)
+        convertidas._df = df
+        convertidas._tabela_formatada = None
+        convertidas._exportacoes = OrderedDict()
+        convertidas._lock = threading.Lock()
+        convertidas._lock_exportacoes = threading.Lock()
+        convertidas._por_divisa = {}  # O dict da base contém esta visão: compartilhá-lo faria um ciclo
+        return convertidas
+
+    def linhas(self, moedas):
+        """
+        Posições, na ordem do snapshot, das linhas das moedas escolhidas.
+        Retorna None quando todas estão escolhidas (nenhum recorte).
+        """
+        if len(moedas) == len(self.moedas) and set(moedas) == self._linhas_por_moeda.keys():
+            return None
+        partes = [self._linhas_por_moeda[moeda] for moeda in moedas if moeda in self._linhas_por_moeda]
+        if not partes:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(partes))
+
+    def ids(self, moedas):
+        """
+        Ids das moedas escolhidas, na ordem do snapshot (ranking de mercado).
+        """
+        linhas = self.linhas(moedas)
+        ids = self._df["id"] if linhas is None else self._df["id"].iloc[linhas]
+        return ids.tolist()
+
+    def somente(self, moedas):
+        """
+        Moedas do snapshot presentes no conjunto `moedas`, na ordem de
+        self.moedas. Consulta o índice por nome para cada moeda do conjunto,
+        sem percorrer o universo inteiro.
+        """
+        return sorted(moeda for moeda in moedas if moeda in self._linhas_por_moeda)
+
+    def buscar(self, termo):
+        """
+        Moedas cujo nome contém `termo`, na ordem de self.moedas.
+        """
+        termo = termo.strip().lower()
+        if not termo:
+            return self.moedas
+        encontradas = self._nomes_busca.str.contains(termo, regex=False).to_numpy(dtype=bool)
+        return self._moedas_array[encontradas].tolist()
+
+    def grafico(self, metrica, ordenacao, moedas):
+        """
+        Quadro (nome, métrica) do gráfico de barras para as moedas escolhidas,
+        já na ordenação pedida.
+        """
+        quadro = self.graficos[metrica]
+        linhas = self.linhas(moedas)
+        ordem = self._ordens[metrica][ordenacao]
+        if ordem is None:
+            return quadro if linhas is None else quadro.iloc[linhas]
+        if linhas is not None:
+            escolhidas = np.zeros(self.total_linhas, dtype=bool)
+            escolhidas[linhas] = True
+            ordem = ordem[escolhidas[ordem]]
+        return quadro.iloc[ordem]
+
+    def tabela(self, formatada, moedas):
+        """
+        Tabela rotulada (bruta ou formatada) só com as moedas escolhidas.
+        """
+        tabela = self.tabela_formatada if formatada else self.tabela_bruta
+        linhas = self.linhas(moedas)
+        return tabela if linhas is None else tabela.iloc[linhas]
+
+    def exportacao(self, formatada, moedas, formato, gerar=True):
+        """
+        Bytes do arquivo de exportação da tabela filtrada, gerados só quando
+        pedidos e guardados por (tipo de tabela, moedas, formato) enquanto
+        este snapshot estiver em uso. Com gerar=False retorna None se o
+        arquivo ainda não existe.
+        """
+        linhas = self.linhas(moedas)
+        chave = (formatada, None if linhas is None else frozenset(moedas), formato)
+        with self._lock_exportacoes:
+            if chave in self._exportacoes:
+                self._exportacoes.move_to_end(chave)
+                return self._exportacoes[chave]
+            if not gerar:
+                return None
+
+            # Gera dentro do lock: sessões pedindo o mesmo arquivo esperam a mesma geração
+            with instrumentation.medir(f"exportacao.{formato}"):
+                dados = exports.exportar(self.tabela(formatada, moedas), formato)
+            self._exportacoes[chave] = dados
+            while len(self._exportacoes) > MAX_EXPORTACOES:
+                self._exportacoes.popitem(last=False)
+            return dados
+
+    def historico(self, moedas, duracao, largura_px):
+        """
+        Histórico de preço das moedas escolhidas no período que termina agora
+        (`duracao` None é o histórico todo), lido dos níveis pré-agregados e
+        reduzido (history_store.ler_para_grafico). Se as moedas não cabem no
+        orçamento de pontos, ficam as maiores por valor de mercado.
+        Guardado por (moedas, período, largura) enquanto este snapshot estiver
+        em uso: reruns da página não releem nem reduzem nada, e outra divisa
+        só multiplica o preço.
+        Retorna (dados, nível, séries exibidas, séries pedidas).
+        """
+        base = self._visao_base
+        linhas = self.linhas(moedas)
+        chave = (None if linhas is None else frozenset(moedas), duracao, largura_px)
+        with base._lock_historicos:
+            resultado = base._historicos.get(chave)
+            if resultado is not None:
+                base._historicos.move_to_end(chave)
+            else:
+                # Lê dentro do lock: sessões pedindo o mesmo histórico esperam a mesma leitura
+                ids = self.ids(moedas)
+                fim = pd.Timestamp.now(tz="UTC")
+                inicio = fim - duracao if duracao is not None else (history_store.primeiro_dia() or fim)
+                with instrumentation.medir("visoes.historico"):
+                    dados, nivel, exibidas = history_store.ler_para_grafico(ids, inicio, fim, largura_px)
+                resultado = (dados[["snapshot_ts", "name", "current_price"]], nivel, exibidas, len(ids))
+                base._historicos[chave] = resultado
+                while len(base._historicos) > MAX_HISTORICOS:
+                    base._historicos.popitem(last=False)
+
+        dados = resultado[0]
+        if self.fator != 1.0:
+            dados = dados.assign(current_price=dados["current_price"] * self.fator)
+        return (dados,) + resultado[1:]
+
+# =============================================
+# Funções
+# =============================================
+
+@instrumentation.cronometrar("visoes.formatacao")
+def formatar_tabela(df, divisa=schema.DIVISA_BASE):
+    """
+    Versão formatada (pt-BR) para exibição, com as colunas rotuladas.
+    """
+    df_formatado = df.copy()
+
+    # Formatando valores monetários, quantidades, percentuais e datas
+    for col in schema.colunas_com_formato("moeda"):
+        df_formatado[col] = formatar_numero_br(df_formatado[col], casas=2)
+
+    for col in schema.colunas_com_formato("quantidade"):
+        df_formatado[col] = formatar_numero_br(df_formatado[col], casas=0)
+
+    for col in schema.colunas_com_formato("percentual"):
+        df_formatado[col] = formatar_percentual(df_formatado[col])
+
+    for col in schema.colunas_com_formato("data"):
+        df_formatado[col] = df_formatado[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    return df_formatado.rename(columns=schema.rotulos(divisa))